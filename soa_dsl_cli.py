@@ -12,12 +12,40 @@ from pathlib import Path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-from soa_dsl.parser import parse_file, ParseError
-from soa_dsl.generator import generate_code
-from soa_dsl.converter import convert_universal_to_monitor, ConversionError
+# Library modules are imported inside each command so that --help and
+# light commands stay fast; scripted callers may run the CLI thousands of
+# times (see also the session command).
 
+# Errors reported without a traceback: (module, exception class)
+USER_ERRORS = [
+    ('soa_dsl.parser', 'ParseError'),
+    ('soa_dsl.converter', 'ConversionError'),
+    ('soa_dsl.veriloga', 'VerilogAError'),
+    ('soa_dsl.netlist', 'NetlistError'),
+    ('soa_dsl.results_cache', 'ResultsCacheError'),
+    ('soa_dsl.redundancy', 'RedundancyError'),
+    ('soa_dsl.importer', 'LimitTableError'),
+    ('soa_dsl.corners', 'CornerError'),
+    ('soa_dsl.dependencies', 'DependencyError'),
+    ('soa_dsl.rule_store', 'RuleStoreError'),
+    ('soa_dsl.spectre_check', 'SpectreCheckError'),
+]
 
-def main():
+# Modules that must not be imported just to print --help
+STARTUP_FORBIDDEN = ('yaml', 'numpy', 'soa_dsl')
+
+
+def is_user_error(error: Exception) -> bool:
+    """True if ``error`` is one of USER_ERRORS (only loaded modules can raise them)."""
+    for module_name, class_name in USER_ERRORS:
+        module = sys.modules.get(module_name)
+        if module is not None and isinstance(error, getattr(module, class_name)):
+            return True
+    return False
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser (no library imports)."""
     parser = argparse.ArgumentParser(
         description='SOA DSL - Universal and monitor-based specification compiler',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -26,14 +54,57 @@ Examples:
   # Convert universal spec to monitor spec
   %(prog)s convert examples/soa_rules_universal.yaml -o output/monitors.yaml
   
+  # Import a spreadsheet limit table into a universal spec
+  %(prog)s import limits.xlsx -o output/rules.yaml --template examples/soa_rules_universal.yaml
+  
+  # Keep a large rule base in an indexed SQLite store and query it
+  %(prog)s db-import examples/soa_rules_universal.yaml -o rules.db
+  %(prog)s query rules.db --group pmos_hv_variants --time-limit tmaxfrac3
+  %(prog)s compile rules.db -o output/soachecks.scs
+  
   # Generate Spectre from monitor spec
   %(prog)s generate examples/soa_monitors.yaml -o output/soachecks.scs
   
   # One-step: universal spec to Spectre
   %(prog)s compile examples/soa_rules_universal.yaml -o output/soachecks.scs
   
+  # One conversion, one output per corner (soachecks_tt.scs, soachecks_ss.scs, ...)
+  %(prog)s compile examples/soa_rules_universal.yaml -o output/soachecks.scs --corners corners.yaml
+  
   # Validate monitor spec
   %(prog)s validate examples/soa_monitors.yaml
+  
+  # Syntax-check hand-written or generated Spectre files (generate/compile check their output)
+  %(prog)s check spectre/soachecks_top.scs output/soachecks.scs
+  
+  # Precompute the web UI library index
+  %(prog)s export-index -o web/library_index.json
+  
+  # Project monitor instance counts on a design netlist
+  %(prog)s netlist output/monitors.yaml design.scs
+  
+  # Record dependencies, then list what a library update affects
+  %(prog)s compile examples/soa_rules_universal.yaml -o output/soachecks.scs --deps output/deps.json
+  %(prog)s impact output/deps.json old/device_library.yaml config/device_library.yaml
+  
+  # Write a section manifest and plan which runs can reuse cached results
+  %(prog)s generate a.yaml -o a.scs --manifest a.manifest.json
+  %(prog)s plan a.manifest.json --design top.scs -s tb_start -s tb_load
+  
+  # Run many commands in one process (command lines or JSON on stdin)
+  printf 'validate a.yaml\\ngenerate a.yaml -o a.scs\\n' | %(prog)s session
+  
+  # Find overlapping rules and drop the redundant monitors
+  %(prog)s redundancy output/monitors.yaml --drop-subsumed output/monitors_min.yaml
+  
+  # Check exported currents against self-heating limits (requires numpy)
+  %(prog)s selfheat output/monitors.yaml -w currents.csv -i instances.csv
+  
+  # HCI/TDDB lifetime over a mission profile (requires numpy)
+  %(prog)s aging output/monitors.yaml --vgs vgs.csv --vds vds.csv -i instances.csv
+  
+  # Check parcheckva3 limits on operating-point dumps, worst margin first (requires numpy)
+  %(prog)s opcheck output/monitors.yaml -d op_tt.csv op_ss.csv -i instances.csv -o opcheck.csv
         """
     )
     
@@ -47,7 +118,7 @@ Examples:
     convert_parser.add_argument(
         'input',
         type=Path,
-        help='Input universal YAML file'
+        help='Input universal YAML file or rule store (.db)'
     )
     convert_parser.add_argument(
         '-o', '--output',
@@ -67,6 +138,177 @@ Examples:
         default=Path('config/monitor_library.yaml'),
         help='Monitor library YAML (default: config/monitor_library.yaml)'
     )
+    convert_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Convert rules in N worker processes (0: all cores, default: 1)'
+    )
+    convert_parser.add_argument(
+        '--pack-branches',
+        action='store_true',
+        help='Pack single-branch ovcheck checks per device into ovcheck6 monitors'
+    )
+    convert_parser.add_argument(
+        '--artifact',
+        type=Path,
+        metavar='PATH',
+        help='Also write a compiled .soac artifact for fast reload'
+    )
+    convert_parser.add_argument(
+        '--deps',
+        type=Path,
+        metavar='PATH',
+        help='Also write the reverse dependency index (JSON) for the impact command'
+    )
+    
+    # Import command: spreadsheet limit table → universal
+    import_parser = subparsers.add_parser(
+        'import',
+        help='Import a CSV/XLSX limit table into a universal spec'
+    )
+    import_parser.add_argument(
+        'input',
+        type=Path,
+        help='Limit table (.csv, or .xlsx with openpyxl installed)'
+    )
+    import_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        required=True,
+        help='Output universal YAML file'
+    )
+    import_parser.add_argument(
+        '--device-lib',
+        type=Path,
+        default=Path('config/device_library.yaml'),
+        help='Device library YAML (default: config/device_library.yaml)'
+    )
+    import_parser.add_argument(
+        '--template',
+        type=Path,
+        metavar='PATH',
+        help='Universal spec to copy version, process, date and globals from'
+    )
+    import_parser.add_argument(
+        '--process',
+        help='Process name (overrides the template)'
+    )
+    import_parser.add_argument(
+        '--sheet',
+        help='XLSX worksheet name (default: first sheet)'
+    )
+    
+    # Db-import command: universal YAML → SQLite rule store
+    db_import_parser = subparsers.add_parser(
+        'db-import',
+        help='Import a universal spec into an indexed SQLite rule store'
+    )
+    db_import_parser.add_argument(
+        'input',
+        type=Path,
+        help='Input universal YAML file'
+    )
+    db_import_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        required=True,
+        help='Rule store to write (.db or .sqlite, replaced if it exists)'
+    )
+    db_import_parser.add_argument(
+        '--device-lib',
+        type=Path,
+        default=Path('config/device_library.yaml'),
+        help='Device library YAML (default: config/device_library.yaml)'
+    )
+    db_import_parser.add_argument(
+        '--monitor-lib',
+        type=Path,
+        default=Path('config/monitor_library.yaml'),
+        help='Monitor library YAML (default: config/monitor_library.yaml)'
+    )
+    
+    # Db-export command: SQLite rule store → YAML
+    db_export_parser = subparsers.add_parser(
+        'db-export',
+        help='Export a rule store as universal or monitor YAML'
+    )
+    db_export_parser.add_argument(
+        'input',
+        type=Path,
+        help='Rule store (.db or .sqlite)'
+    )
+    db_export_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        required=True,
+        help='Output YAML file'
+    )
+    db_export_parser.add_argument(
+        '--monitors',
+        action='store_true',
+        help='Export the converted monitor spec instead of the universal rules'
+    )
+    
+    # Query command: indexed lookups in a rule store
+    query_parser = subparsers.add_parser(
+        'query',
+        help='Find converted checks in a rule store'
+    )
+    query_parser.add_argument(
+        'input',
+        type=Path,
+        help='Rule store (.db or .sqlite)'
+    )
+    query_parser.add_argument(
+        '--device',
+        metavar='GLOB',
+        help='Subcircuit name or glob pattern (e.g. pch_*)'
+    )
+    query_parser.add_argument(
+        '--group',
+        help='Level 1 or level 2 group; matches its member subcircuits'
+    )
+    query_parser.add_argument(
+        '--target',
+        metavar='NAME',
+        help='Rules whose applies_to names this subcircuit or group'
+    )
+    query_parser.add_argument(
+        '--monitor-type',
+        help='Monitor type (ovcheck, ovcheck6, parcheckva3, ...)'
+    )
+    query_parser.add_argument(
+        '--check-type',
+        help='Rule check type (voltage, current, parameter, ...)'
+    )
+    query_parser.add_argument(
+        '--time-limit',
+        metavar='LEVEL',
+        help='Time limit level (steady, review, ...) or tmaxfrac parameter (tmaxfrac3)'
+    )
+    query_parser.add_argument(
+        '--rule',
+        metavar='GLOB',
+        help='Rule name or glob pattern'
+    )
+    query_parser.add_argument(
+        '--rules',
+        action='store_true',
+        help='Print the matching rule names only'
+    )
+    query_parser.add_argument(
+        '--limit',
+        type=int,
+        metavar='N',
+        help='Return at most N checks'
+    )
+    query_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        help='Write the matching checks as JSON'
+    )
     
     # Generate command: monitor → Spectre
     generate_parser = subparsers.add_parser(
@@ -76,13 +318,36 @@ Examples:
     generate_parser.add_argument(
         'input',
         type=Path,
-        help='Input monitor YAML file'
+        help='Input monitor YAML file, compiled .soac artifact or rule store'
     )
     generate_parser.add_argument(
         '-o', '--output',
         type=Path,
         help='Output Spectre file (default: stdout)'
     )
+    generate_parser.add_argument(
+        '--veriloga',
+        type=Path,
+        metavar='DIR',
+        help='Reject parameters not declared by the Verilog-A modules in DIR'
+    )
+    generate_parser.add_argument(
+        '--optimize',
+        action='store_true',
+        help='Drop unused global parameters and hoist repeated limit literals'
+    )
+    generate_parser.add_argument(
+        '--manifest',
+        type=Path,
+        metavar='PATH',
+        help='Also write a JSON manifest of per-section content hashes'
+    )
+    generate_parser.add_argument(
+        '--no-check',
+        dest='check',
+        action='store_false',
+        help='Skip the syntax check of the written Spectre file'
+    )
     
     # Compile command: universal → Spectre (one-step)
     compile_parser = subparsers.add_parser(
@@ -92,7 +357,7 @@ Examples:
     compile_parser.add_argument(
         'input',
         type=Path,
-        help='Input universal YAML file'
+        help='Input universal YAML file or rule store (.db)'
     )
     compile_parser.add_argument(
         '-o', '--output',
@@ -112,6 +377,65 @@ Examples:
         default=Path('config/monitor_library.yaml'),
         help='Monitor library YAML (default: config/monitor_library.yaml)'
     )
+    compile_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Convert rules in N worker processes (0: all cores, default: 1)'
+    )
+    compile_parser.add_argument(
+        '--pack-branches',
+        action='store_true',
+        help='Pack single-branch ovcheck checks per device into ovcheck6 monitors'
+    )
+    compile_parser.add_argument(
+        '--artifact',
+        type=Path,
+        metavar='PATH',
+        help='Also write a compiled .soac artifact for fast reload'
+    )
+    compile_parser.add_argument(
+        '--veriloga',
+        type=Path,
+        metavar='DIR',
+        help='Reject parameters not declared by the Verilog-A modules in DIR'
+    )
+    compile_parser.add_argument(
+        '--optimize',
+        action='store_true',
+        help='Drop unused global parameters and hoist repeated limit literals'
+    )
+    compile_parser.add_argument(
+        '--corners',
+        type=Path,
+        metavar='PATH',
+        help='Corner definitions YAML; writes OUTPUT_<corner>.scs per corner from one conversion'
+    )
+    compile_parser.add_argument(
+        '--shared-monitors',
+        type=Path,
+        metavar='PATH',
+        help='With --corners: write the monitor sections once to PATH instead of into every corner file'
+    )
+    compile_parser.add_argument(
+        '--manifest',
+        type=Path,
+        metavar='PATH',
+        help='Also write a JSON manifest of per-section content hashes'
+    )
+    compile_parser.add_argument(
+        '--deps',
+        type=Path,
+        metavar='PATH',
+        help='Also write the reverse dependency index (JSON) for the impact command'
+    )
+    compile_parser.add_argument(
+        '--no-check',
+        dest='check',
+        action='store_false',
+        help='Skip the syntax check of the written Spectre files'
+    )
     
     # Validate command
     validate_parser = subparsers.add_parser(
@@ -121,10 +445,381 @@ Examples:
     validate_parser.add_argument(
         'input',
         type=Path,
-        help='Input monitor YAML file'
+        help='Input monitor YAML file, compiled .soac artifact or rule store'
+    )
+    validate_parser.add_argument(
+        '--veriloga',
+        type=Path,
+        metavar='DIR',
+        help='Reject parameters not declared by the Verilog-A modules in DIR'
+    )
+    
+    # Check command: Spectre syntax check
+    check_parser = subparsers.add_parser(
+        'check',
+        help='Check Spectre netlists for syntax errors'
+    )
+    check_parser.add_argument(
+        'files',
+        type=Path,
+        nargs='+',
+        metavar='FILE',
+        help='Spectre netlist (.scs, optionally .gz)'
+    )
+    check_parser.add_argument(
+        '--max-errors',
+        type=int,
+        metavar='N',
+        help='Print at most N errors per file (default: all)'
+    )
+    
+    # Export-index command: libraries → compact JSON index
+    index_parser = subparsers.add_parser(
+        'export-index',
+        help='Precompute the library index used by the web UI'
+    )
+    index_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        default=Path('web/library_index.json'),
+        help='Output JSON file (default: web/library_index.json)'
+    )
+    index_parser.add_argument(
+        '--device-lib',
+        type=Path,
+        default=Path('config/device_library.yaml'),
+        help='Device library YAML (default: config/device_library.yaml)'
+    )
+    index_parser.add_argument(
+        '--monitor-lib',
+        type=Path,
+        default=Path('config/monitor_library.yaml'),
+        help='Monitor library YAML (default: config/monitor_library.yaml)'
+    )
+    index_parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Rewrite the index even if the libraries are unchanged'
+    )
+    
+    # Netlist command: size monitor insertion on a design
+    netlist_parser = subparsers.add_parser(
+        'netlist',
+        help='Project monitor instance counts on a design netlist'
+    )
+    netlist_parser.add_argument(
+        'input',
+        type=Path,
+        help='Input monitor YAML file, compiled .soac artifact or rule store'
+    )
+    netlist_parser.add_argument(
+        'design',
+        type=Path,
+        help='Design netlist (Spectre or SPICE, optionally .gz)'
+    )
+    netlist_parser.add_argument(
+        '--prune',
+        type=Path,
+        metavar='PATH',
+        help='Write a monitor YAML without monitors whose devices never appear'
+    )
+    
+    # Redundancy command: overlapping rule detection
+    redundancy_parser = subparsers.add_parser(
+        'redundancy',
+        help='Report duplicated, subsumed and conflicting checks'
+    )
+    redundancy_parser.add_argument(
+        'input',
+        type=Path,
+        help='Input monitor YAML file, compiled .soac artifact or rule store'
+    )
+    redundancy_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        help='Write all findings as CSV'
+    )
+    redundancy_parser.add_argument(
+        '--drop-subsumed',
+        type=Path,
+        metavar='PATH',
+        help='Write a monitor YAML without monitors whose checks are all redundant'
+    )
+    
+    # Selfheat command: waveform post-processing
+    selfheat_parser = subparsers.add_parser(
+        'selfheat',
+        help='Check exported current waveforms against self-heating limits'
+    )
+    selfheat_parser.add_argument(
+        'input',
+        type=Path,
+        help='Input monitor YAML file, compiled .soac artifact or rule store'
+    )
+    selfheat_parser.add_argument(
+        '-w', '--waveforms',
+        type=Path,
+        required=True,
+        help='Current waveforms (time column, one column per instance)'
+    )
+    selfheat_parser.add_argument(
+        '-i', '--instances',
+        type=Path,
+        required=True,
+        help='Instance table CSV (instance, subcircuit, parameter columns)'
+    )
+    selfheat_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        help='Write a CSV report'
+    )
+    selfheat_parser.add_argument(
+        '--chunk-rows',
+        type=int,
+        default=65536,
+        metavar='N',
+        help='Waveform rows processed per chunk (default: 65536)'
+    )
+    
+    # Aging command: HCI/TDDB damage over mission profiles
+    aging_parser = subparsers.add_parser(
+        'aging',
+        help='Accumulate HCI/TDDB damage over Vgs/Vds mission profiles'
+    )
+    aging_parser.add_argument(
+        'input',
+        type=Path,
+        help='Input monitor YAML file, compiled .soac artifact or rule store'
+    )
+    aging_parser.add_argument(
+        '--vgs',
+        type=Path,
+        required=True,
+        help='Vgs waveforms (time column, one column per instance)'
+    )
+    aging_parser.add_argument(
+        '--vds',
+        type=Path,
+        required=True,
+        help='Vds waveforms (same time points and instance columns)'
+    )
+    aging_parser.add_argument(
+        '-i', '--instances',
+        type=Path,
+        required=True,
+        help='Instance table CSV (instance, subcircuit, parameter columns)'
+    )
+    aging_parser.add_argument(
+        '--target-years',
+        type=float,
+        default=10.0,
+        help='Required lifetime in years (default: 10)'
+    )
+    aging_parser.add_argument(
+        '--polarity',
+        choices=['p', 'n'],
+        default='p',
+        help='Device polarity; n-type voltages are mirrored (default: p)'
+    )
+    aging_parser.add_argument(
+        '--lifetime-model',
+        type=Path,
+        help='Lifetime model YAML (HCI/TDDB time-to-failure per subcircuit); '
+             'without it only the SOA boundary is checked'
+    )
+    aging_parser.add_argument(
+        '--temp',
+        type=float,
+        default=27.0,
+        help='Simulation temperature in C for soa_hcitddb_vdswc (default: 27)'
+    )
+    aging_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        help='Write a CSV report'
+    )
+    aging_parser.add_argument(
+        '--chunk-rows',
+        type=int,
+        default=65536,
+        metavar='N',
+        help='Waveform rows processed per chunk (default: 65536)'
+    )
+    
+    # Opcheck command: parcheckva3 limits on operating-point dumps
+    opcheck_parser = subparsers.add_parser(
+        'opcheck',
+        help='Check operating-point dumps against parcheckva3 parameter limits'
+    )
+    opcheck_parser.add_argument(
+        'input',
+        type=Path,
+        help='Input monitor YAML file, compiled .soac artifact or rule store'
+    )
+    opcheck_parser.add_argument(
+        '-d', '--dumps',
+        type=Path,
+        nargs='+',
+        required=True,
+        metavar='DUMP',
+        help='OP dumps (instance, optional point, one column per OP output)'
+    )
+    opcheck_parser.add_argument(
+        '-i', '--instances',
+        type=Path,
+        required=True,
+        help='Instance table CSV (instance, subcircuit, parameter columns)'
+    )
+    opcheck_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        help='Write a CSV report, sorted by margin'
+    )
+    opcheck_parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Report passing checks too (closest to their limits first)'
+    )
+    opcheck_parser.add_argument(
+        '--top',
+        type=int,
+        default=20,
+        metavar='N',
+        help='Failing checks printed (default: 20)'
+    )
+    opcheck_parser.add_argument(
+        '--chunk-rows',
+        type=int,
+        default=65536,
+        metavar='N',
+        help='Dump rows parsed per chunk (default: 65536)'
+    )
+    
+    # Plan command: which simulations can reuse cached results
+    plan_parser = subparsers.add_parser(
+        'plan',
+        help='Plan which runs can reuse cached SOA results'
+    )
+    plan_parser.add_argument(
+        'manifest',
+        type=Path,
+        help='Section manifest written by generate/compile --manifest'
+    )
+    plan_parser.add_argument(
+        '--design',
+        type=Path,
+        required=True,
+        help='Design netlist simulated with the SOA checks'
+    )
+    plan_parser.add_argument(
+        '-s', '--stimulus',
+        action='append',
+        required=True,
+        metavar='ID',
+        help='Stimulus/testbench id (repeatable)'
+    )
+    plan_parser.add_argument(
+        '--cache',
+        type=Path,
+        metavar='DIR',
+        help='Results cache directory (default: .soa_cache/results)'
+    )
+    plan_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        help='Write the plan as JSON'
+    )
+    
+    # Store-results command: fill the results cache
+    store_parser = subparsers.add_parser(
+        'store-results',
+        help='Store parsed SOA results of one simulation in the cache'
+    )
+    store_parser.add_argument(
+        'manifest',
+        type=Path,
+        help='Section manifest of the simulated SOA checks'
+    )
+    store_parser.add_argument(
+        '--design',
+        type=Path,
+        required=True,
+        help='Design netlist that was simulated'
+    )
+    store_parser.add_argument(
+        '-s', '--stimulus',
+        required=True,
+        metavar='ID',
+        help='Stimulus/testbench id of the simulation'
+    )
+    store_parser.add_argument(
+        '-r', '--results',
+        type=Path,
+        required=True,
+        help='JSON object mapping section names to parsed results'
+    )
+    store_parser.add_argument(
+        '--cache',
+        type=Path,
+        metavar='DIR',
+        help='Results cache directory (default: .soa_cache/results)'
     )
     
-    args = parser.parse_args()
+    # Impact command: what a library or spec update affects
+    impact_parser = subparsers.add_parser(
+        'impact',
+        help='List the rules, models and sections affected by a library update'
+    )
+    impact_parser.add_argument(
+        'deps',
+        type=Path,
+        help='Dependency index written by convert/compile --deps'
+    )
+    impact_parser.add_argument(
+        'old',
+        type=Path,
+        help='Old device library, monitor library or universal spec'
+    )
+    impact_parser.add_argument(
+        'new',
+        type=Path,
+        help='New version of the same file'
+    )
+    impact_parser.add_argument(
+        '-o', '--output',
+        type=Path,
+        help='Write the affected outputs as JSON'
+    )
+    
+    # Session command: many commands in one warm process
+    session_parser = subparsers.add_parser(
+        'session',
+        help='Run commands read from stdin in one process'
+    )
+    session_parser.add_argument(
+        '--stop-on-error',
+        action='store_true',
+        help='Stop at the first command that fails'
+    )
+    
+    # Startup-check command: import-time budget
+    startup_parser = subparsers.add_parser(
+        'startup-check',
+        help='Check that CLI startup stays within its import-time budget'
+    )
+    startup_parser.add_argument(
+        '--budget-ms',
+        type=float,
+        default=50.0,
+        help='Maximum import time for "--help" in milliseconds (default: 50)'
+    )
+    
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
@@ -133,17 +828,49 @@ Examples:
     try:
         if args.command == 'convert':
             return cmd_convert(args)
+        elif args.command == 'import':
+            return cmd_import(args)
+        elif args.command == 'db-import':
+            return cmd_db_import(args)
+        elif args.command == 'db-export':
+            return cmd_db_export(args)
+        elif args.command == 'query':
+            return cmd_query(args)
         elif args.command == 'generate':
             return cmd_generate(args)
         elif args.command == 'compile':
             return cmd_compile(args)
         elif args.command == 'validate':
             return cmd_validate(args)
+        elif args.command == 'check':
+            return cmd_check(args)
+        elif args.command == 'export-index':
+            return cmd_export_index(args)
+        elif args.command == 'netlist':
+            return cmd_netlist(args)
+        elif args.command == 'redundancy':
+            return cmd_redundancy(args)
+        elif args.command == 'selfheat':
+            return cmd_selfheat(args)
+        elif args.command == 'aging':
+            return cmd_aging(args)
+        elif args.command == 'opcheck':
+            return cmd_opcheck(args)
+        elif args.command == 'plan':
+            return cmd_plan(args)
+        elif args.command == 'store-results':
+            return cmd_store_results(args)
+        elif args.command == 'impact':
+            return cmd_impact(args)
+        elif args.command == 'session':
+            return cmd_session(args)
+        elif args.command == 'startup-check':
+            return cmd_startup_check(args)
         
-    except (ParseError, ConversionError) as e:
-        print(f"❌ Error: {e}", file=sys.stderr)
-        return 1
     except Exception as e:
+        if is_user_error(e):
+            print(f"❌ Error: {e}", file=sys.stderr)
+            return 1
         print(f"❌ Unexpected error: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
@@ -152,36 +879,205 @@ Examples:
 
 def cmd_convert(args):
     """Convert universal spec to monitor spec."""
+    from soa_dsl.parser import parse
+    from soa_dsl.converter import convert_universal_to_monitor
+    from soa_dsl.artifact import write_artifact
+    
     print(f"Converting {args.input} → {args.output}")
     
-    convert_universal_to_monitor(
+    sources = []
+    dependencies = new_dependency_index(args)
+    monitor_doc = convert_universal_to_monitor(
         args.input,
         args.device_lib,
         args.monitor_lib,
-        args.output
+        args.output,
+        jobs=args.jobs,
+        sources=sources,
+        pack=args.pack_branches,
+        dependencies=dependencies
     )
     
     print(f"✅ Converted to {args.output}")
+    
+    if dependencies is not None:
+        dependencies.save(args.deps)
+        print(f"✅ Wrote dependency index {args.deps} ({len(dependencies.outputs)} models)")
+    
+    if args.artifact:
+        # The written monitor YAML is an input too: editing it invalidates the artifact
+        write_artifact(parse(monitor_doc), args.artifact, sources + [args.output],
+                       source=args.output)
+        print(f"✅ Wrote artifact {args.artifact}")
+    
+    return 0
+
+
+def cmd_import(args):
+    """Import a CSV/XLSX limit table into a universal spec."""
+    from soa_dsl.importer import import_limit_table
+    
+    print(f"Importing {args.input} → {args.output}")
+    try:
+        result = import_limit_table(
+            args.input,
+            args.output,
+            args.device_lib,
+            template_path=args.template,
+            process=args.process,
+            sheet=args.sheet
+        )
+    except ImportError as e:
+        print(f"❌ Error: XLSX import requires openpyxl ({e}); install with: pip install openpyxl",
+              file=sys.stderr)
+        return 1
+    
+    print(f"   Rows: {result.rows:,}  Rules written: {result.rules:,}")
+    for error in result.errors:
+        print(f"❌ {error}", file=sys.stderr)
+    if result.error_count > len(result.errors):
+        print(f"   ... {result.error_count - len(result.errors)} more errors", file=sys.stderr)
+    
+    if result.error_count:
+        print(f"❌ Error: {result.error_count} invalid rows left out of {args.output}",
+              file=sys.stderr)
+        return 1
+    
+    print(f"✅ Imported {args.output}")
+    return 0
+
+
+def cmd_db_import(args):
+    """Import a universal spec into an indexed SQLite rule store."""
+    from soa_dsl.rule_store import import_rules, is_rule_store, STORE_SUFFIXES
+    
+    if not is_rule_store(args.output):
+        print(f"❌ Error: Rule store must end in {' or '.join(STORE_SUFFIXES)}: {args.output}",
+              file=sys.stderr)
+        return 1
+    
+    print(f"Importing {args.input} → {args.output}")
+    rules, monitors = import_rules(args.input, args.output, args.device_lib, args.monitor_lib)
+    print(f"✅ Stored {rules:,} rules ({monitors:,} monitors) in {args.output}")
+    return 0
+
+
+def cmd_db_export(args):
+    """Export a rule store as universal or monitor YAML."""
+    import yaml
+    from soa_dsl.rule_store import load_store_spec, load_store_monitors
+    
+    if args.monitors:
+        data = load_store_monitors(args.input)
+    else:
+        data = load_store_spec(args.input)
+    
+    with open(args.output, 'w') as f:
+        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+    
+    kind = 'monitors' if args.monitors else 'rules'
+    print(f"✅ Exported {len(data[kind]):,} {kind} to {args.output}")
+    return 0
+
+
+def cmd_query(args):
+    """Find converted checks in a rule store."""
+    import json
+    import dataclasses
+    from soa_dsl.rule_store import RuleStore
+    
+    with RuleStore(args.input) as store:
+        for path in store.stale_libraries():
+            print(f"⚠️  {path} changed since the import; results may be stale (re-run db-import)",
+                  file=sys.stderr)
+        rows = store.query(
+            device=args.device,
+            group=args.group,
+            monitor_type=args.monitor_type,
+            check_type=args.check_type,
+            time_limit=args.time_limit,
+            rule=args.rule,
+            target=args.target,
+            limit=args.limit
+        )
+    
+    rules = list(dict.fromkeys(row.rule for row in rows))
+    if args.rules:
+        for rule in rules:
+            print(rule)
+    else:
+        for row in rows[:50]:
+            print(f"   {row.rule:<32} {row.device:<16} {row.monitor_type:<24} "
+                  f"{row.time_limit:<16} {row.section}")
+        if len(rows) > 50:
+            print(f"   ... {len(rows) - 50} more (use -o for all)")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([dataclasses.asdict(row) for row in rows], f, indent=2)
+            f.write('\n')
+        print(f"✅ Wrote {args.output}", file=sys.stderr if args.rules else sys.stdout)
+    
+    # Keep stdout to rule names with --rules
+    print(f"✅ {len(rows):,} checks in {len(rules):,} rules",
+          file=sys.stderr if args.rules else sys.stdout)
     return 0
 
 
 def cmd_generate(args):
     """Generate Spectre code from monitor spec."""
-    doc = parse_file(args.input)
+    from soa_dsl.generator import generate_code
+    from soa_dsl.artifact import load_document
+    
+    doc = load_document(args.input)
+    
+    if args.veriloga and not veriloga_ok(doc, args.veriloga):
+        return 1
+    
+    if args.optimize:
+        from soa_dsl.optimizer import optimize_document
+        doc, report = optimize_document(doc)
+        # Keep stdout clean when the code itself goes to stdout
+        print(f"   Optimized: {report.summary()}", file=sys.stdout if args.output else sys.stderr)
     
     if args.output:
         with open(args.output, 'w') as f:
             generate_code(doc, f)
+        if args.check and not syntax_check(args.output).ok:
+            return 1
         print(f"✅ Generated {args.output}")
     else:
         generate_code(doc, sys.stdout)
     
+    if args.manifest:
+        from soa_dsl.results_cache import write_manifest
+        manifest = write_manifest(doc, args.manifest, manifest_veriloga_dir(args))
+        # Keep stdout clean when the code itself goes to stdout
+        print(f"✅ Wrote manifest {args.manifest} ({len(manifest['sections'])} sections)",
+              file=sys.stdout if args.output else sys.stderr)
+    
     return 0
 
 
 def cmd_compile(args):
     """Compile universal spec directly to Spectre (one-step)."""
     import tempfile
+    from soa_dsl.parser import parse_file
+    from soa_dsl.generator import generate_code
+    from soa_dsl.converter import convert_universal_to_monitor
+    from soa_dsl.artifact import write_artifact
+    
+    corners = None
+    if args.corners:
+        from soa_dsl.corners import load_corners
+        corners = load_corners(args.corners)
+        if args.optimize:
+            print("❌ Error: --optimize cannot be combined with --corners "
+                  "(corners share the monitor sections)", file=sys.stderr)
+            return 1
+    elif args.shared_monitors:
+        print("❌ Error: --shared-monitors requires --corners", file=sys.stderr)
+        return 1
     
     print(f"Compiling {args.input} → {args.output}")
     
@@ -191,18 +1087,66 @@ def cmd_compile(args):
     
     try:
         print("  Step 1: Converting to monitor spec...")
-        convert_universal_to_monitor(
-            args.input,
-            args.device_lib,
-            args.monitor_lib,
-            tmp_path
-        )
+        sources = []
+        dependencies = new_dependency_index(args)
+        if corners is not None:
+            from soa_dsl.converter import convert_corners
+            corner_globals = convert_corners(
+                args.input,
+                args.device_lib,
+                args.monitor_lib,
+                corners,
+                tmp_path,
+                jobs=args.jobs,
+                sources=sources,
+                pack=args.pack_branches,
+                dependencies=dependencies
+            )
+        else:
+            convert_universal_to_monitor(
+                args.input,
+                args.device_lib,
+                args.monitor_lib,
+                tmp_path,
+                jobs=args.jobs,
+                sources=sources,
+                pack=args.pack_branches,
+                dependencies=dependencies
+            )
+        
+        if dependencies is not None:
+            dependencies.save(args.deps)
+            print(f"  Wrote dependency index {args.deps}")
         
         # Step 2: Generate Spectre code
         print("  Step 2: Generating Spectre code...")
         doc = parse_file(tmp_path)
+        if args.veriloga and not veriloga_ok(doc, args.veriloga):
+            return 1
+        if corners is not None:
+            return compile_corners(args, doc, corner_globals, sources)
+        
+        emitted = doc
+        if args.optimize:
+            from soa_dsl.optimizer import optimize_document
+            emitted, report = optimize_document(doc)
+            print(f"  Optimized: {report.summary()}")
         with open(args.output, 'w') as f:
-            generate_code(doc, f)
+            generate_code(emitted, f)
+        if args.check:
+            report = syntax_check(args.output)
+            if not report.ok:
+                return 1
+            print(f"  Checked {report.lines:,} lines, {report.sections:,} sections")
+        
+        if args.artifact:
+            write_artifact(doc, args.artifact, sources)
+            print(f"  Wrote artifact {args.artifact}")
+        
+        if args.manifest:
+            from soa_dsl.results_cache import write_manifest
+            write_manifest(emitted, args.manifest, manifest_veriloga_dir(args))
+            print(f"  Wrote manifest {args.manifest}")
         
         print(f"✅ Compiled to {args.output}")
         return 0
@@ -213,9 +1157,82 @@ def cmd_compile(args):
             tmp_path.unlink()
 
 
+def manifest_veriloga_dir(args) -> Path:
+    """Verilog-A tree whose files the manifest hashes: --veriloga, else next to the netlist."""
+    if args.veriloga:
+        return args.veriloga
+    netlist_dir = args.output.parent if args.output else Path('.')
+    return netlist_dir / 'veriloga'
+
+
+def new_dependency_index(args):
+    """Empty dependency index if --deps was given, else None."""
+    if not args.deps:
+        return None
+    from soa_dsl.dependencies import DependencyIndex
+    return DependencyIndex()
+
+
+def compile_corners(args, doc, corner_globals, sources):
+    """Step 2 of compile with --corners: one output per corner."""
+    from soa_dsl.artifact import write_artifact
+    from soa_dsl.corners import write_corners, corner_path, corner_document
+    
+    written = write_corners(doc, corner_globals, args.output, args.shared_monitors)
+    for path in written:
+        print(f"  Wrote {path}")
+    if args.check and not all([syntax_check(path).ok for path in written]):
+        return 1
+    
+    if args.artifact:
+        write_artifact(doc, args.artifact, sources)
+        print(f"  Wrote artifact {args.artifact}")
+    
+    if args.manifest:
+        from soa_dsl.results_cache import write_manifest
+        for name, globals_ in corner_globals.items():
+            path = corner_path(args.manifest, name)
+            write_manifest(corner_document(doc, globals_), path, manifest_veriloga_dir(args))
+            print(f"  Wrote manifest {path}")
+    
+    print(f"✅ Compiled {len(corner_globals)} corners")
+    return 0
+
+
+def syntax_check(path: Path, max_errors=None):
+    """Syntax-check a Spectre file, printing its errors with line numbers."""
+    from soa_dsl.spectre_check import check_netlist
+    
+    report = check_netlist(path, max_errors)
+    for issue in report.issues:
+        print(f"❌ {path}:{issue.line}: {issue.message}", file=sys.stderr)
+    if report.error_count > len(report.issues):
+        print(f"   ... {report.error_count - len(report.issues)} more", file=sys.stderr)
+    if not report.ok:
+        print(f"❌ Error: {report.error_count} syntax errors in {path}", file=sys.stderr)
+    return report
+
+
+def veriloga_ok(doc, directory: Path) -> bool:
+    """Check generated model parameters against the Verilog-A sources."""
+    from soa_dsl.veriloga import check_document
+    
+    errors = check_document(doc, directory)
+    for error in errors:
+        print(f"❌ {error}", file=sys.stderr)
+    if errors:
+        print(f"❌ Error: {len(errors)} unknown Verilog-A modules or parameters", file=sys.stderr)
+    return not errors
+
+
 def cmd_validate(args):
     """Validate monitor spec."""
-    doc = parse_file(args.input)
+    from soa_dsl.artifact import load_document
+    
+    doc = load_document(args.input)
+    
+    if args.veriloga and not veriloga_ok(doc, args.veriloga):
+        return 1
     
     print(f"✅ Validation successful")
     print(f"   Process: {doc.process}")
@@ -224,5 +1241,491 @@ def cmd_validate(args):
     return 0
 
 
+def cmd_check(args):
+    """Check Spectre netlists for syntax errors."""
+    failed = 0
+    for path in args.files:
+        report = syntax_check(path, args.max_errors)
+        if report.ok:
+            print(f"✅ {path}: {report.lines:,} lines, {report.sections:,} sections, no syntax errors")
+        else:
+            failed += 1
+    return 1 if failed else 0
+
+
+def cmd_export_index(args):
+    """Precompute the library index for the web UI."""
+    from soa_dsl.library_index import export_library_index
+    
+    written = export_library_index(
+        args.device_lib,
+        args.monitor_lib,
+        args.output,
+        force=args.force
+    )
+    
+    if written:
+        print(f"✅ Exported library index to {args.output}")
+    else:
+        print(f"✅ Library index is up to date: {args.output}")
+    
+    return 0
+
+
+def cmd_netlist(args):
+    """Project monitor instance counts on a design netlist."""
+    from soa_dsl.artifact import load_document
+    from soa_dsl.netlist import scan_netlist, project_monitors, filter_monitor_file, NetlistError
+    
+    doc = load_document(args.input)
+    
+    print(f"Scanning {args.design}")
+    stats = scan_netlist(args.design)
+    totals = stats.elaborate()
+    devices = sum(n for master, n in totals.items() if master not in stats.scopes)
+    projections = project_monitors(doc, totals, stats.spice_masters)
+    
+    rules = {}
+    for p in projections:
+        entry = rules.setdefault(p.name, [0, 0])
+        entry[0] += 1
+        entry[1] += p.instances
+    
+    print(f"   Lines: {stats.lines:,}  Subcircuits: {len(stats.scopes) - 1:,}  "
+          f"Device instances: {devices:,}")
+    print()
+    print(f"   {'Rule':<48} {'Monitors':>8} {'Instances':>12} {'Overhead':>9}")
+    for name, (monitors, instances) in sorted(rules.items(), key=lambda r: -r[1][1]):
+        overhead = 100.0 * instances / devices if devices else 0.0
+        print(f"   {name[:48]:<48} {monitors:>8} {instances:>12,} {overhead:>8.1f}%")
+    
+    total = sum(p.instances for p in projections)
+    unused = [p for p in projections if not p.instances]
+    print()
+    print(f"✅ {total:,} monitor instances projected "
+          f"({100.0 * total / devices if devices else 0.0:.1f}% of device instances)")
+    print(f"   {len(unused)} of {len(projections)} monitors match no device in the design")
+    
+    if args.prune:
+        source = args.input
+        if source.suffix == '.soac':
+            raise NetlistError("--prune needs the monitor YAML, not a compiled artifact")
+        filter_monitor_file(source, args.prune, [p.instances > 0 for p in projections])
+        print(f"✅ Wrote {len(projections) - len(unused)} monitors to {args.prune}")
+    
+    return 0
+
+
+def cmd_redundancy(args):
+    """Report duplicated, subsumed and conflicting checks."""
+    from soa_dsl.artifact import load_document
+    from soa_dsl.netlist import filter_monitor_file
+    from soa_dsl.redundancy import analyze_redundancy, write_report, RedundancyError
+    
+    if args.drop_subsumed and args.input.suffix == '.soac':
+        raise RedundancyError("--drop-subsumed needs the monitor YAML, not a compiled artifact")
+    
+    doc = load_document(args.input)
+    report, keep = analyze_redundancy(doc)
+    
+    duplicates = report.by_kind('duplicate')
+    subsumed = report.by_kind('subsumed')
+    conflicts = report.by_kind('conflict')
+    
+    print(f"Analyzed {report.checks:,} checks in {len(doc.monitors):,} monitors "
+          f"({report.skipped:,} with non-constant limits skipped)")
+    for finding in (conflicts + duplicates + subsumed)[:20]:
+        check, other = finding.check, finding.other
+        print(f"   {finding.kind:<9} {check.device_pattern}: {check.source_branch} "
+              f"{check.interval()} in '{check.monitor_name}' vs {other.source_branch} "
+              f"{other.interval()} in '{other.monitor_name}'")
+    if len(report.findings) > 20:
+        print(f"   ... {len(report.findings) - 20} more")
+    
+    if args.output:
+        write_report(report, args.output)
+        print(f"✅ Wrote {args.output}")
+    
+    if args.drop_subsumed:
+        filter_monitor_file(args.input, args.drop_subsumed, keep)
+        print(f"✅ Wrote {keep.count(True)} monitors to {args.drop_subsumed} "
+              f"({keep.count(False)} fully redundant monitors dropped)")
+    
+    print(f"   {len(duplicates)} duplicated, {len(subsumed)} subsumed, "
+          f"{len(conflicts)} conflicting checks")
+    if conflicts:
+        print("❌ Conflicting limits: no value satisfies both checks")
+        return 1
+    
+    print("✅ No conflicting limits")
+    return 0
+
+
+def cmd_selfheat(args):
+    """Check current waveforms against self-heating limits."""
+    try:
+        from soa_dsl.selfheating import analyze_self_heating, write_report, SelfHeatingError
+    except ImportError as e:
+        print(f"❌ Error: selfheat requires numpy ({e}); install with: pip install numpy",
+              file=sys.stderr)
+        return 1
+    
+    from soa_dsl.artifact import load_document
+    
+    doc = load_document(args.input)
+    
+    try:
+        results = analyze_self_heating(doc, args.waveforms, args.instances, args.chunk_rows)
+    except SelfHeatingError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    
+    if args.output:
+        write_report(results, args.output)
+    
+    failed = [r for r in results if r.violations]
+    for r in failed:
+        print(f"❌ {r.instance} ({r.monitor}): {'; '.join(r.violations)}")
+    
+    if not results:
+        print("⚠️  No instances matched a self-heating monitor")
+    elif not failed:
+        print(f"✅ {len(results)} self-heating checks passed")
+    else:
+        print(f"   {len(failed)} of {len(results)} self-heating checks failed")
+    if args.output:
+        print(f"   Report: {args.output}")
+    
+    return 1 if failed else 0
+
+
+def cmd_aging(args):
+    """Accumulate HCI/TDDB damage and check lifetime targets."""
+    try:
+        from soa_dsl.aging import analyze_aging, write_report, AgingError
+    except ImportError as e:
+        print(f"❌ Error: aging requires numpy ({e}); install with: pip install numpy",
+              file=sys.stderr)
+        return 1
+    
+    import math
+    from soa_dsl.artifact import load_document
+    
+    doc = load_document(args.input)
+    
+    try:
+        report = analyze_aging(
+            doc,
+            args.vgs,
+            args.vds,
+            args.instances,
+            target_years=args.target_years,
+            polarity=args.polarity,
+            chunk_rows=args.chunk_rows,
+            lifetime_models_path=args.lifetime_model,
+            temp=args.temp
+        )
+    except AgingError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    
+    for warning in report.warnings:
+        print(f"⚠️  {warning}")
+    
+    results = report.results
+    if args.output:
+        write_report(results, args.output)
+    
+    failed = [r for r in results if r.violations]
+    for r in failed:
+        print(f"❌ {r.instance} ({r.monitor}): {'; '.join(r.violations)}")
+    
+    if not results:
+        print("⚠️  No instances matched an HCI/TDDB monitor")
+    elif not failed:
+        modelled = [r for r in results if not math.isnan(r.lifetime)]
+        if modelled:
+            worst = min(modelled, key=lambda r: r.lifetime)
+            print(f"✅ {len(results)} aging checks meet {args.target_years:g} years")
+            print(f"   Shortest lifetime: {worst.lifetime:.4g} years ({worst.instance})")
+        else:
+            print(f"✅ {len(results)} aging checks pass "
+                  "(no lifetime model; SOA boundary only)")
+    else:
+        print(f"   {len(failed)} of {len(results)} aging checks failed (target {args.target_years:g} years)")
+    if args.output:
+        print(f"   Report: {args.output}")
+    
+    return 1 if failed else 0
+
+
+def cmd_opcheck(args):
+    """Check operating-point dumps against parcheckva3 parameter limits."""
+    try:
+        from soa_dsl.opcheck import analyze_op_dumps, write_report, OPCheckError
+    except ImportError as e:
+        print(f"❌ Error: opcheck requires numpy ({e}); install with: pip install numpy",
+              file=sys.stderr)
+        return 1
+    
+    from soa_dsl.artifact import load_document
+    
+    doc = load_document(args.input)
+    
+    try:
+        report = analyze_op_dumps(doc, args.dumps, args.instances,
+                                  failing_only=not args.all, chunk_rows=args.chunk_rows)
+    except OPCheckError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    
+    if args.output:
+        write_report(report.results, args.output)
+    
+    for warning in report.warnings:
+        print(f"⚠️  {warning}")
+    failed = [r for r in report.results if r.violations]
+    for r in failed[:args.top]:
+        print(f"❌ {r.instance} ({r.monitor}): {'; '.join(r.violations)}")
+    if len(failed) > args.top:
+        print(f"   ... {len(failed) - args.top} more")
+    
+    points = len(report.points)
+    if not report.checks:
+        print("⚠️  No parameter checks ran: no dumped instance matched a parcheckva3 monitor "
+              "while on")
+    elif not report.failed:
+        print(f"✅ {report.checks:,} parameter checks passed at {points} sweep points")
+    else:
+        print(f"   {report.failed:,} of {report.checks:,} parameter checks failed "
+              f"at {points} sweep points")
+    if args.output:
+        print(f"   Report: {args.output}")
+    
+    return 1 if report.failed else 0
+
+
+def run_session_command(argv):
+    """Run one session command; returns (exit status, stdout, stderr)."""
+    import io
+    from contextlib import redirect_stdout, redirect_stderr
+    
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        if argv and argv[0] == 'session':
+            print("❌ Error: session cannot be nested", file=sys.stderr)
+            status = 1
+        else:
+            try:
+                status = main(argv)
+            except SystemExit as e:
+                # argparse errors and --help
+                status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return status or 0, out.getvalue(), err.getvalue()
+
+
+def cmd_plan(args):
+    """Plan which simulations can reuse cached SOA results."""
+    import json
+    from soa_dsl.spec_loader import file_digest
+    from soa_dsl.results_cache import ResultsCache, load_manifest, plan_runs
+    
+    if not args.design.exists():
+        print(f"❌ Error: Design netlist not found: {args.design}", file=sys.stderr)
+        return 1
+    
+    manifest = load_manifest(args.manifest)
+    design_hash = file_digest(args.design)
+    plans = plan_runs(manifest, design_hash, args.stimulus, ResultsCache(args.cache))
+    
+    print(f"Plan for {args.design} ({len(plans)} stimuli)")
+    for plan in plans:
+        action = "reuse all" if plan.skip else f"simulate {len(plan.simulate)} sections"
+        print(f"   {plan.stimulus:<24} {action:<24} ({len(plan.reuse)} cached)")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'design': str(args.design),
+                'design_hash': design_hash,
+                'runs': [
+                    {'stimulus': p.stimulus, 'skip': p.skip,
+                     'simulate': p.simulate, 'reuse': p.reuse}
+                    for p in plans
+                ],
+            }, f, indent=2)
+            f.write('\n')
+        print(f"✅ Wrote plan {args.output}")
+    
+    runs = sum(1 for plan in plans if not plan.skip)
+    print(f"✅ {runs} of {len(plans)} runs need simulation")
+    return 0
+
+
+def cmd_impact(args):
+    """List the outputs affected by a library or spec update."""
+    import json
+    from soa_dsl.dependencies import impact
+    
+    index, changes, affected = impact(args.deps, args.old, args.new)
+    
+    print(f"Changes {args.old} → {args.new}")
+    for category, names in changes.items():
+        print(f"   {category}: {', '.join(sorted(names))}")
+    
+    sections = sorted({index.outputs[model]['section'] for model in affected})
+    if 'parameters' in changes or 'all' in changes:
+        # Global parameters are defined in the base section
+        sections.insert(0, 'base')
+    rules = sorted({rule for model in affected for rule in index.outputs[model]['rules']})
+    for model in sorted(affected)[:20]:
+        output = index.outputs[model]
+        print(f"   {output['section']:<40} {model}  ({'; '.join(sorted(affected[model]))})")
+    if len(affected) > 20:
+        print(f"   ... {len(affected) - 20} more")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'changes': {category: sorted(names) for category, names in changes.items()},
+                'rules': rules,
+                'sections': sections,
+                'models': {
+                    model: {**index.outputs[model], 'reasons': sorted(reasons)}
+                    for model, reasons in sorted(affected.items())
+                },
+            }, f, indent=2)
+            f.write('\n')
+        print(f"✅ Wrote {args.output}")
+    
+    print(f"✅ {len(rules)} rules, {len(affected)} of {len(index.outputs)} models, "
+          f"{len(sections)} sections affected")
+    return 0
+
+
+def cmd_store_results(args):
+    """Store parsed SOA results of one simulation in the results cache."""
+    import json
+    from soa_dsl.spec_loader import file_digest
+    from soa_dsl.results_cache import ResultsCache, load_manifest, store_results
+    
+    if not args.design.exists():
+        print(f"❌ Error: Design netlist not found: {args.design}", file=sys.stderr)
+        return 1
+    
+    try:
+        with open(args.results, 'r') as f:
+            results = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Failed to load results {args.results}: {e}", file=sys.stderr)
+        return 1
+    if not isinstance(results, dict):
+        print(f"❌ Error: {args.results} must map section names to results", file=sys.stderr)
+        return 1
+    
+    manifest = load_manifest(args.manifest)
+    count = store_results(manifest, file_digest(args.design), args.stimulus,
+                          results, ResultsCache(args.cache))
+    print(f"✅ Stored {count} section results for stimulus {args.stimulus}")
+    return 0
+
+
+def cmd_session(args):
+    """Run commands from stdin in one warm process.
+    
+    Each input line is either a command line (``generate in.yaml -o out.scs``)
+    or a JSON request (``{"id": 1, "argv": ["generate", "in.yaml"]}``).
+    Command lines print their output followed by ``# exit N``; JSON requests
+    get one JSON response line with id, status, stdout and stderr.
+    """
+    import json
+    import shlex
+    
+    failed = 0
+    for line in sys.stdin:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        
+        if line.startswith('{'):
+            try:
+                request = json.loads(line)
+                argv = [str(a) for a in request['argv']]
+            except (ValueError, KeyError, TypeError) as e:
+                print(json.dumps({'status': 1, 'stdout': '', 'stderr': f"Invalid request: {e}"}),
+                      flush=True)
+                failed += 1
+                continue
+            status, out, err = run_session_command(argv)
+            print(json.dumps({'id': request.get('id'), 'status': status,
+                              'stdout': out, 'stderr': err}), flush=True)
+        else:
+            try:
+                argv = shlex.split(line)
+            except ValueError as e:
+                argv, status, out, err = None, 1, '', f"❌ Error: {e}\n"
+            if argv is not None:
+                status, out, err = run_session_command(argv)
+            sys.stdout.write(out)
+            sys.stderr.write(err)
+            print(f"# exit {status}", flush=True)
+        
+        if status:
+            failed += 1
+            if args.stop_on_error:
+                break
+    
+    return 1 if failed else 0
+
+
+def cmd_startup_check(args):
+    """Measure the import time of "--help" and check it against the budget."""
+    import subprocess
+    
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', str(Path(__file__).resolve()), '--help'],
+        capture_output=True, text=True
+    )
+    baseline = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'pass'],
+        capture_output=True, text=True
+    )
+    
+    def top_level_imports(stderr):
+        """Cumulative microseconds per top-level import from -X importtime output."""
+        imports = {}
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            if name.startswith('  ') or not cumulative.strip().isdigit():
+                continue
+            imports[name.strip()] = int(cumulative)
+        return imports
+    
+    cli_imports = top_level_imports(result.stderr)
+    base_imports = top_level_imports(baseline.stderr)
+    added = {name: us for name, us in cli_imports.items() if name not in base_imports}
+    total_ms = sum(added.values()) / 1000.0
+    
+    all_modules = [line.split('|')[-1].strip() for line in result.stderr.splitlines()
+                   if line.startswith('import time:')]
+    forbidden = sorted({m for m in all_modules if m.split('.')[0] in STARTUP_FORBIDDEN})
+    
+    print(f"   Import time for --help: {total_ms:.1f} ms (budget {args.budget_ms:g} ms)")
+    for name, us in sorted(added.items(), key=lambda item: -item[1])[:5]:
+        print(f"     {name:<24} {us / 1000.0:6.1f} ms")
+    
+    if forbidden:
+        print(f"❌ --help imports library modules: {', '.join(forbidden)}")
+    if total_ms > args.budget_ms:
+        print(f"❌ Import time over budget: {total_ms:.1f} ms > {args.budget_ms:g} ms")
+    if forbidden or total_ms > args.budget_ms:
+        return 1
+    
+    print("✅ Startup within budget")
+    return 0
+
+
 if __name__ == '__main__':
     sys.exit(main())
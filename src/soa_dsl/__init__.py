@@ -8,8 +8,15 @@ Direct mapping to Verilog-A monitor implementations.
 __version__ = "1.0.0"
 __author__ = "SOA DSL Team"
 
-from .parser import parse_file, SOADocument, Monitor, ParseError
-from .generator import generate_code, CodeGenerator
+# Public names resolve on first access so importing the package stays cheap
+_LAZY_EXPORTS = {
+    "parse_file": "parser",
+    "SOADocument": "parser",
+    "Monitor": "parser",
+    "ParseError": "parser",
+    "generate_code": "generator",
+    "CodeGenerator": "generator",
+}
 
 __all__ = [
     "parse_file",
@@ -19,3 +26,17 @@ __all__ = [
     "ParseError",
     "CodeGenerator",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
@@ -0,0 +1,472 @@
+"""
+SOA DSL Aging - HCI/TDDB Damage Accumulation
+Integrates HCI and TDDB damage of ovcheckva_ldmos_hci_tddb monitors over exported Vgs/Vds waveforms.
+
+The SOA boundary, its gating and the out-of-SOA check are those of
+ovcheck_ldmos_hci_tddb_alt.va, with its parameters bound as in the
+hci_tddb_atype_soa_shared section of spectre/soachecks_top.scs. The monitor
+itself estimates no lifetime ("use Life Time Estimator"), so lifetimes are
+only computed from an explicit lifetime model file (see
+``load_lifetime_models``) whose coefficients the user must calibrate.
+"""
+
+import csv
+import math
+import yaml
+from fnmatch import fnmatchcase
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .parser import SOADocument, Monitor
+from .expressions import ExpressionEvaluator, ExpressionError
+from .waveforms import (WaveformReader, WaveformError, DEFAULT_CHUNK_ROWS,
+                        NUMPY_FUNCTIONS, load_instances, instance_arrays)
+
+
+AGING_MONITOR = 'ovcheckva_ldmos_hci_tddb'
+
+# Boundary parameters of ovcheck_ldmos_hci_tddb_alt.va -> spec parameters bound
+# to them in spectre/soachecks_top.scs (hci_tddb_atype_soa_shared)
+BOUNDARY_PARAMETERS = {
+    'a_high': 'soa_hcitddb_a',
+    'b': 'soa_hcitddb_b',
+    'vds_wc': 'soa_hcitddb_vdswc',
+    'vgs_wc': 'soa_hcitddb_vgswc',
+}
+
+# soa_hcitddb_vdswc as computed in soachecks_top.scs, used when it is not set
+VDSWC_EXPRESSION = ('soa_hcitddb_vdsref + soa_hcitddb_wfac * ln(1e-6 * $w / soa_hcitddb_wref)'
+                    ' + soa_hcitddb_tfac * (1 / (temp + tcelsius0) - 1 / soa_hcitddb_tref)')
+VDSWC_INPUTS = ('soa_hcitddb_vdsref', 'soa_hcitddb_wfac', 'soa_hcitddb_wref',
+                'soa_hcitddb_tfac', 'soa_hcitddb_tref')
+
+# Simulation temperature [C] used for soa_hcitddb_vdswc (Spectre default)
+DEFAULT_TEMP = 27.0
+TCELSIUS0 = 273.15
+
+# tmaxfrac default of the Verilog-A monitor (no severity)
+DEFAULT_TMAXFRAC = -2.0
+
+# No boundary check beyond this |Vgs| (as in ovcheck_ldmos_hci_tddb_alt.va)
+VGS_LIMIT = 15.0
+
+# Lifetime model mechanisms and their fields (see load_lifetime_models)
+MECHANISMS = ('hci', 'tddb')
+MODEL_FIELDS = ('log10_ttf', 'accel')
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+class AgingError(Exception):
+    """Exception raised for aging analysis errors."""
+    pass
+
+
+@dataclass
+class AgingResult:
+    """Out-of-SOA time, accumulated damage and lifetime for one instance and monitor.
+    
+    Lifetimes of mechanisms without a lifetime model are NaN.
+    """
+    instance: str
+    subcircuit: str
+    monitor: str
+    hci_damage: float
+    tddb_damage: float
+    oor_fraction: float
+    peak_overstress: float
+    hci_lifetime: float
+    tddb_lifetime: float
+    violations: List[str] = field(default_factory=list)
+    
+    @property
+    def lifetime(self) -> float:
+        """Lifetime in years (first modelled mechanism to fail, NaN if none is modelled)."""
+        modelled = [t for t in (self.hci_lifetime, self.tddb_lifetime) if not math.isnan(t)]
+        return min(modelled, default=math.nan)
+
+
+@dataclass
+class AgingReport:
+    """Results of an aging analysis."""
+    results: List[AgingResult]
+    warnings: List[str] = field(default_factory=list)
+
+
+def load_lifetime_models(path: Path) -> List[Tuple[str, Dict[str, Dict[str, Any]]]]:
+    """Load a lifetime model file: (subcircuit pattern, mechanisms) in file order.
+    
+    The file maps subcircuit glob patterns to ``hci`` and/or ``tddb``
+    blocks under ``lifetime_models``; the first matching pattern wins::
+    
+        lifetime_models:
+          pch_90v_mac:
+            hci:  {log10_ttf: 8, accel: 1.0}    # 10^8 s at the boundary, e-fold per V overstress
+            tddb: {log10_ttf: 12, accel: 0.5}   # 10^12 s at Vgs = 0, e-fold per 2 V |Vgs|
+    
+    Time to failure is 10^log10_ttf * exp(-accel * x) seconds, with x the
+    overstress beyond the SOA boundary (HCI) or |Vgs| (TDDB). Values may be
+    expressions using global and instance parameters.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise AgingError(f"Failed to load lifetime models {path}: {e}")
+    
+    models = data.get('lifetime_models') if isinstance(data, dict) else None
+    if not isinstance(models, dict):
+        raise AgingError(f"Lifetime model file needs a 'lifetime_models' mapping: {path}")
+    
+    result = []
+    for pattern, mechanisms in models.items():
+        if not isinstance(mechanisms, dict) or not mechanisms:
+            raise AgingError(f"Lifetime model {pattern}: expected hci and/or tddb blocks")
+        for name, coefficients in mechanisms.items():
+            if name not in MECHANISMS:
+                raise AgingError(f"Lifetime model {pattern}: unknown mechanism {name} "
+                                 f"(use {', '.join(MECHANISMS)})")
+            if not isinstance(coefficients, dict) or 'log10_ttf' not in coefficients:
+                raise AgingError(f"Lifetime model {pattern}: {name} needs log10_ttf")
+            unknown = set(coefficients) - set(MODEL_FIELDS)
+            if unknown:
+                raise AgingError(f"Lifetime model {pattern}: {name} has unknown fields "
+                                 f"{', '.join(sorted(unknown))}")
+        result.append((str(pattern), mechanisms))
+    return result
+
+
+def boundary_vds(vgs: np.ndarray, a: np.ndarray, b: np.ndarray,
+                 vds_wc: np.ndarray, vgs_wc: np.ndarray) -> np.ndarray:
+    """Vds boundary of the p-type SOA as a function of Vgs (Vds below it is out of SOA)."""
+    x = (vgs - vgs_wc) / b
+    return a * (vgs - vgs_wc) + vds_wc - a * b * np.expm1(x)
+
+
+class AgingAnalyzer:
+    """Checks ovcheckva_ldmos_hci_tddb monitors over Vgs/Vds mission profiles.
+    
+    The SOA boundary is the one of ovcheck_ldmos_hci_tddb_alt.va (p-type;
+    n-type devices are mirrored); a boundary parameter the monitor does
+    not set defaults to 0, which disables the boundary as in the Verilog-A
+    monitor. As there, an instance fails when the fraction of time out of
+    SOA reaches tmaxfrac (tmaxfrac < 0 only asks for review).
+    
+    With lifetime models, HCI damage accrues at
+    1 / (10^log10_ttf * exp(-accel * overstress)) while Vds is beyond the
+    boundary and TDDB damage at 1 / (10^log10_ttf * exp(-accel * |Vgs|))
+    over the whole profile. Damage is summed with Miner's rule and
+    extrapolated to a lifetime assuming the profile repeats.
+    
+    Both waveforms are read in matching chunks; per chunk all quantities
+    are vectorized over time and instances.
+    """
+    
+    def __init__(self, document: SOADocument, instances: List[Dict[str, Any]],
+                 polarity: str = 'p', lifetime_models: Optional[List[Tuple[str, Any]]] = None,
+                 temp: float = DEFAULT_TEMP):
+        if polarity not in ('p', 'n'):
+            raise AgingError(f"Unknown polarity: {polarity}")
+        self.document = document
+        self.instances = instances
+        self.sign = 1.0 if polarity == 'p' else -1.0
+        self.lifetime_models = lifetime_models or []
+        self.temp = temp
+    
+    def aging_monitors(self) -> List[Monitor]:
+        """Monitors checking the HCI/TDDB SOA boundary."""
+        return [m for m in self.document.monitors if m.monitor_type == AGING_MONITOR]
+    
+    def analyze(self, vgs_path: Path, vds_path: Path, target_years: float = 10.0,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS) -> AgingReport:
+        """Run all aging checks over matching Vgs and Vds waveform files."""
+        report = AgingReport(results=[])
+        try:
+            vgs_reader = WaveformReader(vgs_path, chunk_rows)
+            vds_reader = WaveformReader(vds_path, chunk_rows)
+            available = set(vgs_reader.signals) & set(vds_reader.signals)
+            checks, coeffs = self._build_checks(available, report.warnings)
+            if not checks:
+                return report
+            
+            signals = list(dict.fromkeys(check[0]['instance'] for check in checks))
+            position = {name: i for i, name in enumerate(signals)}
+            columns = np.array([position[check[0]['instance']] for check in checks])
+            
+            chunks = zip(vgs_reader.chunks(signals), vds_reader.chunks(signals))
+            stats = self._accumulate(chunks, columns, coeffs)
+        except (ExpressionError, WaveformError) as e:
+            raise AgingError(str(e))
+        
+        report.results = self._build_results(checks, stats, coeffs, target_years)
+        return report
+    
+    def _monitor_evaluator(self, monitor: Monitor) -> ExpressionEvaluator:
+        """Evaluator with the monitor's own soa_hcitddb_* values over the global parameters."""
+        local = {k: v for k, v in monitor.parameters.extra.items() if k.startswith('soa_hcitddb_')}
+        local.update({k: v for k, v in (monitor.hci_tddb_params or {}).items()
+                      if k.startswith('soa_hcitddb_')})
+        return ExpressionEvaluator(
+            {**self.document.parameters, **local, 'temp': self.temp, 'tcelsius0': TCELSIUS0},
+            NUMPY_FUNCTIONS
+        )
+    
+    def _boundary_sources(self, monitor: Monitor, evaluator: ExpressionEvaluator
+                          ) -> Dict[str, Optional[Any]]:
+        """Value or expression of each boundary parameter, None if not set.
+        
+        A Verilog-A parameter set directly (hci_tddb_params) wins over the
+        spec parameter bound to it in soachecks_top.scs.
+        """
+        known = evaluator.parameters
+        direct = monitor.hci_tddb_params or {}
+        sources: Dict[str, Optional[Any]] = {}
+        for name, param in BOUNDARY_PARAMETERS.items():
+            if direct.get(name) is not None:
+                sources[name] = direct[name]
+            elif param in known:
+                sources[name] = param
+            elif name == 'vds_wc' and all(p in known for p in VDSWC_INPUTS):
+                sources[name] = VDSWC_EXPRESSION
+            else:
+                sources[name] = None
+        return sources
+    
+    def _model_index(self, subcircuit: str) -> Optional[int]:
+        """Index of the first lifetime model matching a subcircuit, None without one."""
+        for k, (pattern, _) in enumerate(self.lifetime_models):
+            if fnmatchcase(subcircuit, pattern):
+                return k
+        return None
+    
+    def _build_checks(self, signals: set, warnings: List[str]
+                      ) -> Tuple[List[Tuple[Dict[str, Any], Monitor]], Dict[str, np.ndarray]]:
+        """Pair instances with monitors and evaluate boundaries and lifetime models as arrays.
+        
+        Model columns are ``<mechanism>_on`` (1 if modelled) and
+        ``<mechanism>_<field>`` (NaN if not modelled).
+        """
+        checks = []
+        columns: Dict[str, List[np.ndarray]] = {}
+        
+        for monitor in self.aging_monitors():
+            matched = [
+                inst for inst in self.instances
+                if inst['instance'] in signals
+                and fnmatchcase(inst['subcircuit'], monitor.device_pattern)
+            ]
+            if not matched:
+                continue
+            
+            n = len(matched)
+            evaluator = self._monitor_evaluator(monitor)
+            values: Dict[str, np.ndarray] = {}
+            
+            sources = self._boundary_sources(monitor, evaluator)
+            unset = [name for name, source in sources.items() if source is None]
+            if unset:
+                warnings.append(f"{monitor.name}: {', '.join(unset)} not set, defaults to 0 "
+                                "as in ovcheck_ldmos_hci_tddb_alt.va")
+            params = instance_arrays(matched)
+            for name, source in sources.items():
+                value = 0.0 if source is None else evaluator.evaluate(source, params)
+                values[name] = np.broadcast_to(np.asarray(value, dtype=np.float64), (n,))
+            
+            active = (values['vds_wc'] < 0) & (values['vgs_wc'] < 0) & (values['b'] != 0)
+            if not active.all():
+                warnings.append(f"{monitor.name}: SOA boundary inactive for "
+                                f"{int((~active).sum())} of {n} instances "
+                                "(vds_wc and vgs_wc must both be < 0)")
+            
+            tmaxfrac = monitor.parameters.tmaxfrac
+            tmaxfrac = DEFAULT_TMAXFRAC if tmaxfrac is None else evaluator.evaluate(tmaxfrac)
+            values['tmaxfrac'] = np.full(n, float(tmaxfrac))
+            
+            for mechanism in MECHANISMS:
+                values[f'{mechanism}_on'] = np.zeros(n)
+                for name in MODEL_FIELDS:
+                    values[f'{mechanism}_{name}'] = np.full(n, np.nan)
+            groups: Dict[int, List[int]] = {}
+            for i, inst in enumerate(matched):
+                k = self._model_index(inst['subcircuit'])
+                if k is not None:
+                    groups.setdefault(k, []).append(i)
+            for k, rows in groups.items():
+                subset = instance_arrays([matched[i] for i in rows])
+                for mechanism, coefficients in self.lifetime_models[k][1].items():
+                    values[f'{mechanism}_on'][rows] = 1.0
+                    for name in MODEL_FIELDS:
+                        values[f'{mechanism}_{name}'][rows] = evaluator.evaluate(
+                            coefficients.get(name, 0.0), subset)
+            
+            for key, value in values.items():
+                columns.setdefault(key, []).append(value)
+            checks.extend((inst, monitor) for inst in matched)
+        
+        if not checks:
+            return [], {}
+        return checks, {key: np.concatenate(values) for key, values in columns.items()}
+    
+    def _rates(self, vgs: np.ndarray, vds: np.ndarray,
+               coeffs: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """HCI rate, TDDB rate and overstress per sample (rows x instances)."""
+        a, b = coeffs['a_high'], coeffs['b']
+        vds_wc, vgs_wc = coeffs['vds_wc'], coeffs['vgs_wc']
+        # Same gating as the Verilog-A monitor: only with a negative worst-case corner
+        active = (vds_wc < 0) & (vgs_wc < 0) & (b != 0)
+        
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            boundary = boundary_vds(vgs, a, np.where(b != 0, b, 1.0), vds_wc, vgs_wc)
+            overstress = np.where(active & (np.abs(vgs) < VGS_LIMIT) & (vds < boundary),
+                                  boundary - vds, 0.0)
+            
+            hci = np.where((coeffs['hci_on'] > 0) & (overstress > 0),
+                           np.exp(coeffs['hci_accel'] * overstress)
+                           * 10.0 ** -coeffs['hci_log10_ttf'], 0.0)
+            tddb = np.where(coeffs['tddb_on'] > 0,
+                            np.exp(coeffs['tddb_accel'] * np.abs(vgs))
+                            * 10.0 ** -coeffs['tddb_log10_ttf'], 0.0)
+        
+        return hci, tddb, overstress
+    
+    def _accumulate(self, chunks, columns: np.ndarray,
+                    coeffs: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Integrate damage rates and out-of-SOA time (trapezoidal)."""
+        n = len(columns)
+        hci_damage = np.zeros(n)
+        tddb_damage = np.zeros(n)
+        oor_time = np.zeros(n)
+        peak = np.zeros(n)
+        t_start = None
+        prev = None
+        
+        for vgs_block, vds_block in chunks:
+            if vgs_block.shape[0] != vds_block.shape[0] or not np.allclose(
+                    vgs_block[:, 0], vds_block[:, 0], rtol=1e-9, atol=0.0):
+                raise AgingError("Vgs and Vds waveforms must share the same time points")
+            
+            t = vgs_block[:, 0]
+            vgs = self.sign * vgs_block[:, 1:][:, columns]
+            vds = self.sign * vds_block[:, 1:][:, columns]
+            hci, tddb, overstress = self._rates(vgs, vds, coeffs)
+            oor = (overstress > 0).astype(np.float64)
+            
+            if prev is None:
+                t_start = t[0]
+            else:
+                t = np.concatenate(([prev[0]], t))
+                hci = np.vstack((prev[1], hci))
+                tddb = np.vstack((prev[2], tddb))
+                oor = np.vstack((prev[3], oor))
+            prev = (t[-1], hci[-1], tddb[-1], oor[-1])
+            
+            peak = np.maximum(peak, overstress.max(axis=0))
+            if len(t) < 2:
+                continue
+            
+            dt = np.diff(t)
+            if (dt < 0).any():
+                raise AgingError(f"Time is not monotonic near t={t[np.argmax(dt < 0)]}")
+            
+            weights = 0.5 * dt[:, None]
+            hci_damage += ((hci[:-1] + hci[1:]) * weights).sum(axis=0)
+            tddb_damage += ((tddb[:-1] + tddb[1:]) * weights).sum(axis=0)
+            oor_time += ((oor[:-1] + oor[1:]) * weights).sum(axis=0)
+        
+        if prev is None:
+            raise AgingError("Waveform files contain no data")
+        
+        return {
+            'duration': prev[0] - t_start,
+            'hci_damage': hci_damage,
+            'tddb_damage': tddb_damage,
+            'oor_time': oor_time,
+            'peak_overstress': peak,
+        }
+    
+    def _lifetime(self, duration: float, damage: float, modelled: bool) -> float:
+        """Lifetime in years if the profile repeats (inf without damage, NaN if not modelled)."""
+        if not modelled:
+            return math.nan
+        if damage <= 0 or duration <= 0:
+            return math.inf
+        return duration / damage / SECONDS_PER_YEAR
+    
+    def _build_results(self, checks, stats: Dict[str, Any], coeffs: Dict[str, np.ndarray],
+                       target_years: float) -> List[AgingResult]:
+        """Turn out-of-SOA time and accumulated damage into per-instance results."""
+        duration = float(stats['duration'])
+        active = (coeffs['vds_wc'] < 0) & (coeffs['vgs_wc'] < 0) & (coeffs['b'] != 0)
+        results = []
+        for k, (inst, monitor) in enumerate(checks):
+            hci_damage = float(stats['hci_damage'][k])
+            tddb_damage = float(stats['tddb_damage'][k])
+            result = AgingResult(
+                instance=inst['instance'],
+                subcircuit=inst['subcircuit'],
+                monitor=monitor.name,
+                hci_damage=hci_damage,
+                tddb_damage=tddb_damage,
+                oor_fraction=float(stats['oor_time'][k] / duration) if duration > 0 else 0.0,
+                peak_overstress=float(stats['peak_overstress'][k]),
+                hci_lifetime=self._lifetime(duration, hci_damage, coeffs['hci_on'][k] > 0),
+                tddb_lifetime=self._lifetime(duration, tddb_damage, coeffs['tddb_on'][k] > 0),
+            )
+            
+            # Severity as in the Verilog-A monitor: tmaxfrac < 0 only flags for review
+            tmaxfrac = float(coeffs['tmaxfrac'][k])
+            if (active[k] and stats['oor_time'][k] > 0 and tmaxfrac >= 0
+                    and result.oor_fraction >= tmaxfrac):
+                result.violations.append(
+                    f"out of SOA {result.oor_fraction:.4g} of the time (tmaxfrac={tmaxfrac:g})"
+                )
+            for mechanism, lifetime in (('HCI', result.hci_lifetime),
+                                        ('TDDB', result.tddb_lifetime)):
+                if coeffs[f'{mechanism.lower()}_on'][k] == 0:
+                    continue
+                if math.isnan(lifetime):
+                    result.violations.append(f"{mechanism} lifetime not evaluable")
+                elif lifetime < target_years:
+                    result.violations.append(
+                        f"{mechanism} lifetime {lifetime:.4g} y < {target_years:g} y"
+                    )
+            
+            results.append(result)
+        
+        return results
+
+
+def write_report(results: List[AgingResult], output_path: Path):
+    """Write aging results as CSV."""
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['instance', 'subcircuit', 'monitor', 'hci_damage', 'tddb_damage',
+                         'oor_fraction', 'peak_overstress', 'hci_lifetime_years',
+                         'tddb_lifetime_years', 'violations'])
+        for r in results:
+            writer.writerow([
+                r.instance, r.subcircuit, r.monitor,
+                f"{r.hci_damage:.6g}", f"{r.tddb_damage:.6g}",
+                f"{r.oor_fraction:.6g}", f"{r.peak_overstress:.6g}",
+                f"{r.hci_lifetime:.6g}", f"{r.tddb_lifetime:.6g}",
+                '; '.join(r.violations),
+            ])
+
+
+def analyze_aging(document: SOADocument, vgs_path: Path, vds_path: Path, instances_path: Path,
+                  target_years: float = 10.0, polarity: str = 'p',
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                  lifetime_models_path: Optional[Path] = None,
+                  temp: float = DEFAULT_TEMP) -> AgingReport:
+    """Convenience function to check Vgs/Vds waveforms against aging monitors."""
+    try:
+        instances = load_instances(instances_path)
+    except WaveformError as e:
+        raise AgingError(str(e))
+    
+    models = load_lifetime_models(lifetime_models_path) if lifetime_models_path else None
+    analyzer = AgingAnalyzer(document, instances, polarity, models, temp)
+    return analyzer.analyze(vgs_path, vds_path, target_years, chunk_rows)
@@ -0,0 +1,145 @@
+"""
+SOA DSL Compiled Artifact - Binary SOADocument Cache
+Stores a validated SOADocument in a versioned binary file (.soac) for fast reload.
+"""
+
+import json
+import pickle
+import struct
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional, BinaryIO
+
+from .parser import SOADocument, ParseError, parse, parse_file
+from .spec_loader import file_digest
+from .rule_store import is_rule_store, load_store_monitors
+
+
+ARTIFACT_SUFFIX = '.soac'
+MAGIC = b'SOAC'
+# Bump whenever the SOADocument dataclasses or the layout below change
+FORMAT_VERSION = 1
+
+# MAGIC | u16 format version | u32 header length | JSON header | pickled SOADocument
+_PREAMBLE = struct.Struct('>4sHI')
+
+
+def inputs_digest(inputs: Dict[str, str]) -> str:
+    """Combined hash over all input file hashes."""
+    digest = hashlib.sha256()
+    for path in sorted(inputs):
+        digest.update(f"{path}\0{inputs[path]}\0".encode())
+    return digest.hexdigest()
+
+
+def write_artifact(document: SOADocument, artifact_path: Path, inputs: List[Path],
+                   source: Optional[Path] = None):
+    """Write a compiled artifact.
+    
+    ``inputs`` are the files the document was derived from; the artifact is
+    stale as soon as any of them changes. ``source`` is the monitor YAML the
+    document corresponds to, if one was written.
+    """
+    input_hashes = {}
+    for path in inputs:
+        input_hashes[str(Path(path).resolve())] = file_digest(path)
+    
+    header = {
+        'format': FORMAT_VERSION,
+        'inputs': input_hashes,
+        'digest': inputs_digest(input_hashes),
+        'source': str(Path(source).resolve()) if source else None,
+    }
+    header_bytes = json.dumps(header, sort_keys=True).encode()
+    payload = pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    with open(artifact_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(payload)
+
+
+def _read_header(f: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read the preamble and header, leaving ``f`` at the payload."""
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) != _PREAMBLE.size:
+        return None
+    magic, version, header_len = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    return json.loads(f.read(header_len))
+
+
+def read_artifact_header(artifact_path: Path) -> Optional[Dict[str, Any]]:
+    """Read an artifact header; None if the file is not a current-format artifact."""
+    try:
+        with open(artifact_path, 'rb') as f:
+            return _read_header(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(header: Dict[str, Any]) -> bool:
+    """True if every recorded input still has the recorded hash."""
+    for path, digest in header.get('inputs', {}).items():
+        try:
+            if file_digest(path) != digest:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def load_artifact(artifact_path: Path) -> Optional[SOADocument]:
+    """Load a compiled artifact; None if it is missing, outdated or stale.
+    
+    Artifacts are trusted local build products (the payload is a pickle);
+    do not load artifacts from untrusted sources.
+    """
+    try:
+        with open(artifact_path, 'rb') as f:
+            header = _read_header(f)
+            if header is None or not is_fresh(header):
+                return None
+            document = pickle.load(f)
+    except (OSError, ValueError, EOFError, AttributeError, pickle.UnpicklingError):
+        return None
+    
+    return document if isinstance(document, SOADocument) else None
+
+
+def load_document(filepath: Path) -> SOADocument:
+    """Load a monitor spec, preferring a fresh compiled artifact.
+    
+    ``filepath`` may be a .soac artifact, a rule store (its converted
+    monitors) or a monitor YAML file. For YAML, a sibling .soac written for
+    that file is used when it is fresh; stale artifacts fall back to parsing
+    the YAML.
+    """
+    filepath = Path(filepath)
+    
+    if is_rule_store(filepath):
+        return parse(load_store_monitors(filepath))
+    
+    if filepath.suffix == ARTIFACT_SUFFIX:
+        document = load_artifact(filepath)
+        if document is not None:
+            return document
+        
+        header = read_artifact_header(filepath)
+        source = header.get('source') if header else None
+        if source and Path(source).exists():
+            return parse_file(Path(source))
+        if not filepath.exists():
+            raise ParseError(f"File not found: {filepath}")
+        raise ParseError(f"Compiled artifact is stale or invalid, recompile: {filepath}")
+    
+    artifact_path = filepath.with_suffix(ARTIFACT_SUFFIX)
+    if artifact_path.exists():
+        header = read_artifact_header(artifact_path)
+        if header and header.get('source') == str(filepath.resolve()):
+            document = load_artifact(artifact_path)
+            if document is not None:
+                return document
+    
+    return parse_file(filepath)
@@ -3,11 +3,27 @@ SOA DSL Converter - Universal to Monitor-Aware Specification
 Converts user-friendly universal YAML to monitor-specific YAML.
 """
 
+import os
+import re
 import yaml
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Iterator
 from dataclasses import dataclass, field
 
+from .spec_loader import IncludeError, load_universal_spec, merge_globals
+from .packing import pack_branches, DEFAULT_BRANCH_LIMIT
+from .dependencies import DependencyIndex
+from .rule_store import is_rule_store, load_store_spec, RuleStoreError
+
+
+# Characters replaced by '_' in model and section names
+_SLUG_INVALID = re.compile(r'[^a-z0-9_]')
+
+# Minimum number of rules per worker task; smaller specs are converted serially
+PARALLEL_CHUNK_RULES = 64
+
 
 class ConversionError(Exception):
     """Exception raised for conversion errors."""
@@ -21,11 +37,39 @@ class ConversionContext:
     monitor_library: Dict[str, Any]
     global_config: Dict[str, Any]
     time_limit_map: Dict[str, str] = field(default_factory=dict)
+    group_closures: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
     
     def __post_init__(self):
         # Build time limit mapping
         if 'time_limit_mapping' in self.monitor_library:
             self.time_limit_map = self.monitor_library['time_limit_mapping']
+        
+        # Expand device groups once per conversion
+        self.group_closures = resolve_group_closures(self.device_library)
+
+
+def resolve_group_closures(device_library: Dict[str, Any]) -> Dict[str, Dict[str, List[str]]]:
+    """Expand level 1 and level 2 device groups to their subcircuits.
+    
+    The result is keyed like the ``applies_to`` entries of a universal rule
+    (``level1_group`` / ``level2_group``), then by group name.
+    """
+    level1 = {}
+    for name, info in (device_library.get('level1_groups') or {}).items():
+        level1[name] = list(dict.fromkeys(info.get('subcircuits', [])))
+    
+    level2 = {}
+    for name, info in (device_library.get('level2_groups') or {}).items():
+        members = []
+        for group in info.get('level1_groups', []):
+            if group not in level1:
+                raise ConversionError(
+                    f"Level 2 group '{name}' references unknown level 1 group: {group}"
+                )
+            members.extend(level1[group])
+        level2[name] = list(dict.fromkeys(members))
+    
+    return {'level1_group': level1, 'level2_group': level2}
 
 
 class UniversalToMonitorConverter:
@@ -34,6 +78,21 @@ class UniversalToMonitorConverter:
     def __init__(self, device_library_path: Path, monitor_library_path: Path):
         self.device_lib = self._load_yaml(device_library_path)
         self.monitor_lib = self._load_yaml(monitor_library_path)
+        # Universal spec files read by the last convert() (top spec first)
+        self.sources: List[Path] = []
+        # globals of the spec read by the last convert()
+        self.global_config: Dict[str, Any] = {}
+    
+    @classmethod
+    def from_libraries(cls, device_lib: Dict[str, Any],
+                       monitor_lib: Dict[str, Any]) -> 'UniversalToMonitorConverter':
+        """Create a converter from already loaded libraries."""
+        converter = cls.__new__(cls)
+        converter.device_lib = device_lib
+        converter.monitor_lib = monitor_lib
+        converter.sources = []
+        converter.global_config = {}
+        return converter
         
     def _load_yaml(self, filepath: Path) -> Dict[str, Any]:
         """Load YAML file."""
@@ -43,15 +102,37 @@ class UniversalToMonitorConverter:
         except Exception as e:
             raise ConversionError(f"Failed to load {filepath}: {e}")
     
-    def convert(self, universal_spec_path: Path) -> Dict[str, Any]:
-        """Convert universal YAML to monitor YAML."""
-        universal = self._load_yaml(universal_spec_path)
+    def _load_spec(self, filepath: Path) -> Dict[str, Any]:
+        """Load a universal spec, resolving includes, or the rules of a rule store."""
+        self.sources = []
+        try:
+            if is_rule_store(filepath):
+                self.sources.append(Path(filepath))
+                return load_store_spec(filepath)
+            return load_universal_spec(filepath, self.sources)
+        except (IncludeError, RuleStoreError) as e:
+            raise ConversionError(str(e))
+        except OSError as e:
+            raise ConversionError(f"Failed to load {filepath}: {e}")
+    
+    def convert(self, universal_spec_path: Path, jobs: int = 1, pack: bool = False,
+                dependencies: Optional[DependencyIndex] = None) -> Dict[str, Any]:
+        """Convert universal YAML to monitor YAML.
+        
+        With ``jobs`` > 1 the rules are converted in worker processes; the
+        result is identical to the serial conversion. ``jobs`` = 0 uses all
+        available cores. With ``pack``, single-branch ovcheck monitors are
+        packed into ovcheck6 monitors (see packing.py). If ``dependencies``
+        is given, every emitted monitor is recorded in it (see dependencies.py).
+        """
+        universal = self._load_spec(universal_spec_path)
+        self.global_config = universal.get('globals', {})
         
         # Create conversion context
         ctx = ConversionContext(
             device_library=self.device_lib,
             monitor_library=self.monitor_lib,
-            global_config=universal.get('globals', {})
+            global_config=self.global_config
         )
         
         # Build monitor document
@@ -65,12 +146,109 @@ class UniversalToMonitorConverter:
         }
         
         # Convert each rule to monitor(s)
-        for rule in universal.get('rules', []):
-            monitors = self._convert_rule(rule, ctx)
-            monitor_doc['monitors'].extend(monitors)
+        rules = universal.get('rules', [])
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+        
+        if jobs > 1 and len(rules) > PARALLEL_CHUNK_RULES:
+            monitor_doc['monitors'] = self._convert_rules_parallel(rules, ctx, jobs)
+        else:
+            for rule in rules:
+                monitors = self._convert_rule(rule, ctx)
+                monitor_doc['monitors'].extend(monitors)
+        
+        if dependencies is not None:
+            self._record_dependencies(rules, monitor_doc, ctx, dependencies)
+        
+        if pack:
+            ovcheck6 = self.monitor_lib.get('monitors', {}).get('ovcheck6', {})
+            origins: Dict[str, List[str]] = {}
+            monitor_doc['monitors'] = pack_branches(
+                monitor_doc['monitors'],
+                ovcheck6.get('branch_limit', DEFAULT_BRANCH_LIMIT),
+                origins
+            )
+            if dependencies is not None:
+                dependencies.remap(monitor_doc['monitors'], origins)
         
         return monitor_doc
     
+    def convert_rules(self, universal: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Convert a loaded universal spec rule by rule, yielding (rule, monitors).
+        
+        Serial and without packing; ``corner_globals({})`` afterwards gives
+        the matching global and parameters sections.
+        """
+        self.global_config = universal.get('globals', {})
+        ctx = ConversionContext(
+            device_library=self.device_lib,
+            monitor_library=self.monitor_lib,
+            global_config=self.global_config
+        )
+        for rule in universal.get('rules', []):
+            yield rule, self._convert_rule(rule, ctx)
+    
+    def _record_dependencies(self, rules: List[Dict[str, Any]], monitor_doc: Dict[str, Any],
+                             ctx: ConversionContext, dependencies: DependencyIndex):
+        """Record each monitor's library entries and parameters in the index.
+        
+        A rule yields one monitor per resolved device, in order, so the
+        monitor list is matched back to its rules by position.
+        """
+        monitors = monitor_doc['monitors']
+        position = 0
+        for rule in rules:
+            count = len(self._resolve_devices(rule, ctx))
+            for monitor in monitors[position:position + count]:
+                dependencies.add(monitor, rule, self.device_lib, monitor_doc['parameters'])
+            position += count
+    
+    def corner_globals(self, override: Dict[str, Any]) -> Dict[str, Any]:
+        """``global`` and ``parameters`` sections for a corner of the last converted spec.
+        
+        ``override`` is merged into the spec's ``globals`` (timing,
+        time_limits, parameters). Monitors only refer to these values by
+        name, so the monitor list of the conversion is valid for every corner.
+        """
+        if not isinstance(override, dict):
+            raise ConversionError(f"Corner globals must be a mapping, got: {override!r}")
+        
+        ctx = ConversionContext(
+            device_library=self.device_lib,
+            monitor_library=self.monitor_lib,
+            global_config=merge_globals(self.global_config, override)
+        )
+        return {
+            'global': self._build_global_section(ctx),
+            'parameters': self._build_parameters_section(ctx),
+        }
+    
+    def _convert_rules_parallel(self, rules: List[Dict[str, Any]], ctx: ConversionContext,
+                                jobs: int) -> List[Dict[str, Any]]:
+        """Convert rules in worker processes, merging results in rule order."""
+        # About four contiguous chunks per worker for load balancing
+        chunk_size = max(PARALLEL_CHUNK_RULES, -(-len(rules) // (jobs * 4)))
+        chunks = [rules[i:i + chunk_size] for i in range(0, len(rules), chunk_size)]
+        
+        # Forked workers share the parent's libraries copy-on-write; other
+        # start methods receive one pickled copy per worker
+        if 'fork' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('fork')
+        else:
+            mp_context = None
+        
+        monitors = []
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)),
+                                 mp_context=mp_context,
+                                 initializer=_init_conversion_worker,
+                                 initargs=(self.device_lib, self.monitor_lib,
+                                           ctx.global_config)) as executor:
+            # map() yields chunk results in submission order
+            for chunk_monitors in executor.map(_convert_rule_chunk, chunks):
+                monitors.extend(chunk_monitors)
+        
+        return monitors
+    
     def _build_global_section(self, ctx: ConversionContext) -> Dict[str, Any]:
         """Build global section for monitor YAML."""
         timing = ctx.global_config.get('timing', {})
@@ -114,7 +292,7 @@ class UniversalToMonitorConverter:
         monitors = []
         
         # Get device info
-        device_names = rule['applies_to']['devices']
+        device_names = self._resolve_devices(rule, ctx)
         
         # For each device, create a monitor
         for device_name in device_names:
@@ -130,9 +308,32 @@ class UniversalToMonitorConverter:
         
         return monitors
     
+    def _resolve_devices(self, rule: Dict[str, Any], ctx: ConversionContext) -> List[str]:
+        """Resolve the subcircuits a rule applies to (direct names and groups)."""
+        applies_to = rule.get('applies_to', {})
+        
+        device_names = []
+        device_names.extend(applies_to.get('subcircuits', []))
+        device_names.extend(applies_to.get('devices', []))
+        
+        for key in ('level1_group', 'level2_group'):
+            if key not in applies_to:
+                continue
+            group = applies_to[key]
+            closures = ctx.group_closures.get(key, {})
+            if group not in closures:
+                raise ConversionError(f"Unknown {key.replace('_', ' ')}: {group}")
+            device_names.extend(closures[group])
+        
+        if not device_names:
+            raise ConversionError(f"Rule '{rule.get('name')}' does not apply to any device")
+        
+        # Keep first occurrence order, drop duplicates
+        return list(dict.fromkeys(device_names))
+    
     def _get_device_info(self, device_name: str, ctx: ConversionContext) -> Dict[str, Any]:
         """Get device information from library."""
-        devices = ctx.device_library.get('devices', {})
+        devices = ctx.device_library.get('subcircuits') or ctx.device_library.get('devices', {})
         
         if device_name not in devices:
             raise ConversionError(f"Unknown device: {device_name}")
@@ -391,17 +592,85 @@ class UniversalToMonitorConverter:
         return "0"
     
     def _slugify(self, text: str) -> str:
-        """Convert text to slug (lowercase, underscores)."""
-        return text.lower().replace(' ', '_').replace('-', '_')
+        """Convert text to slug (lowercase, underscores).
+        
+        Every character that is not valid in a Spectre name becomes an
+        underscore (e.g. "HCI/TDDB" -> "hci_tddb").
+        """
+        return _SLUG_INVALID.sub('_', text.lower())
 
 
-def convert_universal_to_monitor(universal_path: Path, device_lib_path: Path,
-                                 monitor_lib_path: Path, output_path: Path):
-    """Convenience function to convert universal spec to monitor spec."""
+# Per-process converter state, set up once by _init_conversion_worker
+_worker_state: Optional[Tuple[UniversalToMonitorConverter, ConversionContext]] = None
+
+
+def _init_conversion_worker(device_lib: Dict[str, Any], monitor_lib: Dict[str, Any],
+                            global_config: Dict[str, Any]):
+    """Build the read-only converter and context of a worker process."""
+    global _worker_state
+    converter = UniversalToMonitorConverter.from_libraries(device_lib, monitor_lib)
+    ctx = ConversionContext(
+        device_library=device_lib,
+        monitor_library=monitor_lib,
+        global_config=global_config
+    )
+    _worker_state = (converter, ctx)
+
+
+def _convert_rule_chunk(rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert a contiguous chunk of rules in a worker process."""
+    converter, ctx = _worker_state
+    monitors = []
+    for rule in rules:
+        monitors.extend(converter._convert_rule(rule, ctx))
+    return monitors
+
+
+def _convert_and_write(universal_path: Path, device_lib_path: Path, monitor_lib_path: Path,
+                       output_path: Path, jobs: int, sources: Optional[List[Path]], pack: bool,
+                       dependencies: Optional[DependencyIndex]
+                       ) -> Tuple[UniversalToMonitorConverter, Dict[str, Any]]:
+    """Convert a universal spec, record its sources and write the monitor spec."""
     converter = UniversalToMonitorConverter(device_lib_path, monitor_lib_path)
-    monitor_doc = converter.convert(universal_path)
+    monitor_doc = converter.convert(universal_path, jobs=jobs, pack=pack,
+                                    dependencies=dependencies)
+    
+    if sources is not None:
+        sources.extend(converter.sources)
+        sources.extend([Path(device_lib_path), Path(monitor_lib_path)])
     
     with open(output_path, 'w') as f:
         yaml.dump(monitor_doc, f, default_flow_style=False, sort_keys=False)
     
+    return converter, monitor_doc
+
+
+def convert_universal_to_monitor(universal_path: Path, device_lib_path: Path,
+                                 monitor_lib_path: Path, output_path: Path,
+                                 jobs: int = 1, sources: Optional[List[Path]] = None,
+                                 pack: bool = False,
+                                 dependencies: Optional[DependencyIndex] = None):
+    """Convenience function to convert universal spec to monitor spec.
+    
+    If ``sources`` is given, it is extended with every input file read
+    (universal spec, its includes and both libraries). If ``dependencies``
+    is given, the reverse dependency index is recorded in it.
+    """
+    _, monitor_doc = _convert_and_write(universal_path, device_lib_path, monitor_lib_path,
+                                        output_path, jobs, sources, pack, dependencies)
     return monitor_doc
+
+
+def convert_corners(universal_path: Path, device_lib_path: Path, monitor_lib_path: Path,
+                    corners: Dict[str, Dict[str, Any]], output_path: Path, jobs: int = 1,
+                    sources: Optional[List[Path]] = None, pack: bool = False,
+                    dependencies: Optional[DependencyIndex] = None) -> Dict[str, Dict[str, Any]]:
+    """Convert a universal spec once and derive per-corner globals.
+    
+    Writes the nominal monitor spec to ``output_path`` like
+    ``convert_universal_to_monitor`` and returns, per corner name, the
+    ``global`` and ``parameters`` sections of that corner.
+    """
+    converter, _ = _convert_and_write(universal_path, device_lib_path, monitor_lib_path,
+                                      output_path, jobs, sources, pack, dependencies)
+    return {name: converter.corner_globals(override) for name, override in corners.items()}
@@ -0,0 +1,112 @@
+"""
+SOA DSL Corners - Multi-Corner Output
+Writes one Spectre file per corner from a single conversion, sharing the monitor sections.
+"""
+
+import re
+import yaml
+import dataclasses
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .parser import SOADocument, GlobalConfig
+from .generator import CodeGenerator
+
+
+# globals keys a corner may override
+CORNER_KEYS = ('timing', 'time_limits', 'parameters')
+
+_CORNER_NAME = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+
+class CornerError(Exception):
+    """Exception raised for corner definition errors."""
+    pass
+
+
+def load_corners(filepath: Path) -> Dict[str, Dict[str, Any]]:
+    """Load corner definitions: ``corners: {name: {globals overrides}}``.
+    
+    Each corner overrides some of the spec's ``globals`` (timing,
+    time_limits, parameters); an empty corner uses the spec as is.
+    """
+    try:
+        with open(filepath, 'r') as f:
+            data = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise CornerError(f"Failed to load corners {filepath}: {e}")
+    
+    corners = data.get('corners') if isinstance(data, dict) else None
+    if not isinstance(corners, dict) or not corners:
+        raise CornerError(f"No corners defined in {filepath}")
+    
+    result = {}
+    for name, override in corners.items():
+        name = str(name)
+        if not _CORNER_NAME.match(name):
+            raise CornerError(f"Invalid corner name (used in file names): {name}")
+        override = override or {}
+        if not isinstance(override, dict):
+            raise CornerError(f"Corner '{name}' must be a mapping of globals overrides")
+        unknown = [key for key in override if key not in CORNER_KEYS]
+        if unknown:
+            raise CornerError(
+                f"Corner '{name}' overrides unsupported globals: {', '.join(unknown)} "
+                f"(allowed: {', '.join(CORNER_KEYS)})"
+            )
+        result[name] = override
+    return result
+
+
+def corner_path(output: Path, corner: str) -> Path:
+    """Output file of a corner, e.g. soachecks.scs -> soachecks_ss.scs."""
+    output = Path(output)
+    return output.with_name(f"{output.stem}_{corner}{output.suffix}")
+
+
+def corner_document(document: SOADocument, corner_globals: Dict[str, Any]) -> SOADocument:
+    """The document with a corner's global and parameters sections.
+    
+    The monitor list is shared, not copied.
+    """
+    section = corner_globals['global']
+    return dataclasses.replace(
+        document,
+        global_config=GlobalConfig(timing=section['timing'], tmaxfrac=section['tmaxfrac']),
+        parameters=corner_globals['parameters'],
+    )
+
+
+def write_corners(document: SOADocument, corners: Dict[str, Dict[str, Any]], output: Path,
+                  shared_monitors: Optional[Path] = None) -> List[Path]:
+    """Write one Spectre file per corner; returns the files written.
+    
+    The monitor sections are generated once. Without ``shared_monitors``
+    every corner file contains them byte-for-byte after its own base
+    section; with it they are written to that file only, and the corner
+    files hold just their base section.
+    """
+    monitors_text = CodeGenerator(document).monitors_text()
+    written = []
+    
+    if shared_monitors:
+        with open(shared_monitors, 'w') as f:
+            f.write("simulator lang=spectre\n")
+            f.write("// Generated from SOA DSL - monitor sections shared by all corners\n")
+            f.write(f"// Process: {document.process}\n")
+            f.write(f"// Corners: {', '.join(corners)}\n\n")
+            f.write(monitors_text)
+        written.append(Path(shared_monitors))
+    
+    for name, corner_globals in corners.items():
+        path = corner_path(output, name)
+        generator = CodeGenerator(corner_document(document, corner_globals))
+        with open(path, 'w') as f:
+            generator.generate_base(f)
+            if shared_monitors:
+                f.write(f"// Corner: {name}; monitor sections in {Path(shared_monitors).name}\n")
+            else:
+                f.write(monitors_text)
+        written.append(path)
+    
+    return written
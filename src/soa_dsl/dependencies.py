@@ -0,0 +1,257 @@
+"""
+SOA DSL Dependencies - Reverse Dependency Index
+Maps library entries and global parameters to the monitors they affect, for impact analysis.
+"""
+
+import json
+import yaml
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Set
+
+from .expressions import referenced_names, parameter_closure
+from .spec_loader import IncludeError, load_universal_spec
+
+
+# Bump when the index layout changes
+INDEX_FORMAT = 1
+
+# Index categories: library entry kind -> names -> model names
+CATEGORIES = ('subcircuits', 'level1_groups', 'level2_groups', 'monitor_types',
+              'time_limits', 'parameters')
+
+# Universal globals -> monitor spec parameter names (see converter._build_parameters_section)
+TIMING_PARAMETERS = {
+    'tmin': 'global_tmin', 'tdelay': 'global_tdelay',
+    'vballmsg': 'global_vballmsg', 'stop': 'global_stop',
+}
+TIME_LIMIT_PARAMETERS = {
+    'steady': 'tmaxfrac0', 'transient_1pct': 'tmaxfrac1',
+    'transient_10pct': 'tmaxfrac2', 'review': 'tmaxfrac3',
+}
+
+# Universal rule fields that change what a monitor checks (description and
+# message edits only change text)
+RULE_FIELDS = ('applies_to', 'check', 'limits', 'state_detection')
+
+# Top-level keys of a universal spec or an included spec fragment
+SPEC_KEYS = {'globals', 'rules', 'include'}
+
+
+class DependencyError(Exception):
+    """Exception raised for dependency index and impact analysis errors."""
+    pass
+
+
+@dataclass
+class DependencyIndex:
+    """Reverse index from library entries and parameters to generated models."""
+    # model name -> {'section', 'monitor_type', 'rules'}
+    outputs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # category -> entry name -> model names
+    index: Dict[str, Dict[str, List[str]]] = field(
+        default_factory=lambda: {c: {} for c in CATEGORIES}
+    )
+    
+    def add(self, monitor: Dict[str, Any], rule: Dict[str, Any],
+            device_library: Dict[str, Any], parameters: Dict[str, Any]):
+        """Record what one converted monitor depends on."""
+        model = monitor['model_name']
+        output = self.outputs.setdefault(model, {
+            'section': monitor['section'],
+            'monitor_type': monitor['monitor_type'],
+            'rules': [],
+        })
+        if rule['name'] not in output['rules']:
+            output['rules'].append(rule['name'])
+        
+        self._link('subcircuits', monitor['device_pattern'], model)
+        self._link('monitor_types', monitor['monitor_type'], model)
+        self._link('time_limits', (rule.get('limits') or {}).get('time_limit', 'steady'), model)
+        
+        applies_to = rule.get('applies_to') or {}
+        if 'level1_group' in applies_to:
+            self._link('level1_groups', applies_to['level1_group'], model)
+        if 'level2_group' in applies_to:
+            group = applies_to['level2_group']
+            self._link('level2_groups', group, model)
+            level2 = (device_library.get('level2_groups') or {}).get(group) or {}
+            for member in level2.get('level1_groups', []):
+                self._link('level1_groups', member, model)
+        
+        names: Set[str] = set()
+        for value in monitor['parameters'].values():
+            names |= referenced_names(value if isinstance(value, str) else json.dumps(value))
+        for name in sorted(parameter_closure(names, parameters)):
+            self._link('parameters', name, model)
+    
+    def remap(self, monitors: List[Dict[str, Any]], origins: Dict[str, List[str]]):
+        """Replace packed member models by the packed monitors that contain them.
+        
+        ``origins`` maps packed model names to member model names, as
+        filled in by ``pack_branches``.
+        """
+        replaced = {member: packed for packed, members in origins.items() for member in members}
+        if not replaced:
+            return
+        
+        for monitor in monitors:
+            members = origins.get(monitor['model_name'])
+            if members is None:
+                continue
+            rules: List[str] = []
+            for member in members:
+                for rule in self.outputs.pop(member, {}).get('rules', []):
+                    if rule not in rules:
+                        rules.append(rule)
+            self.outputs[monitor['model_name']] = {
+                'section': monitor['section'],
+                'monitor_type': monitor['monitor_type'],
+                'rules': rules,
+            }
+        
+        for entries in self.index.values():
+            for name, models in entries.items():
+                entries[name] = list(dict.fromkeys(replaced.get(m, m) for m in models))
+        for packed in origins:
+            # Members keep their own monitor type as a dependency too
+            self._link('monitor_types', self.outputs[packed]['monitor_type'], packed)
+    
+    def _link(self, category: str, name: Any, model: str):
+        """Add one edge; a model's edges are added together, so repeats are adjacent."""
+        models = self.index[category].setdefault(str(name), [])
+        if not models or models[-1] != model:
+            models.append(model)
+    
+    def affected(self, changes: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+        """Models affected by changed entries, with the reasons per model."""
+        reasons: Dict[str, Set[str]] = {}
+        for category, names in changes.items():
+            if category == 'all':
+                for model in self.outputs:
+                    reasons.setdefault(model, set()).update(f"all: {n}" for n in names)
+                continue
+            if category == 'rules':
+                for model, output in self.outputs.items():
+                    for rule in names.intersection(output['rules']):
+                        reasons.setdefault(model, set()).add(f"rules: {rule}")
+                continue
+            entries = self.index.get(category, {})
+            for name in names:
+                for model in entries.get(name, []):
+                    reasons.setdefault(model, set()).add(f"{category}: {name}")
+        return reasons
+    
+    def save(self, path: Path):
+        """Write the index as JSON."""
+        for entries in self.index.values():
+            for name, models in entries.items():
+                entries[name] = list(dict.fromkeys(models))
+        with open(path, 'w') as f:
+            json.dump({'format': INDEX_FORMAT, 'outputs': self.outputs, 'index': self.index}, f)
+    
+    @classmethod
+    def load(cls, path: Path) -> 'DependencyIndex':
+        """Load an index written by ``save``."""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise DependencyError(f"Failed to load dependency index {path}: {e}")
+        if not isinstance(data, dict) or data.get('format') != INDEX_FORMAT:
+            raise DependencyError(f"Unsupported dependency index format in {path}, reconvert")
+        
+        index = cls(outputs=data['outputs'])
+        for category in CATEGORIES:
+            index.index[category] = data['index'].get(category, {})
+        return index
+
+
+def _changed_keys(old: Dict[str, Any], new: Dict[str, Any]) -> Set[str]:
+    """Keys added, removed or changed between two mappings."""
+    old, new = old or {}, new or {}
+    return {str(k) for k in set(old) | set(new) if old.get(k) != new.get(k)}
+
+
+def _changed_rules(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Set[str]:
+    """Names of rules added, removed or changed in one of RULE_FIELDS."""
+    def checked(rules):
+        return {rule.get('name'): {k: rule.get(k) for k in RULE_FIELDS}
+                for rule in rules or [] if isinstance(rule, dict)}
+    return _changed_keys(checked(old), checked(new))
+
+
+def diff_documents(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """Changed index entries between two versions of a library or universal spec.
+    
+    Device libraries (``subcircuits``), monitor libraries (``monitors``) and
+    universal specs or spec fragments (``globals``, ``rules`` or
+    ``include``) are recognized by their content. Specs should be composed
+    first (see ``load_document``); an ``include`` list left in either
+    version that differs is reported under ``all``. Rules are reported
+    under ``rules`` when one of RULE_FIELDS changes. Changes to other
+    top-level keys the converter reads are reported under ``all`` and
+    affect every output.
+    """
+    changes: Dict[str, Set[str]] = {c: set() for c in CATEGORIES}
+    changes['all'] = set()
+    
+    # Keys listed in ``known`` are indexed or not read by the converter
+    if {'subcircuits', 'devices'} & (set(old) | set(new)):
+        changes['subcircuits'] = _changed_keys(old.get('subcircuits') or old.get('devices'),
+                                               new.get('subcircuits') or new.get('devices'))
+        changes['level1_groups'] = _changed_keys(old.get('level1_groups'), new.get('level1_groups'))
+        changes['level2_groups'] = _changed_keys(old.get('level2_groups'), new.get('level2_groups'))
+        known = {'subcircuits', 'devices', 'level1_groups', 'level2_groups', 'node_aliases',
+                 'version', 'process'}
+    elif 'monitors' in old or 'monitors' in new:
+        changes['monitor_types'] = _changed_keys(old.get('monitors'), new.get('monitors'))
+        changes['time_limits'] = _changed_keys(old.get('time_limit_mapping'),
+                                               new.get('time_limit_mapping'))
+        known = {'monitors', 'time_limit_mapping', 'selection_rules', 'version'}
+    elif SPEC_KEYS & (set(old) | set(new)):
+        old_globals, new_globals = old.get('globals') or {}, new.get('globals') or {}
+        params = _changed_keys(old_globals.get('parameters'), new_globals.get('parameters'))
+        for key in _changed_keys(old_globals.get('timing'), new_globals.get('timing')):
+            params.add(TIMING_PARAMETERS.get(key, key))
+        for key in _changed_keys(old_globals.get('time_limits'), new_globals.get('time_limits')):
+            params.add(TIME_LIMIT_PARAMETERS.get(key, key))
+        changes['parameters'] = params
+        changes['rules'] = _changed_rules(old.get('rules'), new.get('rules'))
+        if (old.get('include') or []) != (new.get('include') or []):
+            # Uncomposed includes: their content cannot be diffed here
+            changes['all'].add('include')
+        known = {'globals', 'rules', 'include', 'version', 'process', 'date'}
+    else:
+        raise DependencyError("Not a device library, monitor library or universal spec")
+    
+    changes['all'] |= _changed_keys({k: v for k, v in old.items() if k not in known},
+                                    {k: v for k, v in new.items() if k not in known})
+    return {category: names for category, names in changes.items() if names}
+
+
+def load_yaml(path: Path) -> Dict[str, Any]:
+    """Load a library or spec for diffing."""
+    try:
+        with open(path, 'r') as f:
+            return yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise DependencyError(f"Failed to load {path}: {e}")
+
+
+def load_document(path: Path) -> Dict[str, Any]:
+    """Load a library, or a universal spec composed with its includes, for diffing."""
+    data = load_yaml(path)
+    if not isinstance(data, dict) or not SPEC_KEYS & set(data):
+        return data
+    try:
+        return load_universal_spec(path)
+    except IncludeError as e:
+        raise DependencyError(str(e))
+
+
+def impact(index_path: Path, old_path: Path, new_path: Path):
+    """Convenience function: changed entries and affected models between two file versions."""
+    index = DependencyIndex.load(index_path)
+    changes = diff_documents(load_document(old_path), load_document(new_path))
+    return index, changes, index.affected(changes)
@@ -0,0 +1,220 @@
+"""
+SOA DSL Expressions - Limit Expression Evaluation
+Evaluates Spectre-style limit expressions (e.g. "$w * 4.05e-3") outside the simulator.
+"""
+
+import ast
+import math
+import re
+import operator
+from typing import Dict, Any, Callable, Optional, Set
+
+
+class ExpressionError(Exception):
+    """Exception raised for expressions that cannot be evaluated."""
+    pass
+
+
+# Spectre scale factors (case-sensitive: M is mega, m is milli)
+SCALE_FACTORS = {
+    'T': 1e12, 'G': 1e9, 'M': 1e6, 'K': 1e3, 'k': 1e3,
+    'm': 1e-3, 'u': 1e-6, 'n': 1e-9, 'p': 1e-12, 'f': 1e-15, 'a': 1e-18,
+}
+
+MATH_FUNCTIONS: Dict[str, Callable] = {
+    'sqrt': math.sqrt,
+    'exp': math.exp,
+    'ln': math.log,
+    'log': math.log,
+    'log10': math.log10,
+    'abs': abs,
+    'pow': pow,
+    'min': min,
+    'max': max,
+}
+
+# Instance parameters ($w) become plain identifiers with this prefix
+INSTANCE_PREFIX = '_inst_'
+
+_SCALED_NUMBER = re.compile(
+    r'(?<![\w.])(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?([TGMKkmunpfa])(?![\w])'
+)
+_INSTANCE_PARAM = re.compile(r'\$([A-Za-z_]\w*)')
+_IDENTIFIER = re.compile(r'[A-Za-z_]\w*')
+_NUMBER_TOKEN = re.compile(r'(?<![\w.])(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?[A-Za-z]*')
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _normalize(expr: str) -> str:
+    """Rewrite Spectre syntax into a Python expression."""
+    text = expr.strip().strip('"').strip("'")
+    text = _SCALED_NUMBER.sub(
+        lambda m: repr(float(m.group(1) + (m.group(2) or '')) * SCALE_FACTORS[m.group(3)]),
+        text
+    )
+    text = _INSTANCE_PARAM.sub(lambda m: INSTANCE_PREFIX + m.group(1), text)
+    return text.replace('^', '**')
+
+
+def referenced_names(expr: Any) -> Set[str]:
+    """Identifiers used by an expression (parameters, not instance parameters)."""
+    if not isinstance(expr, str):
+        return set()
+    text = _INSTANCE_PARAM.sub(' ', expr)
+    # Drop quoted messages/branch names, e.g. branch1="V(g,s)"
+    text = re.sub(r'"[^"]*"', ' ', text)
+    # Drop numbers, including exponents and scale factors (1e-7, 100n)
+    text = _NUMBER_TOKEN.sub(' ', text)
+    return {n for n in _IDENTIFIER.findall(text) if n not in MATH_FUNCTIONS}
+
+
+def parameter_closure(names: Set[str], parameters: Dict[str, Any]) -> Set[str]:
+    """Global parameters used by ``names``, following parameter expressions."""
+    used: Set[str] = set()
+    pending = [n for n in names if n in parameters]
+    while pending:
+        name = pending.pop()
+        if name in used:
+            continue
+        used.add(name)
+        pending.extend(n for n in referenced_names(str(parameters[name]))
+                       if n in parameters and n not in used)
+    return used
+
+
+def check_expression(expr: Any):
+    """Raise ExpressionError unless ``expr`` is a number or a supported expression.
+    
+    Only the syntax is checked; parameter names are not resolved.
+    """
+    if isinstance(expr, bool):
+        raise ExpressionError(f"Not a number or expression: {expr!r}")
+    if isinstance(expr, (int, float)):
+        return
+    
+    text = _normalize(str(expr))
+    try:
+        tree = ast.parse(text, mode='eval')
+    except SyntaxError:
+        raise ExpressionError(f"Invalid expression: {expr}")
+    
+    for node in ast.walk(tree.body):
+        if isinstance(node, ast.Constant):
+            supported = isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+        elif isinstance(node, ast.BinOp):
+            supported = type(node.op) in _BINARY_OPS
+        elif isinstance(node, ast.UnaryOp):
+            supported = type(node.op) in _UNARY_OPS
+        elif isinstance(node, ast.Call):
+            supported = (isinstance(node.func, ast.Name) and node.func.id in MATH_FUNCTIONS
+                         and not node.keywords)
+        else:
+            supported = isinstance(node, (ast.Name, ast.Load, ast.operator, ast.unaryop))
+        if not supported:
+            raise ExpressionError(f"Unsupported expression: {expr}")
+
+
+class ExpressionEvaluator:
+    """Evaluates limit expressions against global and instance parameters.
+    
+    Global parameters may themselves be expressions; they are resolved
+    recursively and cached. Instance parameters (``$w``) may be scalars or
+    arrays; with ``functions`` set to array-aware versions (e.g. numpy) the
+    result is evaluated element-wise.
+    """
+    
+    def __init__(self, parameters: Optional[Dict[str, Any]] = None,
+                 functions: Optional[Dict[str, Callable]] = None):
+        self.parameters = parameters or {}
+        self.functions = dict(MATH_FUNCTIONS)
+        if functions:
+            self.functions.update(functions)
+        self._resolved: Dict[str, Any] = {}
+        self._resolving: Set[str] = set()
+    
+    def evaluate(self, expr: Any, instance: Optional[Dict[str, Any]] = None) -> Any:
+        """Evaluate a number or expression string."""
+        if isinstance(expr, bool):
+            return float(expr)
+        if isinstance(expr, (int, float)):
+            return float(expr)
+        if not isinstance(expr, str):
+            try:
+                return float(expr)
+            except (TypeError, ValueError):
+                raise ExpressionError(f"Cannot evaluate value: {expr!r}")
+        
+        text = _normalize(expr)
+        try:
+            tree = ast.parse(text, mode='eval')
+        except SyntaxError:
+            raise ExpressionError(f"Invalid expression: {expr}")
+        
+        return self._eval(tree.body, instance or {}, expr)
+    
+    def parameter(self, name: str) -> Any:
+        """Resolve a global parameter value."""
+        if name in self._resolved:
+            return self._resolved[name]
+        if name not in self.parameters:
+            raise ExpressionError(f"Unknown parameter: {name}")
+        if name in self._resolving:
+            raise ExpressionError(f"Circular parameter definition: {name}")
+        
+        self._resolving.add(name)
+        try:
+            value = self.evaluate(self.parameters[name])
+        finally:
+            self._resolving.discard(name)
+        
+        self._resolved[name] = value
+        return value
+    
+    def _eval(self, node: ast.AST, instance: Dict[str, Any], source: str) -> Any:
+        """Evaluate a restricted expression AST."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return float(node.value)
+        
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            left = self._eval(node.left, instance, source)
+            right = self._eval(node.right, instance, source)
+            return self._apply(_BINARY_OPS[type(node.op)], (left, right), source)
+        
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+            operand = self._eval(node.operand, instance, source)
+            return self._apply(_UNARY_OPS[type(node.op)], (operand,), source)
+        
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name.startswith(INSTANCE_PREFIX):
+                param = name[len(INSTANCE_PREFIX):]
+                if param not in instance:
+                    raise ExpressionError(f"Missing instance parameter ${param} in: {source}")
+                return instance[param]
+            return self.parameter(name)
+        
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in self.functions and not node.keywords):
+            args = [self._eval(arg, instance, source) for arg in node.args]
+            return self._apply(self.functions[node.func.id], args, source)
+        
+        raise ExpressionError(f"Unsupported expression: {source}")
+    
+    def _apply(self, func, args, source: str) -> Any:
+        """Apply an operator or function, reporting math errors against the expression."""
+        try:
+            return func(*args)
+        except (ZeroDivisionError, ValueError, OverflowError) as e:
+            reason = e.args[-1] if e.args else type(e).__name__
+            raise ExpressionError(f"Arithmetic error ({reason}) in: {source}")
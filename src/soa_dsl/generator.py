@@ -3,7 +3,8 @@ SOA Code Generator - Monitor-Based
 Generates Spectre netlist code from monitor-based YAML.
 """
 
-from typing import List, TextIO
+import io
+from typing import List, Tuple, TextIO
 from .parser import SOADocument, Monitor
 
 
@@ -15,9 +16,33 @@ class CodeGenerator:
     
     def generate(self, output_file: TextIO):
         """Generate complete Spectre code."""
+        self.generate_base(output_file)
+        self._write_monitors(output_file)
+    
+    def generate_base(self, output_file: TextIO):
+        """Generate the header and base section only."""
         self._write_header(output_file)
         self._write_base_section(output_file)
-        self._write_monitors(output_file)
+    
+    def monitors_text(self) -> str:
+        """Monitor sections exactly as ``generate`` writes them after the base section."""
+        buffer = io.StringIO()
+        self._write_monitors(buffer)
+        return buffer.getvalue()
+    
+    def section_texts(self) -> List[Tuple[str, str]]:
+        """(section name, text) of every section, in output order, base first.
+        
+        The text is exactly what ``generate`` writes for the section.
+        """
+        buffer = io.StringIO()
+        self._write_base_section(buffer)
+        sections = [('base', buffer.getvalue())]
+        for monitor in self.document.monitors:
+            buffer = io.StringIO()
+            self._write_monitor(buffer, monitor)
+            sections.append((monitor.section, buffer.getvalue()))
+        return sections
     
     def _write_header(self, f: TextIO):
         """Write file header."""
@@ -86,26 +111,24 @@ class CodeGenerator:
         extra = monitor.parameters.extra
         
         # Single branch parameters
+        parts = []
         if 'vlow' in extra:
-            f.write(f"+ vlow={self._format_value(extra['vlow'])}")
+            parts.append(f"vlow={self._format_value(extra['vlow'])}")
         if 'vhigh' in extra:
-            f.write(f" vhigh={self._format_value(extra['vhigh'])}")
+            parts.append(f"vhigh={self._format_value(extra['vhigh'])}")
         if 'branch1' in extra:
-            f.write(f' branch1="{extra["branch1"]}"')
+            parts.append(f'branch1="{extra["branch1"]}"')
         if 'message1' in extra:
-            f.write(f' message1="{extra["message1"]}"')
-        f.write("\n")
+            parts.append(f'message1="{extra["message1"]}"')
+        if parts:
+            f.write("+ " + " ".join(parts) + "\n")
         
         # Self-heating parameters
         if monitor.self_heating:
             sh = monitor.self_heating
-            if 'dtmax' in sh:
-                f.write(f"+ dtmax={sh['dtmax']}")
-            if 'theat' in sh:
-                f.write(f" theat={sh['theat']}")
-            if 'monitor' in sh:
-                f.write(f" monitor={sh['monitor']}")
-            f.write("\n")
+            parts = [f"{key}={sh[key]}" for key in ('dtmax', 'theat', 'monitor') if key in sh]
+            if parts:
+                f.write("+ " + " ".join(parts) + "\n")
         
         # Current constraints for self-heating
         if monitor.constraints:
@@ -129,6 +152,21 @@ class CodeGenerator:
                 f.write(f" vhigh{i}={self._format_value(vhigh)}")
                 f.write(f' branch{i}="{branch_name}"')
                 f.write(f' message{i}="{message}"\n')
+        else:
+            # Flat vlowN/vhighN/branchN/messageN parameters (converter output)
+            extra = monitor.parameters.extra
+            i = 1
+            while f'branch{i}' in extra:
+                parts = []
+                if f'vlow{i}' in extra:
+                    parts.append(f"vlow{i}={self._format_value(extra[f'vlow{i}'])}")
+                if f'vhigh{i}' in extra:
+                    parts.append(f"vhigh{i}={self._format_value(extra[f'vhigh{i}'])}")
+                parts.append(f'branch{i}="{extra[f"branch{i}"]}"')
+                if f'message{i}' in extra:
+                    parts.append(f'message{i}="{extra[f"message{i}"]}"')
+                f.write("+ " + " ".join(parts) + "\n")
+                i += 1
     
     def _write_mos2_params(self, f: TextIO, monitor: Monitor):
         """Write ovcheckva_mos2 parameters."""
@@ -161,9 +199,9 @@ class CodeGenerator:
         extra = monitor.parameters.extra
         
         if 'vlow' in extra:
-            f.write(f'+ vlow="{extra["vlow"]}"\n')
+            f.write(f'+ vlow={self._quoted(extra["vlow"])}\n')
         if 'vhigh' in extra:
-            f.write(f'+ vhigh="{extra["vhigh"]}"\n')
+            f.write(f'+ vhigh={self._quoted(extra["vhigh"])}\n')
         if 'branch1' in extra:
             f.write(f'+ branch1="{extra["branch1"]}"\n')
         if 'message1' in extra:
@@ -205,6 +243,13 @@ class CodeGenerator:
             return value
         else:
             return str(value)
+    
+    def _quoted(self, value) -> str:
+        """Quote a value once; the converter already quotes pwl expressions."""
+        text = str(value)
+        if len(text) > 1 and text.startswith('"') and text.endswith('"'):
+            return text
+        return f'"{text}"'
 
 
 def generate_code(document: SOADocument, output_file: TextIO):
@@ -0,0 +1,444 @@
+"""
+SOA DSL Importer - Spreadsheet Limit Tables
+Streams CSV/XLSX limit tables into universal-spec rules.
+"""
+
+import csv
+import re
+import json
+import yaml
+from datetime import date
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterator, Tuple, TextIO
+
+from .converter import resolve_group_closures
+from .expressions import check_expression, referenced_names, ExpressionError
+from .packing import DEFAULT_BRANCH_LIMIT
+
+
+# Rows are validated against the device library this many at a time
+BATCH_ROWS = 1024
+
+# Only the first errors are kept; the rest are counted
+MAX_REPORTED_ERRORS = 50
+
+# Accepted header spellings (case-insensitive) -> field
+COLUMN_ALIASES = {
+    'name': 'name', 'rule': 'name',
+    'subcircuits': 'subcircuits', 'subcircuit': 'subcircuits', 'device': 'subcircuits',
+    'devices': 'subcircuits',
+    'level1_group': 'level1_group', 'level2_group': 'level2_group',
+    'measure': 'measure', 'branch': 'measure', 'signal': 'measure',
+    'type': 'type',
+    'min': 'min', 'vmin': 'min', 'vlow': 'min',
+    'max': 'max', 'vmax': 'max', 'vhigh': 'max',
+    'time_limit': 'time_limit',
+    'message': 'message',
+    'description': 'description',
+}
+
+# Globals used when no template spec is given (as in examples/soa_rules_universal.yaml)
+DEFAULT_GLOBALS = {
+    'timing': {'tmin': 0, 'tdelay': 0, 'vballmsg': 1.0, 'stop': 0},
+    'time_limits': {'steady': 0, 'transient_1pct': 0.01, 'transient_10pct': 0.10, 'review': -1},
+}
+
+_MEASURE = re.compile(r'^([VI])\(([^()]+)\)$')
+_YAML_NUMBER = re.compile(r'^[-+]?(\d+|\d*\.\d+([eE][-+]?\d+)?|\d+\.\d*([eE][-+]?\d+)?)$')
+_LIST_SEPARATORS = re.compile(r'[\s,;]+')
+
+
+class LimitTableError(Exception):
+    """Exception raised for limit table import errors."""
+    pass
+
+
+@dataclass
+class LimitRow:
+    """One parsed row of a limit table."""
+    row: int
+    name: str
+    applies_to: Dict[str, Any]
+    measure: str
+    check_type: str
+    limits: Dict[str, Any]
+    time_limit: Optional[str] = None
+    message: Optional[str] = None
+    description: Optional[str] = None
+    
+    def rule_key(self) -> Tuple:
+        """Rows with equal keys may share one multi-branch rule."""
+        return (self.name, repr(self.applies_to), self.check_type,
+                repr(self.limits), self.time_limit, self.description)
+
+
+@dataclass
+class ImportResult:
+    """Summary of an import."""
+    rows: int = 0
+    rules: int = 0
+    errors: List[str] = field(default_factory=list)
+    error_count: int = 0
+    
+    def add_error(self, message: str):
+        """Record an error, keeping only the first MAX_REPORTED_ERRORS messages."""
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+
+def read_csv_rows(path: Path) -> Iterator[List[Any]]:
+    """Stream the rows of a CSV file."""
+    f = open(path, 'r', newline='', encoding='utf-8-sig')
+    
+    def rows():
+        with f:
+            yield from csv.reader(f)
+    
+    return rows()
+
+
+def read_xlsx_rows(path: Path, sheet: Optional[str] = None) -> Iterator[List[Any]]:
+    """Stream the rows of an XLSX sheet (requires openpyxl).
+    
+    The workbook is opened in read-only mode, so rows are parsed as they
+    are iterated instead of loading the whole sheet.
+    """
+    import openpyxl
+    
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    if sheet is not None and sheet not in workbook.sheetnames:
+        workbook.close()
+        raise LimitTableError(f"Sheet not found in {path}: {sheet}")
+    worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+    
+    def rows():
+        try:
+            for row in worksheet.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+    
+    return rows()
+
+
+def _cell(value: Any) -> Any:
+    """Normalize a cell: strings stripped, empty cells as None."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _scalar(value: Any) -> str:
+    """YAML text of a cell value; anything that is not a plain number is quoted."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    text = str(value)
+    if _YAML_NUMBER.match(text):
+        return text
+    return json.dumps(text)
+
+
+class LimitTableImporter:
+    """Converts limit table rows into universal rules, streaming.
+    
+    Rows are parsed and validated in batches of BATCH_ROWS: devices, groups
+    and measured nodes are checked against the device library once per
+    distinct (applies_to, measure) combination; min/max cells must be
+    numbers or expressions over the global ``parameters`` and instance
+    parameters. Consecutive rows with the same name, devices and limits
+    become one multi-branch rule (up to the ovcheck6 branch limit); every
+    finished rule is written immediately, so memory does not grow with the
+    table.
+    """
+    
+    def __init__(self, device_library: Dict[str, Any], time_limits: Dict[str, Any],
+                 branch_limit: int = DEFAULT_BRANCH_LIMIT,
+                 parameters: Optional[Dict[str, Any]] = None):
+        self.devices = device_library.get('subcircuits') or device_library.get('devices', {})
+        self.groups = resolve_group_closures(device_library)
+        self.time_limits = time_limits
+        self.parameters = set(parameters or {})
+        self.branch_limit = branch_limit
+        self.result = ImportResult()
+        self._columns: Dict[int, str] = {}
+        self._checked: Dict[Tuple[str, str], Optional[str]] = {}
+        self._limit_errors: Dict[str, Optional[str]] = {}
+        self._names: Dict[str, int] = {}
+        self._pending: List[LimitRow] = []
+    
+    def run(self, rows: Iterator[List[Any]], output: TextIO) -> ImportResult:
+        """Import all rows; the header row must come first."""
+        rows = iter(rows)
+        row_number = 0
+        for header in rows:
+            row_number += 1
+            if any(_cell(c) is not None for c in header):
+                self._read_header(header)
+                break
+        else:
+            raise LimitTableError("Limit table is empty")
+        
+        batch: List[LimitRow] = []
+        for values in rows:
+            row_number += 1
+            if all(_cell(c) is None for c in values):
+                continue
+            self.result.rows += 1
+            parsed = self._parse_row(row_number, values)
+            if parsed is not None:
+                batch.append(parsed)
+            if len(batch) >= BATCH_ROWS:
+                self._process_batch(batch, output)
+                batch = []
+        
+        self._process_batch(batch, output)
+        self._flush(output)
+        return self.result
+    
+    def _read_header(self, header: List[Any]):
+        """Map column positions to fields."""
+        for position, title in enumerate(header):
+            title = _cell(title)
+            if title is None:
+                continue
+            key = COLUMN_ALIASES.get(str(title).lower().replace(' ', '_'))
+            if key is not None:
+                self._columns[position] = key
+        
+        present = set(self._columns.values())
+        missing = [f for f in ('name', 'measure') if f not in present]
+        if not present & {'subcircuits', 'level1_group', 'level2_group'}:
+            missing.append('subcircuits (or level1_group/level2_group)')
+        if not present & {'min', 'max'}:
+            missing.append('min/max')
+        if missing:
+            raise LimitTableError(f"Missing columns: {', '.join(missing)}")
+    
+    def _parse_row(self, row: int, values: List[Any]) -> Optional[LimitRow]:
+        """Parse one row; records an error and returns None if it is unusable."""
+        cells: Dict[str, Any] = {}
+        for position, key in self._columns.items():
+            if position < len(values):
+                value = _cell(values[position])
+                if value is not None:
+                    cells[key] = value
+        
+        name = cells.get('name')
+        measure = str(cells.get('measure', '')).replace(' ', '')
+        if not name or not measure:
+            self.result.add_error(f"Row {row}: name and measure are required")
+            return None
+        
+        applies_to: Dict[str, Any] = {}
+        if 'subcircuits' in cells:
+            applies_to['subcircuits'] = [d for d in _LIST_SEPARATORS.split(str(cells['subcircuits'])) if d]
+        for key in ('level1_group', 'level2_group'):
+            if key in cells:
+                applies_to[key] = str(cells[key])
+        if not applies_to:
+            self.result.add_error(f"Row {row}: no subcircuit or device group")
+            return None
+        
+        steady = {k: cells[k] for k in ('min', 'max') if k in cells}
+        if not steady:
+            self.result.add_error(f"Row {row}: no min or max limit")
+            return None
+        for key, value in steady.items():
+            error = self._limit_error(value)
+            if error:
+                self.result.add_error(f"Row {row}: {key} {error}: {value}")
+                return None
+        
+        time_limit = cells.get('time_limit')
+        if time_limit is not None and str(time_limit) not in self.time_limits:
+            self.result.add_error(f"Row {row}: unknown time limit: {time_limit}")
+            return None
+        
+        check_type = str(cells.get('type') or ('current' if measure.startswith('I') else 'voltage'))
+        if check_type not in ('voltage', 'current'):
+            self.result.add_error(f"Row {row}: unsupported check type: {check_type}")
+            return None
+        
+        return LimitRow(
+            row=row,
+            name=str(name),
+            applies_to=applies_to,
+            measure=measure,
+            check_type=check_type,
+            limits={'steady': steady},
+            time_limit=str(time_limit) if time_limit is not None else None,
+            message=str(cells['message']) if 'message' in cells else None,
+            description=str(cells['description']) if 'description' in cells else None,
+        )
+    
+    def _limit_error(self, value: Any) -> Optional[str]:
+        """Error message for an invalid min/max cell, None if valid (cached per value)."""
+        key = repr(value)
+        if key not in self._limit_errors:
+            error = None
+            try:
+                check_expression(value)
+                unknown = sorted(referenced_names(value) - self.parameters)
+                if unknown:
+                    error = f"uses unknown parameter {', '.join(unknown)}"
+            except ExpressionError:
+                error = "is not a number or expression"
+            self._limit_errors[key] = error
+        return self._limit_errors[key]
+    
+    def _process_batch(self, batch: List[LimitRow], output: TextIO):
+        """Validate a batch against the device library, then emit its rules."""
+        for row in batch:
+            key = (repr(row.applies_to), row.measure)
+            if key not in self._checked:
+                self._checked[key] = self._validate(row)
+        
+        for row in batch:
+            error = self._checked[(repr(row.applies_to), row.measure)]
+            if error:
+                self.result.add_error(f"Row {row.row}: {error}")
+                continue
+            if self._pending and (row.rule_key() != self._pending[0].rule_key()
+                                  or len(self._pending) >= self.branch_limit):
+                self._flush(output)
+            self._pending.append(row)
+    
+    def _validate(self, row: LimitRow) -> Optional[str]:
+        """Error message for an invalid (applies_to, measure), None if valid."""
+        match = _MEASURE.match(row.measure)
+        if not match:
+            return f"invalid measure: {row.measure}"
+        nodes = [n for n in match.group(2).split(',') if n]
+        
+        devices = list(row.applies_to.get('subcircuits', []))
+        for key in ('level1_group', 'level2_group'):
+            if key in row.applies_to:
+                group = row.applies_to[key]
+                if group not in self.groups[key]:
+                    return f"unknown {key.replace('_', ' ')}: {group}"
+                devices.extend(self.groups[key][group])
+        
+        for device in devices:
+            if device not in self.devices:
+                return f"unknown device: {device}"
+            known = self.devices[device].get('nodes') or []
+            unknown = [n for n in nodes if n not in known]
+            if unknown:
+                return f"device {device} has no node {', '.join(unknown)} (measure {row.measure})"
+        return None
+    
+    def _rule_name(self, name: str, measures: List[str]) -> str:
+        """Unique rule name; repeated names get their measures appended."""
+        count = self._names.get(name, 0)
+        self._names[name] = count + 1
+        if not count:
+            return name
+        unique = f"{name} {' '.join(measures)}"
+        if unique in self._names:
+            unique = f"{unique} #{count + 1}"
+        self._names[unique] = 1
+        return unique
+    
+    def _flush(self, output: TextIO):
+        """Write the pending rows as one rule."""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        first = rows[0]
+        measures = [r.measure for r in rows]
+        
+        lines = [f"  - name: {json.dumps(self._rule_name(first.name, measures))}"]
+        if first.description:
+            lines.append(f"    description: {json.dumps(first.description)}")
+        lines.append("    applies_to:")
+        for key, value in first.applies_to.items():
+            if isinstance(value, list):
+                lines.append(f"      {key}: [{', '.join(json.dumps(v) for v in value)}]")
+            else:
+                lines.append(f"      {key}: {json.dumps(value)}")
+        lines.append("    check:")
+        lines.append(f"      type: {first.check_type}")
+        if len(rows) == 1:
+            lines.append(f"      measure: {json.dumps(first.measure)}")
+        else:
+            lines.append("      measure:")
+            for i, r in enumerate(rows, 1):
+                lines.append(f"        - signal: {json.dumps(r.measure)}")
+                lines.append(f"          message: {json.dumps(r.message or f'Branch{i}')}")
+        lines.append("    limits:")
+        lines.append("      steady:")
+        for key, value in first.limits['steady'].items():
+            lines.append(f"        {key}: {_scalar(value)}")
+        if first.time_limit:
+            lines.append(f"      time_limit: {first.time_limit}")
+        if len(rows) == 1 and first.message:
+            lines.append(f"    message: {json.dumps(first.message)}")
+        
+        output.write('\n'.join(lines) + '\n')
+        self.result.rules += 1
+
+
+def _write_header(output: TextIO, template: Dict[str, Any], process: Optional[str]):
+    """Write the spec header (version, process, date, globals)."""
+    header = {
+        'version': str(template.get('version', '1.0')),
+        'process': process or template.get('process'),
+        'date': str(template.get('date') or date.today().isoformat()),
+        'globals': template.get('globals') or DEFAULT_GLOBALS,
+    }
+    if not header['process']:
+        raise LimitTableError("Process name required (--process or a template spec)")
+    output.write("# Universal SOA Specification - imported from a limit table\n")
+    output.write(yaml.safe_dump(header, default_flow_style=False, sort_keys=False))
+    output.write("\nrules:\n")
+
+
+def import_limit_table(table_path: Path, output_path: Path, device_lib_path: Path,
+                       template_path: Optional[Path] = None, process: Optional[str] = None,
+                       sheet: Optional[str] = None) -> ImportResult:
+    """Convenience function to import a CSV/XLSX limit table into a universal spec.
+    
+    Invalid rows are reported in the result and left out of the spec.
+    """
+    table_path = Path(table_path)
+    try:
+        with open(device_lib_path, 'r') as f:
+            device_library = yaml.safe_load(f) or {}
+        template = {}
+        if template_path:
+            with open(template_path, 'r') as f:
+                template = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise LimitTableError(f"Failed to load device library or template: {e}")
+    
+    suffix = table_path.suffix.lower()
+    if suffix in ('.xlsx', '.xlsm'):
+        rows = read_xlsx_rows(table_path, sheet)
+    elif suffix in ('.csv', '.txt'):
+        rows = read_csv_rows(table_path)
+    else:
+        raise LimitTableError(f"Unsupported limit table format: {table_path.suffix} (use .csv or .xlsx)")
+    
+    spec_globals = template.get('globals') or DEFAULT_GLOBALS
+    importer = LimitTableImporter(device_library, spec_globals.get('time_limits', {}),
+                                  parameters=spec_globals.get('parameters'))
+    
+    try:
+        with open(output_path, 'w') as output:
+            _write_header(output, template, process)
+            result = importer.run(rows, output)
+    except OSError as e:
+        raise LimitTableError(f"Failed to import {table_path}: {e}")
+    
+    if not result.rules:
+        raise LimitTableError(f"No valid rules in {table_path}")
+    return result
@@ -0,0 +1,159 @@
+"""
+SOA DSL Library Index - Precomputed Lookup Tables
+Compiles the device and monitor libraries into a compact JSON index for the web UI.
+"""
+
+import json
+import hashlib
+import yaml
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .converter import ConversionError, resolve_group_closures
+
+
+# Bump when the index layout changes so cached copies are invalidated
+INDEX_FORMAT = 1
+
+
+class LibraryIndexer:
+    """Builds the precomputed library index consumed by web/js/app.js."""
+    
+    def __init__(self, device_library_path: Path, monitor_library_path: Path):
+        self.device_bytes = self._read(device_library_path)
+        self.monitor_bytes = self._read(monitor_library_path)
+        self.device_lib = self._load_yaml(self.device_bytes, device_library_path)
+        self.monitor_lib = self._load_yaml(self.monitor_bytes, monitor_library_path)
+    
+    def _read(self, filepath: Path) -> bytes:
+        """Read raw library bytes (hashed as-is)."""
+        try:
+            return Path(filepath).read_bytes()
+        except OSError as e:
+            raise ConversionError(f"Failed to load {filepath}: {e}")
+    
+    def _load_yaml(self, data: bytes, filepath: Path) -> Dict[str, Any]:
+        """Parse library YAML."""
+        try:
+            return yaml.safe_load(data) or {}
+        except yaml.YAMLError as e:
+            raise ConversionError(f"Failed to load {filepath}: {e}")
+    
+    def content_hash(self) -> str:
+        """Hash of both library files and the index format."""
+        digest = hashlib.sha256()
+        digest.update(f"soa-library-index:{INDEX_FORMAT}\0".encode())
+        digest.update(self.device_bytes)
+        digest.update(b"\0")
+        digest.update(self.monitor_bytes)
+        return digest.hexdigest()
+    
+    def build(self) -> Dict[str, Any]:
+        """Build the index document."""
+        subcircuits = self._build_subcircuits()
+        
+        return {
+            'format': INDEX_FORMAT,
+            'hash': self.content_hash(),
+            'process': self.device_lib.get('process', 'UNKNOWN'),
+            'subcircuits': subcircuits,
+            'groups': self._build_groups(subcircuits),
+            'monitors': self._build_monitors(),
+            'capabilities': self._build_capability_table(),
+            'time_limit_mapping': self.monitor_lib.get('time_limit_mapping', {}),
+        }
+    
+    def _build_subcircuits(self) -> Dict[str, Any]:
+        """Per-subcircuit type, nodes and parameters."""
+        subcircuits = {}
+        for name, info in (self.device_lib.get('subcircuits') or {}).items():
+            subcircuits[name] = {
+                'type': info.get('type', ''),
+                'nodes': info.get('nodes', []),
+                'parameters': info.get('parameters', []),
+                'description': info.get('description', ''),
+            }
+        return subcircuits
+    
+    def _build_groups(self, subcircuits: Dict[str, Any]) -> Dict[str, Any]:
+        """Group closures with node/parameter intersections per group."""
+        closures = resolve_group_closures(self.device_lib)
+        sources = {
+            'level1_group': self.device_lib.get('level1_groups') or {},
+            'level2_group': self.device_lib.get('level2_groups') or {},
+        }
+        
+        groups = {}
+        for key, table in closures.items():
+            groups[key] = {}
+            for name, members in table.items():
+                info = sources[key].get(name, {})
+                unknown = [m for m in members if m not in subcircuits]
+                if unknown:
+                    raise ConversionError(
+                        f"Group '{name}' references unknown subcircuits: {', '.join(unknown)}"
+                    )
+                entry = {
+                    'description': info.get('description', ''),
+                    'subcircuits': members,
+                    'types': list(dict.fromkeys(subcircuits[m]['type'] for m in members)),
+                    'nodes': self._intersect([subcircuits[m]['nodes'] for m in members]),
+                    'parameters': self._intersect([subcircuits[m]['parameters'] for m in members]),
+                }
+                if key == 'level2_group':
+                    entry['level1_groups'] = info.get('level1_groups', [])
+                groups[key][name] = entry
+        return groups
+    
+    def _build_monitors(self) -> Dict[str, Any]:
+        """Per-monitor capability and parameter tables."""
+        monitors = {}
+        for name, info in (self.monitor_lib.get('monitors') or {}).items():
+            monitors[name] = {
+                'description': info.get('description', ''),
+                'verilog_a_file': info.get('verilog_a_file', ''),
+                'capabilities': info.get('capabilities', []),
+                'branch_limit': info.get('branch_limit', 1),
+                'required_parameters': info.get('required_parameters', []),
+                'optional_parameters': info.get('optional_parameters', []),
+            }
+        return monitors
+    
+    def _build_capability_table(self) -> Dict[str, List[str]]:
+        """Reverse table: capability -> monitor types providing it."""
+        table = {}
+        for name, info in (self.monitor_lib.get('monitors') or {}).items():
+            for capability in info.get('capabilities', []):
+                table.setdefault(capability, []).append(name)
+        return table
+    
+    def _intersect(self, lists: List[List[str]]) -> List[str]:
+        """Ordered intersection (order of the first list)."""
+        if not lists:
+            return []
+        common = set(lists[0]).intersection(*lists[1:])
+        return [item for item in lists[0] if item in common]
+
+
+def read_index_hash(index_path: Path) -> Optional[str]:
+    """Return the content hash of an existing index, or None."""
+    try:
+        with open(index_path, 'r') as f:
+            return json.load(f).get('hash')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def export_library_index(device_lib_path: Path, monitor_lib_path: Path,
+                         output_path: Path, force: bool = False) -> bool:
+    """Write the minified library index; returns False when already up to date."""
+    indexer = LibraryIndexer(device_lib_path, monitor_lib_path)
+    
+    if not force and read_index_hash(output_path) == indexer.content_hash():
+        return False
+    
+    index = indexer.build()
+    with open(output_path, 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    
+    return True
@@ -0,0 +1,300 @@
+"""
+SOA DSL Netlist Scanner - Monitor Insertion Sizing
+Streams a Spectre/SPICE design netlist and projects SOA monitor instance counts.
+"""
+
+import gzip
+import yaml
+from collections import Counter
+from fnmatch import fnmatchcase
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from .parser import SOADocument
+from .rule_store import is_rule_store, load_store_monitors
+
+
+# Spectre statements that are not instances
+SPECTRE_KEYWORDS = {
+    'simulator', 'parameters', 'include', 'ahdl_include', 'model', 'section',
+    'endsection', 'library', 'endlibrary', 'global', 'ground', 'save', 'options',
+    'statistics', 'if', 'else', 'real', 'function', 'paramset', 'correlate',
+}
+
+TOP_LEVEL = ''
+
+
+class NetlistError(Exception):
+    """Exception raised for netlist scanning errors."""
+    pass
+
+
+@dataclass
+class NetlistStats:
+    """Instance counts of a netlist, per subcircuit definition."""
+    # scope (subckt name, '' for top level) -> master -> instance count
+    scopes: Dict[str, Counter] = field(default_factory=lambda: {TOP_LEVEL: Counter()})
+    # Masters seen in SPICE sections (case-insensitive, stored in lower case)
+    spice_masters: Set[str] = field(default_factory=set)
+    lines: int = 0
+    
+    def elaborate(self) -> Counter:
+        """Total instances per master in the elaborated design.
+        
+        Every subcircuit is expanded once (memoized), so the cost depends on
+        the number of definitions, not on the size of the hierarchy.
+        """
+        flat: Dict[str, Counter] = {}
+        active: Set[str] = set()
+        
+        def expand(scope: str) -> Counter:
+            if scope in flat:
+                return flat[scope]
+            if scope in active:
+                raise NetlistError(f"Recursive subcircuit definition: {scope}")
+            active.add(scope)
+            
+            totals = Counter()
+            for master, count in self.scopes[scope].items():
+                totals[master] += count
+                if master in self.scopes and master != TOP_LEVEL:
+                    for leaf, leaf_count in expand(master).items():
+                        totals[leaf] += count * leaf_count
+            
+            active.discard(scope)
+            flat[scope] = totals
+            return totals
+        
+        return expand(TOP_LEVEL)
+
+
+@dataclass
+class MonitorProjection:
+    """Projected monitor instances for one monitor."""
+    name: str
+    model_name: str
+    monitor_type: str
+    device_pattern: str
+    instances: int
+    masters: List[str] = field(default_factory=list)
+
+
+class NetlistScanner:
+    """Line-streaming netlist scanner.
+    
+    Only the instance master of every statement is extracted; parameter
+    continuation lines are skipped without being joined. Both Spectre and
+    SPICE syntax are understood (``simulator lang=`` switches between them);
+    SPICE names are case-insensitive and recorded in lower case. Files
+    ending in ``.gz`` are decompressed on the fly.
+    """
+    
+    def __init__(self):
+        self.stats = NetlistStats()
+        self._scopes: List[str] = [TOP_LEVEL]
+        self._spice = False
+        self._pending: Optional[str] = None
+    
+    def scan(self, filepath: Path) -> NetlistStats:
+        """Scan a netlist file."""
+        filepath = Path(filepath)
+        opener = gzip.open if filepath.suffix == '.gz' else open
+        try:
+            with opener(filepath, 'rt', errors='replace') as f:
+                for line in f:
+                    self._feed(line)
+        except OSError as e:
+            raise NetlistError(f"Failed to read {filepath}: {e}")
+        
+        self._flush()
+        return self.stats
+    
+    def _feed(self, line: str):
+        """Process one physical line."""
+        self.stats.lines += 1
+        text = line.strip()
+        if not text:
+            return
+        
+        first = text[0]
+        if first == '+':
+            # Continuation: only joined while the master is still unknown
+            if self._pending is not None:
+                self._pending += ' ' + text[1:]
+                self._try_pending(False)
+            return
+        
+        if self._pending is not None and self._pending.endswith('\\'):
+            self._pending = self._pending[:-1] + ' ' + text
+            self._try_pending(False)
+            return
+        
+        self._flush()
+        
+        if first == '*' or text.startswith('//'):
+            return
+        
+        if self._spice:
+            self._spice_statement(text)
+        else:
+            self._spectre_statement(text)
+    
+    def _flush(self):
+        """Resolve the pending statement at its end."""
+        if self._pending is not None:
+            self._try_pending(True)
+            self._pending = None
+    
+    def _try_pending(self, final: bool):
+        """Count a pending statement once its master is known."""
+        master = self._master(self._pending, final)
+        if master is not None:
+            if self._spice:
+                master = master.lower()
+                self.stats.spice_masters.add(master)
+            self.stats.scopes[self._scopes[-1]][master] += 1
+            self._pending = None
+    
+    def _switch_language(self, text: str):
+        """Handle ``simulator lang=...``."""
+        lang = text.split('lang', 1)[-1].lstrip(' =\t').split()[0].lower()
+        self._spice = lang.startswith('spice')
+    
+    def _enter(self, name: str):
+        """Start a subcircuit definition."""
+        self._scopes.append(name)
+        self.stats.scopes.setdefault(name, Counter())
+    
+    def _leave(self):
+        """End the innermost subcircuit definition."""
+        if len(self._scopes) > 1:
+            self._scopes.pop()
+    
+    def _spectre_statement(self, text: str):
+        """Handle one Spectre statement."""
+        word = text.split(None, 1)[0]
+        if word == 'simulator':
+            self._switch_language(text)
+            return
+        if word in ('subckt', 'inline'):
+            tokens = text.replace('(', ' ').split()
+            if word == 'inline' and len(tokens) > 2:
+                self._enter(tokens[2])
+            elif word == 'subckt' and len(tokens) > 1:
+                self._enter(tokens[1])
+            return
+        if word == 'ends':
+            self._leave()
+            return
+        if word in SPECTRE_KEYWORDS or word[0] in '}{':
+            return
+        
+        self._pending = text
+        self._try_pending(False)
+    
+    def _spice_statement(self, text: str):
+        """Handle one SPICE statement."""
+        if text[0] == '.':
+            tokens = text.split()
+            keyword = tokens[0].lower()
+            if keyword == '.subckt' and len(tokens) > 1:
+                self._enter(tokens[1].lower())
+            elif keyword == '.ends':
+                self._leave()
+            return
+        if text.startswith('simulator'):
+            self._switch_language(text)
+            return
+        
+        self._pending = text
+        self._try_pending(False)
+    
+    def _master(self, text: str, final: bool) -> Optional[str]:
+        """Master of an instance statement, or None if not known yet.
+        
+        Without a node list in parentheses the master is the last token
+        before the first parameter (or a SPICE ``params:`` keyword), so it
+        is only known once a parameter appears or the statement ends.
+        """
+        if text.endswith('\\'):
+            if not final:
+                return None
+            text = text[:-1]
+        
+        if not self._spice:
+            paren = text.find('(')
+            equals = text.find('=')
+            if paren >= 0 and (equals < 0 or paren < equals):
+                close = text.find(')', paren)
+                if close < 0:
+                    return None
+                rest = text[close + 1:].split(None, 1)
+                return rest[0] if rest else None
+        
+        if not final and '=' not in text:
+            return None
+        
+        master = None
+        for token in text.split()[1:]:
+            if '=' in token or (self._spice and token.lower() == 'params:'):
+                break
+            master = token
+        return master
+
+
+def scan_netlist(filepath: Path) -> NetlistStats:
+    """Convenience function to scan a netlist file."""
+    return NetlistScanner().scan(filepath)
+
+
+def project_monitors(document: SOADocument, totals: Counter,
+                     spice_masters: Set[str] = frozenset()) -> List[MonitorProjection]:
+    """Match each monitor's device_pattern against elaborated instance counts.
+    
+    Masters in ``spice_masters`` are matched case-insensitively.
+    """
+    projections = []
+    matches: Dict[str, List[str]] = {}
+    for monitor in document.monitors:
+        pattern = monitor.device_pattern
+        if pattern not in matches:
+            folded = pattern.lower()
+            matches[pattern] = sorted(
+                m for m in totals
+                if fnmatchcase(m, folded if m in spice_masters else pattern)
+            )
+        masters = matches[pattern]
+        projections.append(MonitorProjection(
+            name=monitor.name,
+            model_name=monitor.model_name,
+            monitor_type=monitor.monitor_type,
+            device_pattern=pattern,
+            instances=sum(totals[m] for m in masters),
+            masters=masters,
+        ))
+    return projections
+
+
+def filter_monitor_file(input_path: Path, output_path: Path, keep: List[bool]):
+    """Write a copy of a monitor YAML file keeping only the selected monitors.
+    
+    ``keep`` has one flag per monitor, in file order. For a rule store the
+    copy is written from its converted monitors.
+    """
+    if is_rule_store(input_path):
+        data = load_store_monitors(input_path)
+    else:
+        try:
+            with open(input_path, 'r') as f:
+                data = yaml.safe_load(f) or {}
+        except (OSError, UnicodeDecodeError, yaml.YAMLError) as e:
+            raise NetlistError(f"Failed to load {input_path}: {e}")
+    
+    monitors = data.get('monitors') or []
+    if len(monitors) != len(keep):
+        raise NetlistError(f"Monitor count mismatch in {input_path}")
+    data['monitors'] = [m for m, flag in zip(monitors, keep) if flag]
+    
+    with open(output_path, 'w') as f:
+        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
@@ -0,0 +1,410 @@
+"""
+SOA DSL OP Check - Operating-Point Parameter Checks
+Evaluates parcheckva3 monitors on operating-point dumps without rerunning Spectre.
+"""
+
+import csv
+from fnmatch import fnmatchcase
+from itertools import islice, repeat
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .parser import SOADocument, Monitor
+from .expressions import ExpressionEvaluator, ExpressionError
+from .waveforms import (WaveformError, DEFAULT_CHUNK_ROWS, NUMPY_FUNCTIONS,
+                        load_instances, instance_arrays)
+
+
+PARCHECK_MONITOR = 'parcheckva3'
+
+# Limit parameters; parcheck3.va names them plow/phigh
+LIMIT_ALIASES = {'vlow': ('vlow', 'plow'), 'vhigh': ('vhigh', 'phigh')}
+
+# OP outputs used to decide whether a device is on (vgt gating)
+GATE_COLUMNS = ('vgs', 'vth', 'vds')
+
+# Dump columns that are not OP outputs
+INSTANCE_COLUMN = 'instance'
+POINT_COLUMN = 'point'
+
+
+class OPCheckError(Exception):
+    """Exception raised for operating-point check errors."""
+    pass
+
+
+@dataclass
+class ParCheckResult:
+    """Worst sweep point of one parameter check on one instance."""
+    instance: str
+    subcircuit: str
+    monitor: str
+    param: str
+    value: float
+    low: float
+    high: float
+    # Distance to the nearest limit at the worst point; negative when violated
+    margin: float
+    point: str
+    failing_points: int
+    checked_points: int
+    violations: List[str] = field(default_factory=list)
+
+
+@dataclass
+class OPCheckReport:
+    """Results of checking a set of operating-point dumps."""
+    results: List[ParCheckResult]
+    points: List[str]
+    # (instance, monitor) pairs checked at one sweep point or more
+    checks: int = 0
+    failed: int = 0
+    warnings: List[str] = field(default_factory=list)
+
+
+class OPDumpReader:
+    """Reads operating-point dumps into (sweep point x instance) arrays.
+    
+    A dump is a table with a header line: an ``instance`` column, an
+    optional ``point`` column naming the sweep point, and one column per
+    OP output (``vth``, ``vgs``, ``gm``, ...), comma- or
+    whitespace-separated. One row per instance and sweep point; a dump
+    without a ``point`` column is one sweep point named after the file.
+    With several dumps, ``point`` values are prefixed with the file name.
+    """
+    
+    def __init__(self, instance_index: Dict[str, int], chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.instance_index = instance_index
+        self.chunk_rows = chunk_rows
+        self.points: List[str] = []
+        self.columns: set = set()
+        # Dump rows naming instances that are not in the instance table
+        self.unknown_rows = 0
+    
+    def read(self, paths: Sequence[Path], columns: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Load the requested OP columns of all dumps; NaN where a value is missing."""
+        point_index: Dict[str, int] = {}
+        blocks = []
+        for path in paths:
+            prefix = f"{Path(path).stem}:" if len(paths) > 1 else ''
+            blocks.extend(self._read_file(Path(path), columns, point_index, prefix))
+        
+        self.points = list(point_index)
+        shape = (len(self.points), len(self.instance_index))
+        values = {name: np.full(shape, np.nan) for name in columns if name in self.columns}
+        for points, instances, data in blocks:
+            for name, column in data.items():
+                values[name][points, instances] = column
+        return values
+    
+    def _read_file(self, path: Path, columns: Sequence[str], point_index: Dict[str, int],
+                   prefix: str) -> List[Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]]:
+        """Parse one dump chunk by chunk; returns (point, instance, columns) blocks."""
+        try:
+            with open(path, 'r', newline='') as f:
+                header = f.readline()
+                comma = ',' in header
+                names = [c.strip().strip('"') for c in header.split(',' if comma else None)]
+                positions = {name: i for i, name in enumerate(names)}
+                if INSTANCE_COLUMN not in positions:
+                    raise OPCheckError(f"OP dump needs an '{INSTANCE_COLUMN}' column: {path}")
+                wanted = [(name, positions[name]) for name in columns if name in positions]
+                self.columns.update(name for name, _ in wanted)
+                
+                width = len(names)
+                instance_pos = positions[INSTANCE_COLUMN]
+                point_pos = positions.get(POINT_COLUMN)
+                if point_pos is None:
+                    file_point = point_index.setdefault(path.stem, len(point_index))
+                
+                blocks = []
+                line_no = 1
+                while True:
+                    lines = list(islice(f, self.chunk_rows))
+                    if not lines:
+                        break
+                    fields = self._split(lines, comma, width, path, line_no)
+                    line_no += len(lines)
+                    if not fields:
+                        continue
+                    
+                    instances = np.fromiter(
+                        map(self.instance_index.get, fields[instance_pos::width], repeat(-1)),
+                        dtype=np.int64
+                    )
+                    if point_pos is None:
+                        points = np.full(len(instances), file_point, dtype=np.int64)
+                    else:
+                        labels = fields[point_pos::width]
+                        local = {label: point_index.setdefault(prefix + label, len(point_index))
+                                 for label in dict.fromkeys(labels)}
+                        points = np.fromiter(map(local.__getitem__, labels), dtype=np.int64)
+                    try:
+                        data = {name: np.array(fields[pos::width], dtype=np.float64)
+                                for name, pos in wanted}
+                    except ValueError as e:
+                        raise OPCheckError(f"{path}: invalid data in lines "
+                                           f"{line_no - len(lines) + 1}-{line_no}: {e}")
+                    
+                    known = instances >= 0
+                    self.unknown_rows += int(len(instances) - known.sum())
+                    if not known.all():
+                        instances, points = instances[known], points[known]
+                        data = {name: column[known] for name, column in data.items()}
+                    blocks.append((points, instances, data))
+                return blocks
+        except OSError as e:
+            raise OPCheckError(f"Failed to read OP dump {path}: {e}")
+    
+    def _split(self, lines: List[str], comma: bool, width: int, path: Path,
+               line_no: int) -> List[str]:
+        """Fields of a chunk of rows, row after row.
+        
+        Unquoted rows of the header's width are split in one go; otherwise
+        the chunk is parsed row by row, skipping blank rows.
+        """
+        text = ''.join(lines)
+        if comma and '"' not in text:
+            fields = text.replace('\r', '').replace('\n', ',').split(',')
+            # The chunk ends with a newline, leaving one empty field
+            if fields and fields[-1] == '':
+                fields.pop()
+            if len(fields) == width * len(lines):
+                return fields
+        elif not comma:
+            fields = text.split()
+            if len(fields) == width * len(lines):
+                return fields
+        
+        rows = csv.reader(lines) if comma else (line.split() for line in lines)
+        fields = []
+        for offset, row in enumerate(rows):
+            if not row:
+                continue
+            if len(row) != width:
+                raise OPCheckError(f"{path}: line {line_no + offset + 1} has {len(row)} "
+                                   f"columns, header has {width}")
+            fields.extend(row)
+        return fields
+
+
+class OPCheckAnalyzer:
+    """Checks parcheckva3 monitors against operating-point dumps.
+    
+    Each monitor probes one OP output (``param``) of the instances whose
+    subcircuit matches its device pattern and flags values outside
+    [vlow, vhigh], as parcheck3.va does: a missing limit defaults to 0.0
+    and a monitor with vlow >= vhigh is disabled, so a max-only rule is
+    checked on [0, max] and a min-only rule with min >= 0 never fires.
+    Both cases are reported as warnings. With ``vgt`` set, a sweep
+    point is only checked while the device is on, using the state test of
+    ovcheck_mos_alt.va: Vgs > Vth + vgt, with voltages multiplied by the
+    instance parameter ``type`` (1 nmos, -1 pmos; default 1) and source
+    and drain swapped for negative Vds. For pmos, Vth is multiplied by the
+    sign of ``pmosvthsign`` (instance column, else monitor parameter;
+    default 1, i.e. the probed Vth is used as is).
+    
+    Every monitor is evaluated as one array operation over all matching
+    instances and sweep points.
+    """
+    
+    def __init__(self, document: SOADocument, instances: List[Dict[str, Any]]):
+        self.document = document
+        self.instances = instances
+        self.evaluator = ExpressionEvaluator(document.parameters, NUMPY_FUNCTIONS)
+        self.instance_index = {inst['instance']: i for i, inst in enumerate(instances)}
+        self.by_subcircuit: Dict[str, List[int]] = {}
+        for i, inst in enumerate(instances):
+            self.by_subcircuit.setdefault(inst['subcircuit'], []).append(i)
+    
+    def parcheck_monitors(self) -> List[Monitor]:
+        """Monitors checking an OP output."""
+        return [m for m in self.document.monitors if m.monitor_type == PARCHECK_MONITOR]
+    
+    def analyze(self, dump_paths: Sequence[Path], failing_only: bool = True,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS) -> OPCheckReport:
+        """Run all parameter checks over the OP dumps; results are sorted by margin."""
+        monitors = self.parcheck_monitors()
+        columns = list(dict.fromkeys(self._param(m) for m in monitors))
+        if any(self._limit_source(m, 'vgt') is not None for m in monitors):
+            columns.extend(c for c in GATE_COLUMNS if c not in columns)
+        
+        reader = OPDumpReader(self.instance_index, chunk_rows)
+        values = reader.read(dump_paths, columns)
+        report = OPCheckReport(results=[], points=reader.points)
+        if reader.unknown_rows:
+            report.warnings.append(f"{reader.unknown_rows} dump rows name instances "
+                                   "missing from the instance table")
+        
+        try:
+            checks = [check for monitor in monitors
+                      for check in self._evaluate(monitor, values, report.warnings)]
+        except ExpressionError as e:
+            raise OPCheckError(str(e))
+        if not checks:
+            return report
+        
+        stats = {key: np.concatenate([check[1][key] for check in checks]) for key in checks[0][1]}
+        owners = np.concatenate([np.full(len(check[1]['index']), k) for k, check in enumerate(checks)])
+        checked = stats['checked'] > 0
+        report.checks = int(checked.sum())
+        report.failed = int((stats['failing'] > 0).sum())
+        
+        keep = stats['failing'] > 0 if failing_only else checked
+        selected = np.flatnonzero(keep)
+        order = selected[np.argsort(stats['margin'][selected], kind='stable')]
+        report.results = [self._result(checks[owners[k]][0], stats, k, reader.points)
+                          for k in order]
+        return report
+    
+    def _param(self, monitor: Monitor) -> str:
+        """OP output probed by a monitor."""
+        return str(monitor.parameters.extra.get('param', 'vth')).strip('"')
+    
+    def _limit_source(self, monitor: Monitor, name: str) -> Any:
+        """Limit value or expression of a monitor, None if not set."""
+        extra = monitor.parameters.extra
+        for key in LIMIT_ALIASES.get(name, (name,)):
+            if extra.get(key) is not None:
+                return extra[key]
+        return None
+    
+    def _limit(self, source: Any, default: float, matched: List[int],
+               params: Optional[Dict[str, np.ndarray]]) -> np.ndarray:
+        """Evaluate a limit per matched instance."""
+        if source is None:
+            value = default
+        else:
+            value = self.evaluator.evaluate(source, params)
+        return np.broadcast_to(np.asarray(value, dtype=np.float64), (len(matched),))
+    
+    def _evaluate(self, monitor: Monitor, values: Dict[str, np.ndarray],
+                  warnings: List[str]) -> List[Tuple[Monitor, Dict[str, np.ndarray]]]:
+        """Check one monitor on all matching instances and sweep points."""
+        matched = sorted(i for name, indices in self.by_subcircuit.items()
+                         if fnmatchcase(name, monitor.device_pattern) for i in indices)
+        if not matched:
+            return []
+        param = self._param(monitor)
+        if param not in values:
+            warnings.append(f"{monitor.name}: OP output '{param}' not in the dumps, skipped")
+            return []
+        
+        sources = {name: self._limit_source(monitor, name) for name in ('vlow', 'vhigh', 'vgt')}
+        params = None
+        if any(isinstance(source, str) for source in sources.values()):
+            params = instance_arrays([self.instances[i] for i in matched])
+        # parcheck3.va defaults plow = phigh = 0.0 and monitors only while plow < phigh
+        low = self._limit(sources['vlow'], 0.0, matched, params)
+        high = self._limit(sources['vhigh'], 0.0, matched, params)
+        enabled = low < high
+        if not enabled.any():
+            warnings.append(f"{monitor.name}: vlow < vhigh holds for no instance, "
+                            "the monitor is disabled as in parcheck3.va")
+            return []
+        for name in ('vlow', 'vhigh'):
+            if sources[name] is None:
+                warnings.append(f"{monitor.name}: {name} not set, defaults to 0.0 "
+                                "as in parcheck3.va")
+        
+        index = np.array(matched)
+        q = values[param][:, index]
+        valid = ~np.isnan(q) & enabled
+        if sources['vgt'] is not None:
+            if 'vgs' in values and 'vth' in values:
+                vgt = self._limit(sources['vgt'], 0.0, matched, params)
+                valid &= self._on_state(monitor, index, values, vgt)
+            else:
+                warnings.append(f"{monitor.name}: vgt gating needs vgs and vth in the dumps, "
+                                "checked at every point")
+        
+        with np.errstate(invalid='ignore'):
+            margin = np.where(valid, np.minimum(q - low, high - q), np.inf)
+        worst = margin.argmin(axis=0)
+        columns = np.arange(len(matched))
+        return [(monitor, {
+            'index': index,
+            'margin': margin[worst, columns],
+            'value': q[worst, columns],
+            'point': worst,
+            'failing': (margin < 0).sum(axis=0),
+            'checked': valid.sum(axis=0),
+            'low': np.array(low),
+            'high': np.array(high),
+        })]
+    
+    def _on_state(self, monitor: Monitor, index: np.ndarray, values: Dict[str, np.ndarray],
+                  vgt: np.ndarray) -> np.ndarray:
+        """Points at which the instances are on (ovcheck_mos_alt.va state test)."""
+        default_vthsign = float(self.evaluator.evaluate(
+            monitor.parameters.extra.get('pmosvthsign', 1.0)))
+        params = [self.instances[i]['parameters'] for i in index]
+        types = np.array([p.get('type', 1.0) for p in params], dtype=np.float64)
+        vthsign = np.array([p.get('pmosvthsign', default_vthsign) for p in params],
+                           dtype=np.float64)
+        sign = np.where(types >= 0, 1.0, -1.0)
+        # vth_sign_correction of the .va: pmosvthsign for pmos, 1 for nmos
+        vth_sign = np.where(types >= 0, 1.0, np.where(vthsign >= 0, 1.0, -1.0))
+        vgs = sign * values['vgs'][:, index]
+        if 'vds' in values:
+            vds = sign * values['vds'][:, index]
+            vgs = np.where(vds < 0, vgs - vds, vgs)
+        with np.errstate(invalid='ignore'):
+            return vgs > vth_sign * values['vth'][:, index] + vgt
+    
+    def _result(self, monitor: Monitor, stats: Dict[str, np.ndarray], k: int,
+                points: List[str]) -> ParCheckResult:
+        """Build the result of one flattened check."""
+        inst = self.instances[stats['index'][k]]
+        result = ParCheckResult(
+            instance=inst['instance'],
+            subcircuit=inst['subcircuit'],
+            monitor=monitor.name,
+            param=self._param(monitor),
+            value=float(stats['value'][k]),
+            low=float(stats['low'][k]),
+            high=float(stats['high'][k]),
+            margin=float(stats['margin'][k]),
+            point=points[stats['point'][k]],
+            failing_points=int(stats['failing'][k]),
+            checked_points=int(stats['checked'][k]),
+        )
+        if result.margin < 0:
+            bound = (f"< vlow={result.low:.4g}" if result.value < result.low
+                     else f"> vhigh={result.high:.4g}")
+            result.violations.append(
+                f"{result.param}={result.value:.4g} {bound} at {result.point} "
+                f"({result.failing_points} of {result.checked_points} points)"
+            )
+        return result
+
+
+def write_report(results: List[ParCheckResult], output_path: Path):
+    """Write parameter check results as CSV."""
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['instance', 'subcircuit', 'monitor', 'param', 'value', 'vlow', 'vhigh',
+                         'margin', 'point', 'failing_points', 'checked_points', 'violations'])
+        for r in results:
+            writer.writerow([
+                r.instance, r.subcircuit, r.monitor, r.param,
+                f"{r.value:.6g}", f"{r.low:.6g}", f"{r.high:.6g}", f"{r.margin:.6g}",
+                r.point, r.failing_points, r.checked_points,
+                '; '.join(r.violations),
+            ])
+
+
+def analyze_op_dumps(document: SOADocument, dump_paths: Sequence[Path], instances_path: Path,
+                     failing_only: bool = True,
+                     chunk_rows: int = DEFAULT_CHUNK_ROWS) -> OPCheckReport:
+    """Convenience function to check OP dumps against the parcheckva3 monitors of a spec."""
+    try:
+        instances = load_instances(instances_path)
+    except WaveformError as e:
+        raise OPCheckError(str(e))
+    
+    analyzer = OPCheckAnalyzer(document, instances)
+    return analyzer.analyze(dump_paths, failing_only, chunk_rows)
@@ -0,0 +1,161 @@
+"""
+SOA DSL Optimizer - Base Section Reduction
+Drops unreferenced global parameters and hoists repeated limit literals into shared parameters.
+"""
+
+import io
+import re
+import copy
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from .parser import SOADocument, Monitor
+from .generator import CodeGenerator
+from .expressions import referenced_names, parameter_closure
+
+
+# Literals used at least this often become shared parameters
+DEFAULT_MIN_USES = 3
+
+HOIST_PREFIX = 'soa_lim'
+
+# Limit parameters whose numeric literals may be hoisted
+_LIMIT_KEY = re.compile(r'^v(low|high)(\d+|_on|_off|_gc)?$')
+_NUMBER = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+
+
+@dataclass
+class OptimizationReport:
+    """What the optimizer changed."""
+    bytes_before: int = 0
+    bytes_after: int = 0
+    dropped: List[str] = field(default_factory=list)
+    # hoisted parameter name -> (literal, number of uses)
+    hoisted: Dict[str, Tuple[str, int]] = field(default_factory=dict)
+    
+    @property
+    def saved(self) -> int:
+        """Bytes removed from the generated code."""
+        return self.bytes_before - self.bytes_after
+    
+    def summary(self) -> str:
+        """One-line description of the reduction."""
+        percent = 100.0 * self.saved / self.bytes_before if self.bytes_before else 0.0
+        change = f"{percent:.1f}% smaller" if percent >= 0 else f"{-percent:.1f}% larger"
+        uses = sum(n for _, n in self.hoisted.values())
+        return (f"{self.bytes_before:,} → {self.bytes_after:,} bytes ({change}); "
+                f"dropped {len(self.dropped)} unused parameters, "
+                f"hoisted {len(self.hoisted)} literals ({uses} uses)")
+
+
+def _literal(value: Any) -> Optional[str]:
+    """Emitted text of a numeric literal limit, None for anything else."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str) and _NUMBER.match(value.strip()):
+        return value.strip()
+    return None
+
+
+def _hoisted_name(taken: Dict[str, Any]) -> str:
+    """Next free shared parameter name (soa_lim1, soa_lim2, ...).
+    
+    Names are kept short on purpose: a name that spelled out the literal
+    could never be shorter than the literal it replaces.
+    """
+    index = 1
+    while f"{HOIST_PREFIX}{index}" in taken:
+        index += 1
+    return f"{HOIST_PREFIX}{index}"
+
+
+def _limit_slots(monitor: Monitor) -> List[Tuple[Dict[str, Any], str]]:
+    """(container, key) of every limit value of a monitor."""
+    slots = [(monitor.parameters.extra, key) for key in monitor.parameters.extra
+             if _LIMIT_KEY.match(key)]
+    for branch in monitor.branches or []:
+        slots.extend((branch, key) for key in ('vlow', 'vhigh') if key in branch)
+    if monitor.gate_control:
+        slots.extend((monitor.gate_control, key) for key in monitor.gate_control
+                     if _LIMIT_KEY.match(key))
+    return slots
+
+
+def _generated_size(document: SOADocument) -> int:
+    """Size of the generated Spectre code in bytes."""
+    buffer = io.StringIO()
+    CodeGenerator(document).generate(buffer)
+    return len(buffer.getvalue().encode())
+
+
+class NetlistOptimizer:
+    """Shrinks the generated netlist without changing what it checks.
+    
+    Limit literals repeated at least ``min_uses`` times across monitors are
+    replaced by one shared ``soa_limN`` parameter each, as long as that
+    makes the netlist smaller (a short literal such as -1.32 is cheaper than
+    any parameter reference); then every global parameter that no emitted
+    monitor references, directly or through other parameters, is dropped
+    from the base section. ``ovcheckva_pwl`` tables and expressions are left
+    alone: only plain numeric limits are hoisted.
+    """
+    
+    def __init__(self, document: SOADocument, min_uses: int = DEFAULT_MIN_USES):
+        self.document = document
+        self.min_uses = min_uses
+    
+    def optimize(self) -> Tuple[SOADocument, OptimizationReport]:
+        """Return an optimized copy of the document and a report."""
+        report = OptimizationReport(bytes_before=_generated_size(self.document))
+        
+        document = copy.deepcopy(self.document)
+        document.parameters = dict(document.parameters or {})
+        
+        if self.min_uses > 0:
+            self._hoist_literals(document, report)
+        self._drop_unused(document, report)
+        
+        report.bytes_after = _generated_size(document)
+        return document, report
+    
+    def _hoist_literals(self, document: SOADocument, report: OptimizationReport):
+        """Replace repeated limit literals by shared parameters."""
+        uses: Dict[str, List[Tuple[Dict[str, Any], str]]] = {}
+        for monitor in document.monitors:
+            if monitor.monitor_type == 'ovcheckva_pwl':
+                continue
+            for container, key in _limit_slots(monitor):
+                literal = _literal(container[key])
+                if literal is not None:
+                    uses.setdefault(literal, []).append((container, key))
+        
+        for literal, slots in uses.items():
+            if len(slots) < self.min_uses:
+                continue
+            name = _hoisted_name(document.parameters)
+            definition = len(f"+ {name} = {literal}\n")
+            if len(slots) * (len(literal) - len(name)) <= definition:
+                continue
+            document.parameters[name] = literal
+            for container, key in slots:
+                container[key] = name
+            report.hoisted[name] = (literal, len(slots))
+    
+    def _drop_unused(self, document: SOADocument, report: OptimizationReport):
+        """Remove global parameters no monitor section references."""
+        generator = CodeGenerator(document)
+        names = set()
+        for _, text in generator.section_texts()[1:]:
+            names |= referenced_names(text)
+        
+        used = parameter_closure(names, document.parameters)
+        report.dropped = [name for name in document.parameters if name not in used]
+        document.parameters = {k: v for k, v in document.parameters.items() if k in used}
+
+
+def optimize_document(document: SOADocument,
+                      min_uses: int = DEFAULT_MIN_USES) -> Tuple[SOADocument, OptimizationReport]:
+    """Convenience function to optimize a document for code generation."""
+    return NetlistOptimizer(document, min_uses).optimize()
@@ -0,0 +1,99 @@
+"""
+SOA DSL Branch Packing - Monitor Instance Reduction
+Merges compatible single-branch ovcheck monitors into multi-branch ovcheck6 monitors.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# ovcheck6 supports up to this many branches (monitor_library branch_limit)
+DEFAULT_BRANCH_LIMIT = 6
+
+# Parameters shared by all branches of one ovcheck6 instance
+SHARED_PARAMS = ('tmin', 'tdelay', 'vballmsg', 'stop', 'tmaxfrac')
+
+# Per-branch parameters of a single-branch ovcheck
+BRANCH_PARAMS = ('branch1', 'message1', 'vlow', 'vhigh')
+
+
+def is_packable(monitor: Dict[str, Any]) -> bool:
+    """True for a plain single-branch ovcheck voltage/current check."""
+    if monitor.get('monitor_type') != 'ovcheck':
+        return False
+    params = monitor.get('parameters') or {}
+    if 'branch1' not in params or not ('vlow' in params or 'vhigh' in params):
+        return False
+    return all(key in SHARED_PARAMS or key in BRANCH_PARAMS for key in params)
+
+
+def _pack_key(monitor: Dict[str, Any]) -> Tuple:
+    """Monitors with equal keys can share one ovcheck6 instance."""
+    params = monitor['parameters']
+    return (monitor['device_pattern'],) + tuple(str(params.get(k)) for k in SHARED_PARAMS)
+
+
+def _packed_monitor(members: List[Dict[str, Any]], index: int) -> Dict[str, Any]:
+    """Build one ovcheck6 monitor from up to branch_limit ovcheck monitors."""
+    device = members[0]['device_pattern']
+    first = members[0]['parameters']
+    
+    params = {key: first[key] for key in SHARED_PARAMS if key in first}
+    for i, member in enumerate(members, 1):
+        branch = member['parameters']
+        params[f'branch{i}'] = branch['branch1']
+        # Keep the rule's message; fall back to the rule name so violations stay attributable
+        params[f'message{i}'] = branch.get('message1', member['name'])
+        if 'vlow' in branch:
+            params[f'vlow{i}'] = branch['vlow']
+        if 'vhigh' in branch:
+            params[f'vhigh{i}'] = branch['vhigh']
+    
+    return {
+        'name': ' + '.join(dict.fromkeys(m['name'] for m in members)),
+        'monitor_type': 'ovcheck6',
+        'model_name': f"ovcheck6_{device}_packed{index}",
+        'section': f"soacheck_{device}_packed{index}_shared",
+        'device_pattern': device,
+        'parameters': params,
+    }
+
+
+def pack_branches(monitors: List[Dict[str, Any]],
+                  branch_limit: int = DEFAULT_BRANCH_LIMIT,
+                  origins: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, Any]]:
+    """Pack single-branch ovcheck monitors into the fewest ovcheck6 monitors.
+    
+    Checks are grouped per device and shared timing/tmaxfrac parameters, in
+    order of first appearance, and split into ovcheck6 monitors of at most
+    ``branch_limit`` branches. A packed monitor takes the place of its first
+    member; groups of a single check are left unchanged. If ``origins`` is
+    given, it maps each packed model name to its members' model names.
+    """
+    groups: Dict[Tuple, List[int]] = {}
+    for position, monitor in enumerate(monitors):
+        if is_packable(monitor):
+            groups.setdefault(_pack_key(monitor), []).append(position)
+    
+    replaced: Dict[int, Dict[str, Any]] = {}
+    dropped = set()
+    counters: Dict[str, int] = {}
+    
+    for positions in groups.values():
+        if len(positions) < 2:
+            continue
+        for start in range(0, len(positions), branch_limit):
+            chunk = positions[start:start + branch_limit]
+            if len(chunk) < 2:
+                continue
+            device = monitors[chunk[0]]['device_pattern']
+            counters[device] = counters.get(device, 0) + 1
+            replaced[chunk[0]] = _packed_monitor([monitors[p] for p in chunk], counters[device])
+            if origins is not None:
+                origins[replaced[chunk[0]]['model_name']] = [monitors[p]['model_name'] for p in chunk]
+            dropped.update(chunk[1:])
+    
+    return [
+        replaced.get(position, monitor)
+        for position, monitor in enumerate(monitors)
+        if position not in dropped
+    ]
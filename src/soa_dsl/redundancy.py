@@ -0,0 +1,261 @@
+"""
+SOA DSL Redundancy Analysis - Overlapping Rule Detection
+Finds duplicated, subsumed and conflicting voltage/current checks in a monitor spec.
+"""
+
+import csv
+import math
+import re
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from .parser import SOADocument, Monitor
+from .expressions import ExpressionEvaluator, ExpressionError
+
+
+# Monitor types whose branches are plain vlow <= value <= vhigh checks
+INTERVAL_MONITOR_TYPES = ('ovcheck', 'ovcheck6')
+
+_TWO_NODE_BRANCH = re.compile(r'^([VI])\(([^,()]+),([^,()]+)\)$')
+
+
+class RedundancyError(Exception):
+    """Exception raised for redundancy analysis errors."""
+    pass
+
+
+@dataclass
+class Check:
+    """One branch check of a monitor, with its limits resolved."""
+    monitor_index: int
+    monitor_name: str
+    model_name: str
+    device_pattern: str
+    # Canonical branch and limits, used for comparison
+    branch: str
+    low: float
+    high: float
+    time_class: Tuple[str, ...]
+    # Branch and limits as written in the rule, used for reporting
+    source_branch: str = ''
+    source_low: float = -math.inf
+    source_high: float = math.inf
+    
+    def interval(self) -> str:
+        """Limits as written, e.g. [-1.32, 1.32]."""
+        return f"[{self.source_low:g}, {self.source_high:g}]"
+
+
+@dataclass
+class Finding:
+    """A check that is redundant with, or contradicts, another check."""
+    kind: str          # 'duplicate', 'subsumed' or 'conflict'
+    check: Check
+    other: Check
+
+
+@dataclass
+class RedundancyReport:
+    """Result of a redundancy analysis."""
+    checks: int = 0
+    skipped: int = 0
+    findings: List[Finding] = field(default_factory=list)
+    
+    def by_kind(self, kind: str) -> List[Finding]:
+        """Findings of one kind."""
+        return [f for f in self.findings if f.kind == kind]
+    
+    def keep_flags(self, monitor_count: int,
+                   checks_per_monitor: Dict[int, int]) -> List[bool]:
+        """Keep flags per monitor, dropping monitors whose checks are all redundant.
+        
+        A duplicate keeps its first occurrence and a subsumed check keeps
+        the stricter one, so every dropped check is still covered by a
+        check that stays.
+        """
+        redundant: Dict[int, int] = {}
+        for finding in self.findings:
+            if finding.kind in ('duplicate', 'subsumed'):
+                index = finding.check.monitor_index
+                redundant[index] = redundant.get(index, 0) + 1
+        
+        return [
+            redundant.get(index, 0) != checks_per_monitor.get(index, -1)
+            for index in range(monitor_count)
+        ]
+
+
+def normalize_branch(branch: str, low: float, high: float) -> Tuple[str, float, float]:
+    """Canonical branch name; V(b,a) in [l, h] becomes V(a,b) in [-h, -l]."""
+    text = branch.replace(' ', '')
+    match = _TWO_NODE_BRANCH.match(text)
+    if match and match.group(2) > match.group(3):
+        kind, a, b = match.groups()
+        return f"{kind}({b},{a})", -high, -low
+    return text, low, high
+
+
+class RedundancyAnalyzer:
+    """Indexes interval checks per (device, branch, time class) and compares them.
+    
+    The time class is the resolved (tmaxfrac, tmin, tdelay, stop, vballmsg)
+    of the monitor: checks that filter violations differently in time, stop
+    the simulation differently or report differently are never compared.
+    Checks whose limits cannot be evaluated to numbers (instance-parameter
+    expressions) are counted as skipped.
+    """
+    
+    def __init__(self, document: SOADocument):
+        self.document = document
+        self.evaluator = ExpressionEvaluator(document.parameters or {})
+        self._values: Dict[Any, Optional[float]] = {}
+        self.checks_per_monitor: Dict[int, int] = {}
+    
+    def analyze(self) -> RedundancyReport:
+        """Run the analysis over all monitors."""
+        report = RedundancyReport()
+        groups: Dict[Tuple, List[Check]] = {}
+        
+        for index, monitor in enumerate(self.document.monitors):
+            if monitor.monitor_type not in INTERVAL_MONITOR_TYPES:
+                continue
+            for check in self._checks(index, monitor, report):
+                key = (check.device_pattern, check.branch, check.time_class)
+                groups.setdefault(key, []).append(check)
+        
+        for checks in groups.values():
+            if len(checks) > 1:
+                report.findings.extend(self._compare(checks))
+        
+        report.findings.sort(key=lambda f: (f.check.monitor_index, f.kind))
+        return report
+    
+    def _value(self, value: Any) -> Optional[float]:
+        """Numeric value of a limit or timing parameter, None if not constant."""
+        key = value if isinstance(value, (str, int, float)) else repr(value)
+        if key not in self._values:
+            try:
+                result = self.evaluator.evaluate(value)
+                self._values[key] = float(result) if isinstance(result, (int, float)) else None
+            except (ExpressionError, TypeError, ValueError, ZeroDivisionError, OverflowError):
+                self._values[key] = None
+        return self._values[key]
+    
+    def _time_class(self, monitor: Monitor) -> Tuple[str, ...]:
+        """Resolved (tmaxfrac, tmin, tdelay, stop, vballmsg), falling back to the raw text."""
+        params = monitor.parameters
+        result = []
+        for raw in (params.tmaxfrac, params.tmin, params.tdelay, params.stop, params.vballmsg):
+            value = self._value(raw) if raw is not None else None
+            result.append(f"{value:g}" if value is not None else str(raw))
+        return tuple(result)
+    
+    def _branch_limits(self, monitor: Monitor) -> List[Tuple[str, Any, Any]]:
+        """(branch, vlow, vhigh) of every branch of an ovcheck/ovcheck6 monitor."""
+        extra = monitor.parameters.extra
+        if monitor.monitor_type == 'ovcheck':
+            if 'branch1' not in extra:
+                return []
+            return [(extra['branch1'], extra.get('vlow'), extra.get('vhigh'))]
+        
+        if monitor.branches:
+            return [(b.get('branch'), b.get('vlow'), b.get('vhigh')) for b in monitor.branches]
+        
+        limits = []
+        i = 1
+        while f'branch{i}' in extra:
+            limits.append((extra[f'branch{i}'], extra.get(f'vlow{i}'), extra.get(f'vhigh{i}')))
+            i += 1
+        return limits
+    
+    def _checks(self, index: int, monitor: Monitor, report: RedundancyReport) -> List[Check]:
+        """Expanded checks of one monitor."""
+        time_class = self._time_class(monitor)
+        limits = self._branch_limits(monitor)
+        # Skipped checks count too, so they keep their monitor from being dropped;
+        # monitors that also check self-heating are never dropped
+        if limits and not (monitor.self_heating or monitor.constraints):
+            self.checks_per_monitor[index] = len(limits)
+        
+        checks = []
+        for branch, vlow, vhigh in limits:
+            report.checks += 1
+            low = -math.inf if vlow is None else self._value(vlow)
+            high = math.inf if vhigh is None else self._value(vhigh)
+            if not branch or low is None or high is None:
+                report.skipped += 1
+                continue
+            
+            name, canonical_low, canonical_high = normalize_branch(str(branch), low, high)
+            checks.append(Check(
+                monitor_index=index,
+                monitor_name=monitor.name,
+                model_name=monitor.model_name,
+                device_pattern=monitor.device_pattern,
+                branch=name,
+                low=canonical_low,
+                high=canonical_high,
+                time_class=time_class,
+                source_branch=str(branch),
+                source_low=low,
+                source_high=high,
+            ))
+        return checks
+    
+    def _compare(self, checks: List[Check]) -> List[Finding]:
+        """Findings within one (device, branch, time class) group, O(n log n).
+        
+        A check is subsumed when another check's interval lies inside its own:
+        anything it flags is already flagged by the stricter check. With the
+        distinct intervals sorted by low bound descending (high ascending on
+        ties), every interval seen before the current one starts at or above
+        it, so it is subsumed exactly when the smallest high bound seen so
+        far does not exceed its own.
+        """
+        findings = []
+        
+        # Exact duplicates: keep the first occurrence of each interval
+        distinct: Dict[Tuple[float, float], Check] = {}
+        for check in checks:
+            first = distinct.setdefault((check.low, check.high), check)
+            if first is not check:
+                findings.append(Finding('duplicate', check, first))
+        
+        ordered = sorted(distinct.values(), key=lambda c: (-c.low, c.high))
+        tightest: Optional[Check] = None
+        for check in ordered:
+            if tightest is not None and tightest.high <= check.high:
+                findings.append(Finding('subsumed', check, tightest))
+            elif tightest is None or check.high < tightest.high:
+                tightest = check
+        
+        # Conflict: two intervals without any common value always violate together
+        highest_low = max(distinct.values(), key=lambda c: c.low)
+        lowest_high = min(distinct.values(), key=lambda c: c.high)
+        if highest_low.low > lowest_high.high:
+            findings.append(Finding('conflict', highest_low, lowest_high))
+        
+        return findings
+
+
+def write_report(report: RedundancyReport, output_path: Path):
+    """Write findings as CSV."""
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['kind', 'device', 'branch', 'monitor', 'model', 'limits',
+                         'other_branch', 'other_monitor', 'other_model', 'other_limits'])
+        for finding in report.findings:
+            check, other = finding.check, finding.other
+            writer.writerow([finding.kind, check.device_pattern, check.source_branch,
+                             check.monitor_name, check.model_name, check.interval(),
+                             other.source_branch, other.monitor_name, other.model_name,
+                             other.interval()])
+
+
+def analyze_redundancy(document: SOADocument) -> Tuple[RedundancyReport, List[bool]]:
+    """Convenience function: analyze a document and compute monitor keep flags."""
+    analyzer = RedundancyAnalyzer(document)
+    report = analyzer.analyze()
+    keep = report.keep_flags(len(document.monitors), analyzer.checks_per_monitor)
+    return report, keep
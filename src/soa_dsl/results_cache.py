@@ -0,0 +1,232 @@
+"""
+SOA DSL Results Cache - Incremental Simulation Reuse
+Per-section content hashes, a local SOA results cache and a rerun planner.
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+from .parser import SOADocument
+from .generator import CodeGenerator
+from .expressions import referenced_names, parameter_closure
+from .spec_loader import file_digest
+
+
+# Bump when the manifest layout or the section hash definition changes
+MANIFEST_FORMAT = 2
+
+DEFAULT_CACHE_DIR = Path('.soa_cache') / 'results'
+
+BASE_SECTION = 'base'
+
+_AHDL_INCLUDE = re.compile(r'^ahdl_include\s+"([^"]+)"')
+
+# Digest of an included file that cannot be read; never matches a real digest
+MISSING_DIGEST = 'missing'
+
+
+class ResultsCacheError(Exception):
+    """Exception raised for manifest and results cache errors."""
+    pass
+
+
+def _sha256(text: str) -> str:
+    """SHA-256 of a string."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def include_digests(text: str, veriloga_dir: Path) -> str:
+    """``ahdl_include`` lines of Spectre text, each with the digest of its file.
+    
+    Included files are looked up by name in the Verilog-A tree, the
+    directory ``--veriloga`` indexes. A missing file gets ``MISSING_DIGEST``
+    so the sections are rerun once it appears.
+    """
+    lines = []
+    for line in text.splitlines():
+        match = _AHDL_INCLUDE.match(line)
+        if not match:
+            continue
+        path = Path(veriloga_dir) / Path(match.group(1)).name
+        try:
+            digest = file_digest(path)
+        except OSError:
+            digest = MISSING_DIGEST
+        lines.append(f"{line} {digest}\n")
+    return ''.join(lines)
+
+
+def build_manifest(document: SOADocument, veriloga_dir: Path = Path('veriloga')
+                   ) -> Dict[str, Any]:
+    """Per-section content hashes of the generated Spectre code.
+    
+    A monitor section's hash covers its own text, the ``ahdl_include`` lines
+    with the contents of the included Verilog-A files and the values of the
+    global parameters it uses (directly or through other parameters), so
+    editing one ``soa_*`` parameter only changes the sections that depend on
+    it. The base section is listed with the hash of its full text.
+    """
+    generator = CodeGenerator(document)
+    sections = generator.section_texts()
+    base_text = sections[0][1]
+    includes = include_digests(base_text, veriloga_dir)
+    parameters = document.parameters or {}
+    
+    # Monitors sharing a section are hashed together
+    texts: Dict[str, str] = {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    for monitor, (section, text) in zip(document.monitors, sections[1:]):
+        texts[section] = texts.get(section, '') + text
+        entry = entries.setdefault(section, {'models': [], 'monitors': []})
+        entry['models'].append(monitor.model_name)
+        entry['monitors'].append(monitor.name)
+    
+    manifest_sections = {BASE_SECTION: {'hash': _sha256(base_text)}}
+    for section, text in texts.items():
+        used = sorted(parameter_closure(referenced_names(text), parameters))
+        bound = ''.join(f"{name}={parameters[name]}\n" for name in used)
+        entry = entries[section]
+        entry['parameters'] = used
+        entry['hash'] = _sha256(f"{includes}\0{bound}\0{text}")
+        manifest_sections[section] = entry
+    
+    return {
+        'format': MANIFEST_FORMAT,
+        'process': document.process,
+        'sections': manifest_sections,
+    }
+
+
+def write_manifest(document: SOADocument, manifest_path: Path,
+                   veriloga_dir: Path = Path('veriloga')) -> Dict[str, Any]:
+    """Build the section manifest of a document and write it as JSON."""
+    manifest = build_manifest(document, veriloga_dir)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return manifest
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Any]:
+    """Load a section manifest written by ``write_manifest``."""
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ResultsCacheError(f"Failed to load manifest {manifest_path}: {e}")
+    
+    if not isinstance(manifest, dict) or manifest.get('format') != MANIFEST_FORMAT:
+        raise ResultsCacheError(f"Unsupported manifest format in {manifest_path}, regenerate it")
+    return manifest
+
+
+def monitor_sections(manifest: Dict[str, Any]) -> Dict[str, str]:
+    """Section name -> hash for every section that produces SOA results."""
+    return {
+        name: entry['hash']
+        for name, entry in manifest['sections'].items()
+        if name != BASE_SECTION
+    }
+
+
+class ResultsCache:
+    """Local store of parsed SOA results.
+    
+    Entries are keyed by (design netlist hash, stimulus id, section hash) and
+    hold whatever JSON-serializable results the flow parsed for that section
+    (e.g. a list of violations). Each entry is one small JSON file, written
+    atomically, so concurrent regression jobs can share a cache directory.
+    """
+    
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+    
+    @staticmethod
+    def key(design_hash: str, stimulus: str, section_hash: str) -> str:
+        """Cache key of one (design, stimulus, section) combination."""
+        return _sha256(f"{design_hash}\0{stimulus}\0{section_hash}")
+    
+    def _path(self, key: str) -> Path:
+        """Entry file of a key (two-level fan-out keeps directories small)."""
+        return self.root / key[:2] / f"{key}.json"
+    
+    def contains(self, design_hash: str, stimulus: str, section_hash: str) -> bool:
+        """True if results are cached for this combination."""
+        return self._path(self.key(design_hash, stimulus, section_hash)).exists()
+    
+    def get(self, design_hash: str, stimulus: str, section_hash: str) -> Optional[Any]:
+        """Cached results, or None if there is no (readable) entry."""
+        path = self._path(self.key(design_hash, stimulus, section_hash))
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)['results']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def put(self, design_hash: str, stimulus: str, section_hash: str, results: Any):
+        """Store results for one section of one simulation."""
+        path = self._path(self.key(design_hash, stimulus, section_hash))
+        entry = {
+            'design': design_hash,
+            'stimulus': stimulus,
+            'section': section_hash,
+            'results': results,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            raise ResultsCacheError(f"Failed to write cache entry {path}: {e}")
+
+
+@dataclass
+class RunPlan:
+    """What to do for one stimulus."""
+    stimulus: str
+    reuse: List[str] = field(default_factory=list)
+    simulate: List[str] = field(default_factory=list)
+    
+    @property
+    def skip(self) -> bool:
+        """True if every section's results are cached."""
+        return not self.simulate
+
+
+def plan_runs(manifest: Dict[str, Any], design_hash: str, stimuli: List[str],
+              cache: ResultsCache) -> List[RunPlan]:
+    """Split every stimulus's sections into cached and to-be-simulated."""
+    sections = monitor_sections(manifest)
+    plans = []
+    for stimulus in stimuli:
+        plan = RunPlan(stimulus=stimulus)
+        for name, section_hash in sections.items():
+            if cache.contains(design_hash, stimulus, section_hash):
+                plan.reuse.append(name)
+            else:
+                plan.simulate.append(name)
+        plans.append(plan)
+    return plans
+
+
+def store_results(manifest: Dict[str, Any], design_hash: str, stimulus: str,
+                  results: Dict[str, Any], cache: ResultsCache) -> int:
+    """Store per-section results of one simulation; returns the entry count.
+    
+    ``results`` maps section names from the manifest to their parsed results.
+    """
+    sections = monitor_sections(manifest)
+    unknown = sorted(set(results) - set(sections))
+    if unknown:
+        raise ResultsCacheError(f"Sections not in manifest: {', '.join(unknown)}")
+    
+    for name, section_results in results.items():
+        cache.put(design_hash, stimulus, sections[name], section_results)
+    return len(results)
@@ -0,0 +1,357 @@
+"""
+SOA DSL Rule Store - Indexed SQLite Rule Base
+Stores universal rules and their converted monitors in SQLite for fast queries and conversion.
+"""
+
+import os
+import json
+import sqlite3
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from .spec_loader import load_universal_spec, file_digest
+
+
+# Files with these suffixes are rule stores wherever a universal spec is accepted
+STORE_SUFFIXES = ('.db', '.sqlite')
+
+# Bump when the schema changes (stored as PRAGMA user_version)
+STORE_FORMAT = 2
+
+# Rows inserted per executemany batch
+INSERT_BATCH = 4096
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE rules (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    check_type TEXT,
+    time_limit TEXT,
+    body TEXT NOT NULL
+);
+CREATE TABLE rule_targets (rule_id INTEGER NOT NULL, kind TEXT NOT NULL, target TEXT NOT NULL);
+CREATE TABLE monitors (
+    id INTEGER PRIMARY KEY,
+    rule_id INTEGER NOT NULL,
+    device TEXT NOT NULL,
+    monitor_type TEXT NOT NULL,
+    check_type TEXT,
+    time_limit TEXT,
+    tmaxfrac TEXT,
+    model_name TEXT NOT NULL,
+    section TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE TABLE group_members (kind TEXT NOT NULL, name TEXT NOT NULL, device TEXT NOT NULL);
+"""
+
+_INDEXES = """
+CREATE INDEX rules_name ON rules (name);
+CREATE INDEX rule_targets_target ON rule_targets (target);
+CREATE INDEX monitors_rule ON monitors (rule_id);
+CREATE INDEX monitors_device ON monitors (device);
+CREATE INDEX monitors_type ON monitors (monitor_type);
+CREATE INDEX monitors_check ON monitors (check_type);
+CREATE INDEX monitors_time ON monitors (time_limit);
+CREATE INDEX monitors_tmaxfrac ON monitors (tmaxfrac);
+CREATE INDEX group_members_name ON group_members (name);
+"""
+
+
+class RuleStoreError(Exception):
+    """Exception raised for rule store errors."""
+    pass
+
+
+def is_rule_store(filepath: Path) -> bool:
+    """True if ``filepath`` names a rule store rather than a YAML spec."""
+    return Path(filepath).suffix in STORE_SUFFIXES
+
+
+@dataclass
+class QueryRow:
+    """One converted check matching a query."""
+    rule: str
+    device: str
+    monitor_type: str
+    check_type: str
+    time_limit: str
+    tmaxfrac: str
+    model_name: str
+    section: str
+
+
+class RuleStore:
+    """SQLite store of universal rules and the monitors they convert to.
+    
+    Rules are kept in spec order with their YAML content as JSON; the
+    monitors table holds one row per (rule, device), indexed by device,
+    monitor type, check type and time limit level. Group membership of the
+    device library used for the import is stored too, so group queries do
+    not need the library. The SHA-256 of both libraries is recorded; the
+    stored monitors are refused once either library has changed.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise RuleStoreError(f"Rule store not found: {self.path}")
+        try:
+            self.connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.Error as e:
+            raise RuleStoreError(f"Failed to open rule store {self.path}: {e}")
+        if version != STORE_FORMAT:
+            self.connection.close()
+            raise RuleStoreError(f"Unsupported rule store format in {self.path}, reimport")
+    
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+    
+    def __enter__(self) -> 'RuleStore':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def meta(self, key: str, default: Any = None) -> Any:
+        """A header value stored at import (version, process, globals, ...)."""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+    
+    def rules(self) -> Iterator[Dict[str, Any]]:
+        """All rules in spec order."""
+        for (body,) in self.connection.execute("SELECT body FROM rules ORDER BY id"):
+            yield json.loads(body)
+    
+    def monitors(self) -> Iterator[Dict[str, Any]]:
+        """All converted monitors in conversion order."""
+        for (body,) in self.connection.execute("SELECT body FROM monitors ORDER BY id"):
+            yield json.loads(body)
+    
+    def universal_spec(self) -> Dict[str, Any]:
+        """The stored rule base as a universal spec dictionary."""
+        return {
+            'version': self.meta('version', '1.0'),
+            'process': self.meta('process', 'UNKNOWN'),
+            'date': self.meta('date', '2024-12-16'),
+            'globals': self.meta('globals', {}),
+            'rules': list(self.rules()),
+        }
+    
+    def stale_libraries(self) -> List[str]:
+        """Libraries changed (or missing) since the import."""
+        stale = []
+        for path, digest in self.meta('libraries', {}).items():
+            try:
+                if file_digest(path) != digest:
+                    stale.append(path)
+            except OSError:
+                stale.append(path)
+        return stale
+    
+    def monitor_spec(self) -> Dict[str, Any]:
+        """The stored monitors as a monitor spec dictionary.
+        
+        Raises RuleStoreError if they were converted with libraries that
+        have changed since.
+        """
+        stale = self.stale_libraries()
+        if stale:
+            raise RuleStoreError(
+                f"Rule store {self.path} was converted with libraries that have changed: "
+                f"{', '.join(stale)}; re-run db-import (compile converts the stored rules afresh)"
+            )
+        return {
+            'version': self.meta('version', '1.0'),
+            'process': self.meta('process', 'UNKNOWN'),
+            'date': self.meta('date', '2024-12-16'),
+            'global': self.meta('global', {}),
+            'parameters': self.meta('parameters', {}),
+            'monitors': list(self.monitors()),
+        }
+    
+    def query(self, device: Optional[str] = None, group: Optional[str] = None,
+              monitor_type: Optional[str] = None, check_type: Optional[str] = None,
+              time_limit: Optional[str] = None, rule: Optional[str] = None,
+              target: Optional[str] = None, limit: Optional[int] = None) -> List[QueryRow]:
+        """Converted checks matching all given filters, in conversion order.
+        
+        ``device`` and ``rule`` accept glob patterns (``pch_*``); ``group`` is
+        a level 1 or level 2 group name and matches its member devices;
+        ``time_limit`` is a level name (``review``) or its tmaxfrac
+        parameter (``tmaxfrac3``). ``target`` matches rules whose
+        ``applies_to`` names that subcircuit or group.
+        """
+        where, args = [], []
+        if device is not None:
+            where.append("m.device GLOB ?")
+            args.append(device)
+        if group is not None:
+            where.append("m.device IN (SELECT device FROM group_members WHERE name = ?)")
+            args.append(group)
+        if monitor_type is not None:
+            where.append("m.monitor_type = ?")
+            args.append(monitor_type)
+        if check_type is not None:
+            where.append("m.check_type = ?")
+            args.append(check_type)
+        if time_limit is not None:
+            column = 'tmaxfrac' if time_limit.startswith('tmaxfrac') else 'time_limit'
+            where.append(f"m.{column} = ?")
+            args.append(time_limit)
+        if rule is not None:
+            where.append("r.name GLOB ?")
+            args.append(rule)
+        if target is not None:
+            where.append("m.rule_id IN (SELECT rule_id FROM rule_targets WHERE target = ?)")
+            args.append(target)
+        
+        sql = ("SELECT r.name, m.device, m.monitor_type, m.check_type, m.time_limit, "
+               "m.tmaxfrac, m.model_name, m.section "
+               "FROM monitors m JOIN rules r ON r.id = m.rule_id")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY m.id"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        
+        try:
+            return [QueryRow(*row) for row in self.connection.execute(sql, args)]
+        except sqlite3.Error as e:
+            raise RuleStoreError(f"Query failed on {self.path}: {e}")
+    
+    def count(self, table: str) -> int:
+        """Number of rows in a table (rules or monitors)."""
+        if table not in ('rules', 'monitors'):
+            raise RuleStoreError(f"Unknown table: {table}")
+        return self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def _batches(rows: Iterator[Tuple], size: int = INSERT_BATCH) -> Iterator[List[Tuple]]:
+    """Split an iterator of rows into lists of at most ``size`` rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_rules(universal_path: Path, store_path: Path, device_lib_path: Path,
+                 monitor_lib_path: Path) -> Tuple[int, int]:
+    """Import a universal spec (with includes) into a new rule store.
+    
+    Every rule is converted with the given libraries, so invalid rules are
+    rejected at import. The store is written to a temporary file and moved
+    into place, replacing any previous store. Returns (rules, monitors).
+    """
+    # Imported here: the converter reads rule stores too
+    from .converter import UniversalToMonitorConverter, resolve_group_closures
+    
+    converter = UniversalToMonitorConverter(device_lib_path, monitor_lib_path)
+    universal = load_universal_spec(universal_path)
+    
+    store_path = Path(store_path)
+    tmp_path = store_path.with_name(f"{store_path.name}.{os.getpid()}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    
+    counts = [0, 0]
+    
+    try:
+        connection = sqlite3.connect(str(tmp_path))
+        try:
+            connection.executescript(_SCHEMA)
+            rules = enumerate(converter.convert_rules(universal), 1)
+            for batch in _batches((rule_id, rule, monitors) for rule_id, (rule, monitors) in rules):
+                _insert_rules(connection, batch, counts)
+            
+            sections = converter.corner_globals({})
+            meta = {
+                'version': universal.get('version', '1.0'),
+                'process': universal.get('process', 'UNKNOWN'),
+                'date': universal.get('date', '2024-12-16'),
+                'globals': universal.get('globals', {}),
+                'global': sections['global'],
+                'parameters': sections['parameters'],
+                'libraries': {str(Path(path).resolve()): file_digest(path)
+                              for path in (device_lib_path, monitor_lib_path)},
+            }
+            connection.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [(key, json.dumps(value, default=str)) for key, value in meta.items()]
+            )
+            connection.executemany(
+                "INSERT INTO group_members VALUES (?, ?, ?)",
+                [(kind, name, device)
+                 for kind, groups in resolve_group_closures(converter.device_lib).items()
+                 for name, devices in groups.items() for device in devices]
+            )
+            # Indexes are cheaper to build once after the bulk insert
+            connection.executescript(_INDEXES)
+            connection.execute(f"PRAGMA user_version = {STORE_FORMAT}")
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, store_path)
+    except sqlite3.Error as e:
+        raise RuleStoreError(f"Failed to write rule store {store_path}: {e}")
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    
+    return counts[0], counts[1]
+
+
+def _insert_rules(connection: sqlite3.Connection,
+                  batch: List[Tuple[int, Dict[str, Any], List[Dict[str, Any]]]],
+                  counts: List[int]):
+    """Insert one batch of rules with their targets and monitors."""
+    rules, targets, monitors = [], [], []
+    for rule_id, rule, rule_monitors in batch:
+        check_type = (rule.get('check') or {}).get('type')
+        time_limit = (rule.get('limits') or {}).get('time_limit', 'steady')
+        rules.append((rule_id, rule.get('name', ''), check_type, time_limit,
+                      json.dumps(rule, default=str)))
+        
+        applies_to = rule.get('applies_to') or {}
+        for kind in ('subcircuits', 'devices'):
+            targets.extend((rule_id, 'subcircuit', name) for name in applies_to.get(kind, []))
+        for kind in ('level1_group', 'level2_group'):
+            if kind in applies_to:
+                targets.append((rule_id, kind, applies_to[kind]))
+        
+        for monitor in rule_monitors:
+            monitors.append((
+                rule_id, monitor['device_pattern'], monitor['monitor_type'], check_type,
+                time_limit, str(monitor['parameters'].get('tmaxfrac', '')),
+                monitor['model_name'], monitor['section'], json.dumps(monitor, default=str),
+            ))
+    
+    counts[0] += len(rules)
+    connection.executemany("INSERT INTO rules VALUES (?, ?, ?, ?, ?)", rules)
+    connection.executemany("INSERT INTO rule_targets VALUES (?, ?, ?)", targets)
+    connection.executemany(
+        "INSERT INTO monitors (rule_id, device, monitor_type, check_type, time_limit, "
+        "tmaxfrac, model_name, section, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        monitors
+    )
+    counts[1] += len(monitors)
+
+
+def load_store_spec(store_path: Path) -> Dict[str, Any]:
+    """Convenience function: the universal spec held in a rule store."""
+    with RuleStore(store_path) as store:
+        return store.universal_spec()
+
+
+def load_store_monitors(store_path: Path) -> Dict[str, Any]:
+    """Convenience function: the monitor spec held in a rule store."""
+    with RuleStore(store_path) as store:
+        return store.monitor_spec()
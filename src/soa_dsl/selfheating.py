@@ -0,0 +1,328 @@
+"""
+SOA DSL Self-Heating - Waveform Post-Processor
+Evaluates ovcheck self-heating limits (dtmax, theat, idc/ipeak/irms_high) on exported currents.
+"""
+
+import csv
+from fnmatch import fnmatchcase
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from .parser import SOADocument, Monitor
+from .expressions import ExpressionEvaluator, ExpressionError
+from .waveforms import (WaveformReader, WaveformError, DEFAULT_CHUNK_ROWS,
+                        NUMPY_FUNCTIONS, load_instances, instance_arrays)
+
+
+# Limit parameters of a self-heating ovcheck monitor
+SELF_HEATING_PARAMS = ('dtmax', 'theat', 'idc_high', 'ipeak_high', 'irms_high')
+
+# Steps longer than this many time constants are fully settled (exp(-50) ~ 2e-22)
+SETTLED_STEPS = 50.0
+# Time constants per vectorized solver block; keeps exp() below float overflow
+BLOCK_STEPS = 600.0
+
+class SelfHeatingError(Exception):
+    """Exception raised for self-heating analysis errors."""
+    pass
+
+
+@dataclass
+class SelfHeatingResult:
+    """Current statistics and limit checks for one instance and monitor."""
+    instance: str
+    subcircuit: str
+    monitor: str
+    idc: float
+    ipeak: float
+    irms: float
+    dt_peak: float
+    limits: Dict[str, float] = field(default_factory=dict)
+    violations: List[str] = field(default_factory=list)
+
+
+class SelfHeatingAnalyzer:
+    """Checks exported current waveforms against self-heating monitors.
+    
+    For every instance matching a self-heating monitor, DC (average), peak
+    and RMS currents are accumulated over the whole waveform, and the
+    temperature rise is computed with the first-order thermal model of
+    shmonitor_nofeedback: steady-state rise dtmax * (I / irms_high)^2,
+    time constant theat. The thermal state starts at the DC operating point
+    (steady state of the first sample).
+    
+    The waveform is processed in chunks; per chunk all statistics are
+    vectorized over time and instances.
+    """
+    
+    def __init__(self, document: SOADocument, instances: List[Dict[str, Any]]):
+        self.document = document
+        self.instances = instances
+        self.evaluator = ExpressionEvaluator(document.parameters, NUMPY_FUNCTIONS)
+    
+    def self_heating_monitors(self) -> List[Monitor]:
+        """Monitors carrying self-heating limits."""
+        monitors = []
+        for monitor in self.document.monitors:
+            if monitor.monitor_type != 'ovcheck':
+                continue
+            if self._limit_sources(monitor):
+                monitors.append(monitor)
+        return monitors
+    
+    def analyze(self, waveform_path: Path,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[SelfHeatingResult]:
+        """Run all self-heating checks over a current waveform file."""
+        try:
+            reader = WaveformReader(waveform_path, chunk_rows)
+            checks, limits = self._build_checks(set(reader.signals))
+            if not checks:
+                return []
+            
+            signals = list(dict.fromkeys(check[0]['instance'] for check in checks))
+            position = {name: i for i, name in enumerate(signals)}
+            columns = np.array([position[check[0]['instance']] for check in checks])
+            
+            stats = self._accumulate(reader.chunks(signals), columns, limits)
+        except (ExpressionError, WaveformError) as e:
+            raise SelfHeatingError(str(e))
+        
+        return self._build_results(checks, limits, stats)
+    
+    def _limit_sources(self, monitor: Monitor) -> Dict[str, Any]:
+        """Self-heating limits of a monitor (self_heating block overrides parameters)."""
+        limits = {k: v for k, v in monitor.parameters.extra.items() if k in SELF_HEATING_PARAMS}
+        for key, value in (monitor.self_heating or {}).items():
+            if key in SELF_HEATING_PARAMS:
+                limits[key] = value
+        return limits
+    
+    def _build_checks(self, signals: set) -> Tuple[List[Tuple[Dict[str, Any], Monitor]],
+                                                   Dict[str, np.ndarray]]:
+        """Pair instances with monitors and evaluate their limits as arrays.
+        
+        Limits are evaluated once per monitor with instance parameters as
+        arrays. Missing limits are NaN.
+        """
+        checks = []
+        columns: Dict[str, List[np.ndarray]] = {name: [] for name in SELF_HEATING_PARAMS}
+        
+        for monitor in self.self_heating_monitors():
+            matched = [
+                inst for inst in self.instances
+                if inst['instance'] in signals
+                and fnmatchcase(inst['subcircuit'], monitor.device_pattern)
+            ]
+            if not matched:
+                continue
+            
+            params = instance_arrays(matched)
+            
+            sources = self._limit_sources(monitor)
+            for name in SELF_HEATING_PARAMS:
+                if name in sources:
+                    value = self.evaluator.evaluate(sources[name], params)
+                    value = np.broadcast_to(np.asarray(value, dtype=np.float64), (len(matched),))
+                else:
+                    value = np.full(len(matched), np.nan)
+                columns[name].append(value)
+            
+            checks.extend((inst, monitor) for inst in matched)
+        
+        if not checks:
+            return [], {}
+        return checks, {name: np.concatenate(values) for name, values in columns.items()}
+    
+    def _accumulate(self, chunks, columns: np.ndarray,
+                    limits: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Accumulate current integrals, peaks and the thermal response."""
+        n = len(columns)
+        # u = gain * I^2 is the steady-state temperature rise
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gain = limits['dtmax'] / limits['irms_high'] ** 2
+        thermal = np.isfinite(gain) & (limits['theat'] > 0)
+        gain = np.where(thermal, gain, 0.0)
+        theat = np.where(thermal, limits['theat'], 1.0)
+        
+        int_i = np.zeros(n)
+        int_i2 = np.zeros(n)
+        ipeak = np.zeros(n)
+        temp = None
+        dt_peak = np.zeros(n)
+        t_start = None
+        prev = None
+        
+        for block in chunks:
+            t = block[:, 0]
+            current = block[:, 1:][:, columns]
+            
+            if prev is None:
+                t_start = t[0]
+                temp = gain * current[0] ** 2
+                dt_peak = temp.copy()
+            else:
+                t = np.concatenate(([prev[0]], t))
+                current = np.vstack((prev[1], current))
+            prev = (t[-1], current[-1])
+            
+            ipeak = np.maximum(ipeak, np.abs(current).max(axis=0))
+            if len(t) < 2:
+                continue
+            
+            dt = np.diff(t)
+            if (dt < 0).any():
+                raise SelfHeatingError(f"Time is not monotonic near t={t[np.argmax(dt < 0)]}")
+            
+            left, right = current[:-1], current[1:]
+            int_i += ((left + right) * 0.5 * dt[:, None]).sum(axis=0)
+            # Exact mean of I^2 for piecewise-linear I
+            mean_i2 = (left * left + left * right + right * right) / 3.0
+            int_i2 += (mean_i2 * dt[:, None]).sum(axis=0)
+            
+            steps = np.minimum(dt[:, None] / theat, SETTLED_STEPS)
+            temp, peak = self._thermal_response(temp, steps, gain * mean_i2)
+            dt_peak = np.maximum(dt_peak, peak)
+        
+        if prev is None:
+            raise SelfHeatingError("Waveform file contains no data")
+        
+        duration = prev[0] - t_start
+        if duration > 0:
+            idc = int_i / duration
+            irms = np.sqrt(int_i2 / duration)
+        else:
+            idc = prev[1].copy()
+            irms = np.abs(prev[1])
+        
+        return {
+            'idc': idc,
+            'ipeak': ipeak,
+            'irms': irms,
+            'dt_peak': np.where(thermal, dt_peak, np.nan),
+        }
+    
+    def _thermal_response(self, temp: np.ndarray, steps: np.ndarray,
+                          drive: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Solve T[k+1] = a[k] * T[k] + (1 - a[k]) * u[k] over one chunk.
+        
+        ``steps`` is dt/theat per step and instance, ``drive`` the mean
+        steady-state rise u per step. The linear recurrence is solved in
+        closed form with cumulative sums: with s the cumulative steps,
+        T[k] = exp(-s[k]) * (T[0] + sum(b[j] * exp(s[j+1]))). Blocks are
+        restarted every BLOCK_STEPS time constants to keep exp() finite,
+        and at fully settled steps, where T only depends on the drive.
+        Returns the final state and the peak over the chunk.
+        """
+        decay = np.exp(-steps)
+        step_rise = (1.0 - decay) * drive
+        peak = temp.copy()
+        
+        rows = len(steps)
+        settled = steps.min(axis=1) >= SETTLED_STEPS
+        if settled.any():
+            peak = np.maximum(peak, step_rise[settled].max(axis=0))
+        
+        # Runs of unsettled steps; each starts from the state before it
+        edges = np.flatnonzero(np.diff(np.concatenate(([True], settled, [True])).astype(np.int8)))
+        for lo, hi in zip(edges[::2], edges[1::2]):
+            state = temp if lo == 0 else step_rise[lo - 1]
+            cumulative = np.cumsum(steps[lo:hi].max(axis=1))
+            block_ids = (cumulative // BLOCK_STEPS).astype(np.int64)
+            cuts = np.flatnonzero(np.diff(block_ids)) + 1
+            
+            start = lo
+            for end in list(lo + cuts) + [hi]:
+                s = np.cumsum(steps[start:end], axis=0)
+                values = np.exp(-s) * (state + np.cumsum(step_rise[start:end] * np.exp(s), axis=0))
+                peak = np.maximum(peak, values.max(axis=0))
+                state = values[-1]
+                start = end
+            
+            if hi == rows:
+                temp = state
+        
+        if settled[-1]:
+            temp = step_rise[-1]
+        
+        return temp, peak
+    
+    def _build_results(self, checks, limits: Dict[str, np.ndarray],
+                       stats: Dict[str, np.ndarray]) -> List[SelfHeatingResult]:
+        """Turn accumulated statistics into per-instance results."""
+        results = []
+        for k, (inst, monitor) in enumerate(checks):
+            # A limit the monitor sets but that came out NaN references an
+            # instance parameter this instance lacks; it cannot be checked
+            unevaluable = [
+                name for name in self._limit_sources(monitor)
+                if np.isnan(limits[name][k])
+            ]
+            check_limits = {
+                name: float(limits[name][k]) for name in SELF_HEATING_PARAMS
+                if np.isfinite(limits[name][k])
+            }
+            result = SelfHeatingResult(
+                instance=inst['instance'],
+                subcircuit=inst['subcircuit'],
+                monitor=monitor.name,
+                idc=float(stats['idc'][k]),
+                ipeak=float(stats['ipeak'][k]),
+                irms=float(stats['irms'][k]),
+                dt_peak=float(stats['dt_peak'][k]),
+                limits=check_limits,
+            )
+            
+            for name in unevaluable:
+                result.violations.append(
+                    f"{name} not evaluable (instance lacks a parameter it uses)"
+                )
+            if 'idc_high' in check_limits and abs(result.idc) > check_limits['idc_high']:
+                result.violations.append(
+                    f"idc={result.idc:.4g} > idc_high={check_limits['idc_high']:.4g}"
+                )
+            if 'ipeak_high' in check_limits and result.ipeak > check_limits['ipeak_high']:
+                result.violations.append(
+                    f"ipeak={result.ipeak:.4g} > ipeak_high={check_limits['ipeak_high']:.4g}"
+                )
+            if 'irms_high' in check_limits and result.irms > check_limits['irms_high']:
+                result.violations.append(
+                    f"irms={result.irms:.4g} > irms_high={check_limits['irms_high']:.4g}"
+                )
+            if 'dtmax' in check_limits and result.dt_peak > check_limits['dtmax']:
+                result.violations.append(
+                    f"dT={result.dt_peak:.4g} > dtmax={check_limits['dtmax']:.4g}"
+                )
+            
+            results.append(result)
+        
+        return results
+
+
+def write_report(results: List[SelfHeatingResult], output_path: Path):
+    """Write self-heating results as CSV."""
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['instance', 'subcircuit', 'monitor', 'idc', 'ipeak', 'irms',
+                         'dt_peak', *SELF_HEATING_PARAMS, 'violations'])
+        for r in results:
+            writer.writerow([
+                r.instance, r.subcircuit, r.monitor,
+                f"{r.idc:.6g}", f"{r.ipeak:.6g}", f"{r.irms:.6g}", f"{r.dt_peak:.6g}",
+                *(f"{r.limits[name]:.6g}" if name in r.limits else '' for name in SELF_HEATING_PARAMS),
+                '; '.join(r.violations),
+            ])
+
+
+def analyze_self_heating(document: SOADocument, waveform_path: Path, instances_path: Path,
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[SelfHeatingResult]:
+    """Convenience function to check a current waveform file against a monitor spec."""
+    try:
+        instances = load_instances(instances_path)
+    except WaveformError as e:
+        raise SelfHeatingError(str(e))
+    
+    analyzer = SelfHeatingAnalyzer(document, instances)
+    return analyzer.analyze(waveform_path, chunk_rows)
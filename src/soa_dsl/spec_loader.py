@@ -0,0 +1,171 @@
+"""
+SOA DSL Spec Loader - Universal Spec Composition
+Resolves include: lists in universal YAML through a shared parsed-file cache.
+"""
+
+import os
+import copy
+import hashlib
+import yaml
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+
+class IncludeError(Exception):
+    """Exception raised for include resolution errors."""
+    pass
+
+
+def file_digest(filepath: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def merge_globals(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep-merge two globals sections; values in ``override`` win.
+    
+    Nested mappings (timing, time_limits, parameters) are merged key by key,
+    everything else is replaced. Neither input is modified.
+    """
+    merged = dict(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_globals(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class SpecLoader:
+    """Loads universal specs, composing included files.
+    
+    A top spec may list other spec files under ``include:`` (paths relative
+    to the including file). Included ``globals`` are merged in include order
+    and overridden by the including file; included ``rules`` come first, in
+    include order, followed by the including file's own rules. Each file is
+    included at most once per composition.
+    
+    Parsed files are cached by content hash, so a block file shared by many
+    top specs is parsed once per process. A file whose size and mtime are
+    unchanged since it was last seen is neither re-read nor re-hashed.
+    ``load`` returns a deep copy, so callers may modify the result without
+    corrupting the cache; ``parse`` returns the cached data itself, which
+    must be treated as read-only.
+    """
+    
+    def __init__(self):
+        # resolved path -> (mtime_ns, size, digest)
+        self._stat_cache: Dict[Path, Tuple[int, int, str]] = {}
+        # digest -> parsed YAML
+        self._parsed: Dict[str, Dict[str, Any]] = {}
+    
+    def load(self, filepath: Path, sources: Optional[List[Path]] = None) -> Dict[str, Any]:
+        """Load a universal spec with all includes resolved.
+        
+        If ``sources`` is given, every file read for the composition is
+        appended to it (top spec first). The result shares nothing with the
+        cache.
+        """
+        seen: Set[Path] = set()
+        # The composition may hand out cached dicts (a file without includes)
+        return copy.deepcopy(self._compose(Path(filepath).resolve(), (), seen, sources))
+    
+    def digest(self, filepath: Path) -> str:
+        """Content hash of a file, skipping the read if it is unchanged."""
+        path = Path(filepath).resolve()
+        try:
+            st = os.stat(path)
+        except OSError:
+            raise IncludeError(f"File not found: {filepath}")
+        
+        cached = self._stat_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        digest = file_digest(path)
+        self._stat_cache[path] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+    
+    def parse(self, filepath: Path) -> Dict[str, Any]:
+        """Parse a single spec file (no include resolution), cached by hash."""
+        digest = self.digest(filepath)
+        if digest in self._parsed:
+            return self._parsed[digest]
+        
+        try:
+            with open(filepath, 'r') as f:
+                data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise IncludeError(f"YAML parsing error in {filepath}: {e}")
+        
+        if not isinstance(data, dict):
+            raise IncludeError(f"Spec file must contain a mapping: {filepath}")
+        
+        self._parsed[digest] = data
+        return data
+    
+    def clear(self):
+        """Drop all cached files."""
+        self._stat_cache.clear()
+        self._parsed.clear()
+    
+    def _compose(self, path: Path, stack: Tuple[Path, ...], seen: Set[Path],
+                 sources: Optional[List[Path]]) -> Dict[str, Any]:
+        """Recursively compose a spec and its includes."""
+        if path in stack:
+            chain = ' -> '.join(str(p) for p in stack + (path,))
+            raise IncludeError(f"Circular include: {chain}")
+        
+        seen.add(path)
+        if sources is not None:
+            sources.append(path)
+        
+        data = self.parse(path)
+        includes = data.get('include') or []
+        if isinstance(includes, str):
+            includes = [includes]
+        
+        if not includes:
+            return data
+        
+        composed: Dict[str, Any] = {}
+        globals_section: Dict[str, Any] = {}
+        rules: List[Dict[str, Any]] = []
+        
+        for include in includes:
+            include_path = (path.parent / include).resolve()
+            if include_path in stack or include_path == path:
+                chain = ' -> '.join(str(p) for p in stack + (path, include_path))
+                raise IncludeError(f"Circular include: {chain}")
+            if include_path in seen:
+                continue
+            if not include_path.exists():
+                raise IncludeError(f"Included file not found: {include} (from {path})")
+            
+            child = self._compose(include_path, stack + (path,), seen, sources)
+            for key, value in child.items():
+                if key not in ('include', 'globals', 'rules'):
+                    composed.setdefault(key, value)
+            globals_section = merge_globals(globals_section, child.get('globals') or {})
+            rules.extend(child.get('rules') or [])
+        
+        for key, value in data.items():
+            if key not in ('include', 'globals', 'rules'):
+                composed[key] = value
+        
+        composed['globals'] = merge_globals(globals_section, data.get('globals') or {})
+        composed['rules'] = rules + list(data.get('rules') or [])
+        return composed
+
+
+# Process-wide loader shared by all conversions
+_default_loader = SpecLoader()
+
+
+def load_universal_spec(filepath: Path, sources: Optional[List[Path]] = None) -> Dict[str, Any]:
+    """Convenience function to load a universal spec through the shared cache."""
+    return _default_loader.load(filepath, sources)
@@ -0,0 +1,438 @@
+"""
+SOA DSL Spectre Check - Streaming Syntax Checker
+Checks generated and hand-written SOA check netlists line by line before they reach Spectre.
+"""
+
+import re
+import gzip
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Iterable, TextIO
+
+
+# Spectre names: letters, digits and underscores, other characters escaped with '\'
+_NAME = re.compile(r'(?:[A-Za-z_]|\\.)(?:[\w.]|\\.)*')
+
+# One name=value pair of the generated form (fast path, no expressions with spaces;
+# a value ending in an operator goes through the detailed check)
+_PAIR = r'[A-Za-z_][\w.]*[ \t]*=[ \t]*(?:"[^"\\]*"|[^\s"=()\\]*[\w.])'
+_PAIRS = rf'[ \t]*{_PAIR}(?:[ \t]+{_PAIR})*[ \t]*'
+_FAST_PAIRS = re.compile(_PAIRS)
+
+# A whole generated monitor section, accepted by one match (fast path)
+_PLAIN_NAME = r'[A-Za-z_][\w.]*'
+_SECTION_BLOCK = re.compile(
+    r'(?:[ \t]*(?://[^\n]*)?\n)*'
+    rf'[ \t]*section[ \t]+({_PLAIN_NAME})[ \t]*\n'
+    rf'(?:[ \t]*model[ \t]+{_PLAIN_NAME}[ \t]+{_PLAIN_NAME}[ \t]*\n'
+    rf'(?:[ \t]*\+{_PAIRS}\n)*)*'
+    r'[ \t]*endsection[ \t]+\1[ \t]*\n'
+)
+
+# Characters read per chunk by ``check_stream``
+CHUNK_SIZE = 1 << 22
+
+# Start of a name=value pair (comparison operators excluded)
+_ASSIGNMENT = re.compile(r'(?:^|(?<=[\s(,]))([A-Za-z_][\w.]*)[ \t]*=(?!=)')
+
+_STRING = re.compile(r'"[^"]*(?:"|$)')
+_INCLUDE = re.compile(r'(?:ahdl_)?include[ \t]+"[^"]+"(?:[ \t]+section[ \t]*=[ \t]*\S+)?[ \t]*')
+_MODEL = re.compile(r'model[ \t]+(\S+)[ \t]+([^\s=]+)(.*)')
+
+# A value ending in one of these continues on the next line
+_OPEN_EXPRESSION = tuple('+-*/?:(,&|<>=!^')
+
+# Statements that are neither instances nor checked in detail
+_OTHER_STATEMENTS = {
+    'global', 'ground', 'save', 'options', 'statistics', 'real', 'function',
+    'paramset', 'correlate', 'library', 'endlibrary', 'subckt', 'inline', 'ends',
+}
+
+
+class SpectreCheckError(Exception):
+    """Exception raised when a netlist cannot be read."""
+    pass
+
+
+@dataclass
+class SyntaxIssue:
+    """One syntax error."""
+    line: int
+    message: str
+    
+    def __str__(self) -> str:
+        return f"line {self.line}: {self.message}"
+
+
+@dataclass
+class CheckReport:
+    """Result of checking one netlist."""
+    path: str
+    lines: int = 0
+    sections: int = 0
+    issues: List[SyntaxIssue] = field(default_factory=list)
+    # All errors, including those beyond the reporting limit
+    error_count: int = 0
+    
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+
+def _mask_strings(text: str) -> Tuple[str, List[Tuple[int, int]]]:
+    """Blank out the contents of quoted strings; returns (masked, string spans).
+    
+    An unterminated string runs to the end of the text.
+    """
+    if '"' not in text:
+        return text, []
+    spans = [match.span() for match in _STRING.finditer(text)]
+    masked = _STRING.sub(
+        lambda m: '"' + 'x' * (len(m.group()) - 2) + '"'
+        if len(m.group()) > 1 and m.group().endswith('"') else '"' + 'x' * (len(m.group()) - 1),
+        text
+    )
+    return masked, spans
+
+
+def _strip_comment(text: str) -> str:
+    """Remove a trailing // comment that is not inside a string."""
+    index = text.find('//')
+    if index == -1:
+        return text
+    if '"' not in text:
+        return text[:index]
+    masked, _ = _mask_strings(text)
+    index = masked.find('//')
+    return text if index == -1 else text[:index]
+
+
+class SpectreChecker:
+    """Line-streaming syntax checker for the Spectre subset of SOA netlists.
+    
+    Covers what ``CodeGenerator`` writes and what ``soachecks_top.scs``
+    uses: ``simulator lang``, ``section``/``endsection``, ``include`` and
+    ``ahdl_include``, ``parameters``, ``model`` with ``+`` continuation
+    lines, instances, ``if (...) { } else { }`` blocks and ``//``
+    comments. Lines in ``simulator lang=spice`` mode are skipped. Monitor
+    sections and ``+`` lines of the generated form are accepted by regular
+    expressions; only what does not match is parsed in detail.
+    """
+    
+    def __init__(self, max_issues: Optional[int] = None):
+        self.max_issues = max_issues
+        self.report = CheckReport(path='')
+        self._spice = False
+        self._section: Optional[Tuple[str, int]] = None
+        self._sections: Dict[str, int] = {}
+        self._braces: List[int] = []
+        # Kind of the statement '+' lines continue, if any
+        self._statement: Optional[str] = None
+        # Line of the first unclosed '(' and of an unfinished value
+        self._depth = 0
+        self._depth_line = 0
+        self._open_expression = False
+        self._open_line = 0
+        self._backslash = False
+    
+    def check(self, lines: Iterable[str], path: str = '') -> CheckReport:
+        """Check an iterable of lines and return the report."""
+        self.report.path = path
+        line_no = 0
+        for line_no, line in enumerate(lines, 1):
+            self._line(line_no, line)
+        return self._done(line_no)
+    
+    def check_stream(self, f: TextIO, path: str = '') -> CheckReport:
+        """Check a text file object chunk by chunk and return the report.
+        
+        Generated monitor sections are accepted whole by one regular
+        expression; everything else is fed line by line.
+        """
+        self.report.path = path
+        line_no = 0
+        tail = ''
+        block = _SECTION_BLOCK.match
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            chunk = tail + chunk
+            end = chunk.rfind('\n') + 1
+            tail = chunk[end:]
+            pos = 0
+            while pos < end:
+                if (self._section is None and not self._spice and not self._braces
+                        and not self._backslash):
+                    match = block(chunk, pos, end)
+                    if match:
+                        if self._statement is not None:
+                            self._end_statement()
+                        self._register_section(
+                            line_no + chunk.count('\n', pos, match.start(1)) + 1, match.group(1)
+                        )
+                        line_no += chunk.count('\n', pos, match.end())
+                        pos = match.end()
+                        continue
+                newline = chunk.index('\n', pos)
+                line_no += 1
+                self._line(line_no, chunk[pos:newline])
+                pos = newline + 1
+        if tail:
+            line_no += 1
+            self._line(line_no, tail)
+        return self._done(line_no)
+    
+    def _line(self, line_no: int, line: str):
+        """Check one physical line."""
+        text = line.strip()
+        # Fast path: generated parameter continuation lines
+        if (text[:1] == '+' and self._statement in ('model', 'parameters')
+                and not self._depth and not self._backslash
+                and '//' not in text and _FAST_PAIRS.fullmatch(text, 1)):
+            self._open_expression = False
+            return
+        self._feed(line_no, text)
+    
+    def _done(self, line_no: int) -> CheckReport:
+        """Finish the file and return the report."""
+        self.report.lines = line_no
+        self._finish(line_no)
+        # End-of-file findings refer back to earlier lines
+        self.report.issues.sort(key=lambda issue: issue.line)
+        return self.report
+    
+    def _issue(self, line_no: int, message: str):
+        """Record an error."""
+        self.report.error_count += 1
+        if self.max_issues is None or len(self.report.issues) < self.max_issues:
+            self.report.issues.append(SyntaxIssue(line_no, message))
+    
+    def _feed(self, line_no: int, text: str):
+        """Check one stripped physical line."""
+        if not text:
+            return
+        
+        if self._spice:
+            if text.startswith('simulator'):
+                self._simulator(line_no, text)
+            return
+        
+        if text.startswith('//'):
+            return
+        
+        continued = self._backslash
+        self._backslash = text.endswith('\\')
+        if self._backslash:
+            text = text[:-1]
+        
+        if continued:
+            self._continuation(line_no, text)
+        elif text[0] == '+':
+            if self._statement is None:
+                self._issue(line_no, "orphaned '+' continuation: no statement to continue")
+                return
+            self._continuation(line_no, text[1:])
+        else:
+            self._end_statement()
+            self._statement_start(line_no, text)
+    
+    def _end_statement(self):
+        """Close the open statement."""
+        if self._statement is not None and self._depth > 0:
+            self._issue(self._depth_line, "unbalanced parentheses: missing ')'")
+        elif self._statement in ('model', 'parameters') and self._open_expression:
+            self._issue(self._open_line, "statement ends with an incomplete value")
+        self._statement = None
+        self._depth = 0
+        self._open_expression = False
+    
+    def _begin(self, kind: str):
+        """Open a statement that '+' lines may continue."""
+        self._statement = kind
+        self._depth = 0
+        self._open_expression = False
+    
+    def _statement_start(self, line_no: int, text: str):
+        """Check the first line of a statement."""
+        word = re.match(r'[^\s(]*', text).group()
+        
+        if '=' in word:
+            self._issue(line_no, f"parameter '{word}' outside a statement "
+                                 "(missing '+' continuation?)")
+            return
+        
+        if word == 'simulator':
+            self._simulator(line_no, text)
+        elif word == 'section':
+            self._section_start(line_no, text)
+        elif word == 'endsection':
+            self._section_end(line_no, text)
+        elif word in ('include', 'ahdl_include'):
+            body = _strip_comment(text).rstrip()
+            if not _INCLUDE.fullmatch(body):
+                self._issue(line_no, f'expected {word} "file" [section=name], found: {body}')
+        elif word == 'parameters':
+            self._begin('parameters')
+            self._continuation(line_no, text[len(word):])
+        elif word == 'model':
+            self._model(line_no, text)
+        elif word in ('if', 'else', '}', '{') or word.startswith('}'):
+            self._block(line_no, text)
+        elif word in _OTHER_STATEMENTS:
+            self._begin('other')
+            self._continuation(line_no, text[len(word):])
+        else:
+            if not _NAME.fullmatch(word):
+                self._issue(line_no, f"invalid instance name '{word}'")
+            self._begin('instance')
+            self._continuation(line_no, text[len(word):])
+    
+    def _simulator(self, line_no: int, text: str):
+        """Handle ``simulator lang=...``."""
+        match = re.search(r'lang[ \t]*=[ \t]*(\w+)', text)
+        if not match:
+            self._issue(line_no, f"expected simulator lang=spectre|spice, found: {text}")
+            return
+        self._spice = match.group(1).lower().startswith('spice')
+    
+    def _section_start(self, line_no: int, text: str):
+        """Handle ``section NAME``."""
+        tokens = _strip_comment(text).split()
+        if len(tokens) != 2:
+            self._issue(line_no, "expected: section NAME")
+            return
+        name = tokens[1]
+        if not _NAME.fullmatch(name):
+            self._issue(line_no, f"invalid section name '{name}'")
+        if self._section is not None:
+            open_name, open_line = self._section
+            self._issue(line_no, f"section '{name}' starts inside section '{open_name}' "
+                                 f"(line {open_line}): missing endsection")
+        if self._braces:
+            self._issue(line_no, f"section '{name}' starts inside a block "
+                                 f"opened at line {self._braces[-1]}")
+        self._register_section(line_no, name)
+        self._section = (name, line_no)
+    
+    def _register_section(self, line_no: int, name: str):
+        """Count a section and report a duplicate name."""
+        if name in self._sections:
+            self._issue(line_no, f"duplicate section '{name}' (first at line {self._sections[name]})")
+        else:
+            self._sections[name] = line_no
+        self.report.sections += 1
+    
+    def _section_end(self, line_no: int, text: str):
+        """Handle ``endsection [NAME]``."""
+        tokens = _strip_comment(text).split()
+        if self._section is None:
+            self._issue(line_no, "endsection without section")
+            return
+        open_name, open_line = self._section
+        if len(tokens) > 1 and tokens[1] != open_name:
+            self._issue(line_no, f"endsection '{tokens[1]}' does not match section "
+                                 f"'{open_name}' (line {open_line})")
+        for brace_line in self._braces:
+            self._issue(brace_line, f"'{{' not closed before endsection {open_name}")
+        self._braces = []
+        self._section = None
+    
+    def _model(self, line_no: int, text: str):
+        """Handle ``model NAME MASTER [name=value ...]``."""
+        match = _MODEL.fullmatch(_strip_comment(text).rstrip())
+        if not match:
+            self._issue(line_no, "expected: model NAME MASTER [name=value ...]")
+            self._begin('model')
+            return
+        for name in match.group(1, 2):
+            if not _NAME.fullmatch(name):
+                self._issue(line_no, f"invalid model name '{name}'")
+        self._begin('model')
+        self._continuation(line_no, match.group(3))
+    
+    def _block(self, line_no: int, text: str):
+        """Handle ``if (...) {``, ``} else {`` and ``}``."""
+        body = _strip_comment(text).strip()
+        masked, _ = _mask_strings(body)
+        for char in masked:
+            if char == '{':
+                self._braces.append(line_no)
+            elif char == '}':
+                if not self._braces:
+                    self._issue(line_no, "'}' without matching '{'")
+                else:
+                    self._braces.pop()
+        if masked.count('(') != masked.count(')'):
+            self._issue(line_no, "unbalanced parentheses in condition")
+    
+    def _continuation(self, line_no: int, body: str):
+        """Check the rest of a statement line or a continuation line."""
+        body = _strip_comment(body)
+        if not body.strip():
+            return
+        
+        if body.count('"') % 2:
+            self._issue(line_no, "unterminated string")
+            return
+        
+        masked, spans = _mask_strings(body)
+        for start, end in spans:
+            before = body[start - 1] if start else ' '
+            after = body[end] if end < len(body) else ' '
+            if not (before.isspace() or before in '=(,'):
+                self._issue(line_no, f"text directly before string {body[start:end]}")
+            if not (after.isspace() or after in '),'):
+                self._issue(line_no, f"text directly after string {body[start:end]}")
+        
+        depth = self._depth + masked.count('(') - masked.count(')')
+        if depth < 0:
+            self._issue(line_no, "unbalanced parentheses: unexpected ')'")
+            depth = 0
+        if depth and not self._depth:
+            self._depth_line = line_no
+        
+        if self._statement in ('model', 'parameters'):
+            self._check_pairs(line_no, masked)
+        else:
+            self._open_expression = masked.rstrip().endswith(_OPEN_EXPRESSION)
+        self._depth = depth
+        if self._open_expression:
+            self._open_line = line_no
+    
+    def _check_pairs(self, line_no: int, masked: str):
+        """Check that a model/parameters line holds name=value pairs."""
+        matches = list(_ASSIGNMENT.finditer(masked))
+        lead = masked[:matches[0].start()] if matches else masked
+        if lead.strip() and not (self._open_expression or self._depth > 0):
+            self._issue(line_no, f"expected name=value, found '{lead.strip()}'")
+        
+        for index, match in enumerate(matches):
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(masked)
+            if not masked[match.end():end].strip() and index + 1 < len(matches):
+                self._issue(line_no, f"missing value for '{match.group(1)}'")
+        
+        last = masked[matches[-1].end():] if matches else masked
+        self._open_expression = not last.strip() or last.rstrip().endswith(_OPEN_EXPRESSION)
+    
+    def _finish(self, line_no: int):
+        """Report constructs still open at the end of the file."""
+        self._end_statement()
+        if self._backslash:
+            self._issue(line_no, "file ends with a '\\' line continuation")
+        if self._section is not None:
+            name, open_line = self._section
+            self._issue(open_line, f"section '{name}' is never closed (missing endsection)")
+        for brace_line in self._braces:
+            self._issue(brace_line, "'{' is never closed")
+
+
+def check_netlist(filepath: Path, max_issues: Optional[int] = None) -> CheckReport:
+    """Convenience function to check a netlist file (optionally .gz)."""
+    filepath = Path(filepath)
+    opener = gzip.open if filepath.suffix == '.gz' else open
+    try:
+        with opener(filepath, 'rt', errors='replace') as f:
+            return SpectreChecker(max_issues).check_stream(f, str(filepath))
+    except OSError as e:
+        raise SpectreCheckError(f"Failed to read {filepath}: {e}")
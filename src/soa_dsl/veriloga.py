@@ -0,0 +1,344 @@
+"""
+SOA DSL Verilog-A Index - Module and Parameter Scanner
+Indexes modules, ports and parameter declarations of the Verilog-A monitor sources.
+"""
+
+import io
+import os
+import re
+import json
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from .parser import SOADocument
+from .generator import generate_code
+from .spec_loader import file_digest
+
+
+# Bump when the scanner output changes so cached entries are rescanned
+INDEX_FORMAT = 1
+
+CACHE_DIR = '.soa_cache'
+CACHE_FILE = 'veriloga_index.json'
+
+VA_SUFFIXES = ('.va', '.vams')
+
+# Spectre primitives used by the DSL that have no Verilog-A source
+BUILTIN_MONITORS = {'ovcheck', 'ovcheck6'}
+
+_STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.DOTALL)
+_STRING = re.compile(r'"(?:\\.|[^"\\])*"')
+_ATTRIBUTE = re.compile(r'\(\*.*?\*\)', re.DOTALL)
+_CONTINUATION = re.compile(r'\\\r?\n')
+_DEFINE_LINE = re.compile(r'^[ \t]*`define\b.*$', re.MULTILINE)
+_PARAM_MACRO = re.compile(r'^[ \t]*`define[ \t]+(\w+)\(([^)]*)\)[ \t]*(.*)$', re.MULTILINE)
+_MODULE = re.compile(
+    r'\b(?:macro)?module\s+(\w+)\s*(?:\(([^;]*)\))?\s*;(.*?)\bendmodule\b', re.DOTALL
+)
+_PARAMETER = re.compile(r'\bparameter\b((?:"(?:\\.|[^"\\])*"|[^;"])*);')
+_MACRO_CALL = re.compile(r'^[ \t]*`(\w+)[ \t]*\(', re.MULTILINE)
+_TYPE = re.compile(r'^\s*(real|integer|string)\b')
+_DECLARATION = re.compile(r'^\s*(\w+)\s*(?:\[[^\]]*\])?\s*=\s*(.*)$', re.DOTALL)
+_RANGE = re.compile(r'\s+\b(?:from|exclude)\b')
+_PORT_NAME = re.compile(r'(\w+)\s*$')
+
+_MODEL_LINE = re.compile(r'^\s*model\s+(\S+)\s+(\S+)')
+_ASSIGNMENT = re.compile(r'(?:^|\s)(\w+)=')
+
+
+class VerilogAError(Exception):
+    """Exception raised for Verilog-A index errors."""
+    pass
+
+
+@dataclass
+class VAParameter:
+    """A Verilog-A parameter declaration."""
+    name: str
+    type: str
+    default: str
+
+
+@dataclass
+class VAModule:
+    """A Verilog-A module with its ports and parameters."""
+    name: str
+    file: str
+    ports: List[str] = field(default_factory=list)
+    parameters: Dict[str, VAParameter] = field(default_factory=dict)
+
+
+def _mask_strings(text: str) -> str:
+    """Replace string contents with placeholders of equal length."""
+    return _STRING.sub(lambda m: '"' + 'x' * (len(m.group(0)) - 2) + '"', text)
+
+
+def _split_top_level(text: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """Split on commas outside parentheses, brackets, braces and strings."""
+    end = len(text) if end is None else end
+    masked = _mask_strings(text[start:end])
+    parts, depth, last = [], 0, 0
+    for i, ch in enumerate(masked):
+        if ch in '([{':
+            depth += 1
+        elif ch in ')]}':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(text[start + last:start + i])
+            last = i + 1
+    parts.append(text[start + last:end])
+    return parts
+
+
+def _closing_paren(text: str, open_pos: int) -> int:
+    """Index of the parenthesis closing the one at ``open_pos`` (-1 if unbalanced)."""
+    masked = _mask_strings(text[open_pos:])
+    depth = 0
+    for i, ch in enumerate(masked):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return open_pos + i
+    return -1
+
+
+def parse_parameter_statements(text: str) -> List[Tuple[str, str, str]]:
+    """Parse ``parameter`` statements into (name, type, default) tuples."""
+    declared = []
+    for match in _PARAMETER.finditer(text):
+        body = match.group(1)
+        type_match = _TYPE.match(body)
+        ptype = type_match.group(1) if type_match else ''
+        if type_match:
+            body = body[type_match.end():]
+        
+        for decl in _split_top_level(body):
+            decl_match = _DECLARATION.match(decl)
+            if not decl_match:
+                continue
+            default = decl_match.group(2)
+            range_match = _RANGE.search(_mask_strings(default))
+            if range_match:
+                default = default[:range_match.start()]
+            default = ' '.join(default.split())
+            declared.append((
+                decl_match.group(1),
+                ptype or ('string' if default.startswith('"') else 'real'),
+                default,
+            ))
+    return declared
+
+
+def scan_source(text: str) -> Dict[str, Any]:
+    """Scan one Verilog-A source.
+    
+    Returns the modules (with parameter declarations and unresolved macro
+    calls) and the parameter-declaring macros defined in the file. Macro
+    calls are resolved when the index is assembled, since macros are
+    usually defined in shared include files.
+    """
+    text = _STRING_OR_COMMENT.sub(lambda m: m.group(1) or ' ', text)
+    text = _CONTINUATION.sub(' ', text)
+    text = _ATTRIBUTE.sub(' ', text)
+    
+    macros = {}
+    for match in _PARAM_MACRO.finditer(text):
+        if re.search(r'\bparameter\b', match.group(3)):
+            formals = [f.strip() for f in match.group(2).split(',')]
+            macros[match.group(1)] = [formals, match.group(3).strip()]
+    
+    modules = []
+    for match in _MODULE.finditer(text):
+        ports = []
+        if match.group(2):
+            for item in _split_top_level(match.group(2)):
+                port = _PORT_NAME.search(item)
+                if port:
+                    ports.append(port.group(1))
+        
+        body = _DEFINE_LINE.sub(' ', match.group(3))
+        
+        calls = []
+        for call in _MACRO_CALL.finditer(body):
+            open_pos = call.end() - 1
+            close_pos = _closing_paren(body, open_pos)
+            if close_pos < 0:
+                continue
+            args = [a.strip() for a in _split_top_level(body, open_pos + 1, close_pos)]
+            calls.append([call.group(1), args])
+        
+        modules.append({
+            'name': match.group(1),
+            'ports': ports,
+            'parameters': [list(p) for p in parse_parameter_statements(body)],
+            'macro_calls': calls,
+        })
+    
+    return {'modules': modules, 'macros': macros}
+
+
+def _expand_macro(macro: List[Any], args: List[str]) -> str:
+    """Substitute macro arguments into a macro body."""
+    formals, body = macro
+    values = dict(zip(formals, args))
+    if not values:
+        return body
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(f) for f in values) + r')\b')
+    return pattern.sub(lambda m: values[m.group(1)], body)
+
+
+class VerilogAIndex:
+    """Module and parameter index of a Verilog-A source tree.
+    
+    Each file is scanned once; results are cached in a JSON file keyed by
+    the file's SHA-256. Files whose size and mtime match the cache are not
+    re-read at all, so a warm rescan only stats the tree.
+    """
+    
+    def __init__(self, directory: Path, cache_path: Optional[Path] = None):
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise VerilogAError(f"Verilog-A directory not found: {directory}")
+        self.cache_path = Path(cache_path) if cache_path else self.directory / CACHE_DIR / CACHE_FILE
+        self.modules: Dict[str, VAModule] = {}
+        self.scanned = 0
+    
+    def scan(self) -> 'VerilogAIndex':
+        """Scan the tree (using the cache) and assemble the module index."""
+        cache = self._load_cache()
+        files = {}
+        self.scanned = 0
+        
+        for path in sorted(self.directory.rglob('*')):
+            if path.suffix not in VA_SUFFIXES or not path.is_file():
+                continue
+            key = str(path.relative_to(self.directory))
+            files[key] = self._scan_file(path, cache.get(key))
+        
+        if files != cache:
+            self._save_cache(files)
+        
+        self._assemble(files)
+        return self
+    
+    def module(self, name: str) -> Optional[VAModule]:
+        """Look up a module by name."""
+        return self.modules.get(name)
+    
+    def unknown_parameters(self, module_name: str, names: List[str]) -> List[str]:
+        """Parameter names not declared by a module."""
+        module = self.modules.get(module_name)
+        if module is None:
+            raise VerilogAError(f"Unknown Verilog-A module: {module_name}")
+        return [name for name in names if name not in module.parameters]
+    
+    def check_netlist(self, text: str) -> List[str]:
+        """Check every ``model`` card of Spectre text against the index.
+        
+        Returns one message per unknown module or parameter. Builtin
+        monitors (ovcheck, ovcheck6) are not checked.
+        """
+        errors = []
+        for model, master, params in model_cards(text):
+            if master in BUILTIN_MONITORS:
+                continue
+            if master not in self.modules:
+                errors.append(f"model {model}: unknown Verilog-A module '{master}'")
+                continue
+            for name in self.unknown_parameters(master, params):
+                errors.append(f"model {model}: '{master}' has no parameter '{name}'")
+        return errors
+    
+    def _scan_file(self, path: Path, cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Scan a file unless the cached entry is still valid."""
+        st = os.stat(path)
+        if cached and cached.get('mtime_ns') == st.st_mtime_ns and cached.get('size') == st.st_size:
+            return cached
+        
+        digest = file_digest(path)
+        if cached and cached.get('sha256') == digest:
+            entry = dict(cached)
+        else:
+            with open(path, 'r', errors='replace') as f:
+                entry = scan_source(f.read())
+            entry['sha256'] = digest
+            self.scanned += 1
+        
+        entry['mtime_ns'] = st.st_mtime_ns
+        entry['size'] = st.st_size
+        return entry
+    
+    def _assemble(self, files: Dict[str, Dict[str, Any]]):
+        """Build modules, resolving parameter macros across all files."""
+        macros = {}
+        for entry in files.values():
+            macros.update(entry.get('macros', {}))
+        
+        self.modules = {}
+        for key, entry in files.items():
+            for data in entry['modules']:
+                module = VAModule(name=data['name'], file=key, ports=data['ports'])
+                declared = [tuple(p) for p in data['parameters']]
+                for name, args in data['macro_calls']:
+                    local = entry.get('macros', {}).get(name) or macros.get(name)
+                    if local:
+                        declared.extend(parse_parameter_statements(_expand_macro(local, args)))
+                for name, ptype, default in declared:
+                    module.parameters.setdefault(name, VAParameter(name, ptype, default))
+                self.modules.setdefault(module.name, module)
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load cached scan results (empty if missing or outdated)."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('format') != INDEX_FORMAT:
+            return {}
+        return data.get('files', {})
+    
+    def _save_cache(self, files: Dict[str, Any]):
+        """Write the cache; a read-only tree just goes uncached."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'format': INDEX_FORMAT, 'files': files}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+
+def model_cards(text: str) -> List[Tuple[str, str, List[str]]]:
+    """Extract (model name, master, parameter names) from Spectre model cards."""
+    cards = []
+    current = None
+    for line in text.splitlines():
+        model = _MODEL_LINE.match(line)
+        if model:
+            current = (model.group(1), model.group(2), [])
+            cards.append(current)
+            line = line[model.end():]
+        elif current is None or not line.lstrip().startswith('+'):
+            current = None
+            continue
+        else:
+            line = line.lstrip()[1:]
+        current[2].extend(_ASSIGNMENT.findall(_STRING.sub('""', line)))
+    return cards
+
+
+def load_veriloga_index(directory: Path, cache_path: Optional[Path] = None) -> VerilogAIndex:
+    """Convenience function to scan a Verilog-A tree through its cache."""
+    return VerilogAIndex(directory, cache_path).scan()
+
+
+def check_document(document: SOADocument, directory: Path) -> List[str]:
+    """Check the generated model cards of a document against a Verilog-A tree."""
+    buffer = io.StringIO()
+    generate_code(document, buffer)
+    return load_veriloga_index(directory).check_netlist(buffer.getvalue())
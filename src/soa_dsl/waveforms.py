@@ -0,0 +1,145 @@
+"""
+SOA DSL Waveforms - Chunked Waveform Table Reader
+Streams exported simulator waveforms (CSV or whitespace tables) as NumPy blocks.
+"""
+
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+
+# Rows per chunk; bounds memory for long mission profiles
+DEFAULT_CHUNK_ROWS = 65536
+
+# Array-aware functions for ExpressionEvaluator
+NUMPY_FUNCTIONS = {
+    'sqrt': np.sqrt,
+    'exp': np.exp,
+    'ln': np.log,
+    'log': np.log,
+    'log10': np.log10,
+    'abs': np.abs,
+    'pow': np.power,
+    'min': np.minimum,
+    'max': np.maximum,
+}
+
+
+class WaveformError(Exception):
+    """Exception raised for malformed waveform files."""
+    pass
+
+
+class WaveformReader:
+    """Reads a waveform table: one header line, then one row per time point.
+    
+    The first column is time; the other columns are named signals (e.g. one
+    current or voltage per instance). Comma-separated files are detected
+    from the header, otherwise columns are whitespace-separated.
+    """
+    
+    def __init__(self, filepath: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.filepath = Path(filepath)
+        self.chunk_rows = chunk_rows
+        
+        try:
+            with open(self.filepath, 'r') as f:
+                header = f.readline()
+        except OSError as e:
+            raise WaveformError(f"Failed to open {filepath}: {e}")
+        
+        self.delimiter: Optional[str] = ',' if ',' in header else None
+        self.columns: List[str] = [c.strip().strip('"') for c in header.split(self.delimiter)]
+        if len(self.columns) < 2:
+            raise WaveformError(f"Waveform file needs a time column and signals: {filepath}")
+    
+    @property
+    def signals(self) -> List[str]:
+        """Signal column names (all columns except time)."""
+        return self.columns[1:]
+    
+    def chunks(self, signals: Optional[Sequence[str]] = None) -> Iterator[np.ndarray]:
+        """Yield float blocks of shape (rows, 1 + len(signals)); column 0 is time.
+        
+        Only the requested signal columns are parsed.
+        """
+        if signals is None:
+            usecols = list(range(len(self.columns)))
+        else:
+            positions = {name: i for i, name in enumerate(self.columns)}
+            missing = [s for s in signals if s not in positions]
+            if missing:
+                raise WaveformError(f"Signals not found in {self.filepath}: {', '.join(missing)}")
+            usecols = [0] + [positions[s] for s in signals]
+        
+        with open(self.filepath, 'r') as f:
+            f.readline()
+            line_no = 1
+            while True:
+                lines = list(islice(f, self.chunk_rows))
+                if not lines:
+                    break
+                try:
+                    block = np.loadtxt(lines, delimiter=self.delimiter, usecols=usecols,
+                                       ndmin=2, dtype=np.float64)
+                except ValueError as e:
+                    raise WaveformError(
+                        f"{self.filepath}: invalid data after line {line_no}: {e}"
+                    )
+                line_no += len(lines)
+                if block.size:
+                    yield block
+
+
+def load_instances(filepath: Path) -> List[Dict[str, Any]]:
+    """Load an instance table: CSV with instance, subcircuit and parameter columns."""
+    try:
+        with open(filepath, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header or not {'instance', 'subcircuit'} <= set(header):
+                raise WaveformError(
+                    f"Instance table needs 'instance' and 'subcircuit' columns: {filepath}"
+                )
+            instance_pos = header.index('instance')
+            subcircuit_pos = header.index('subcircuit')
+            min_width = max(instance_pos, subcircuit_pos) + 1
+            param_columns = [(i, key) for i, key in enumerate(header)
+                             if key not in ('instance', 'subcircuit')]
+            instances = []
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < min_width:
+                    raise WaveformError(f"Incomplete row in {filepath}: {','.join(row)}")
+                params = {}
+                for i, key in param_columns:
+                    value = row[i] if i < len(row) else ''
+                    if value == '':
+                        continue
+                    try:
+                        params[key] = float(value)
+                    except ValueError:
+                        raise WaveformError(
+                            f"Non-numeric parameter {key}={value} for {row[instance_pos]}"
+                        )
+                instances.append({
+                    'instance': row[instance_pos],
+                    'subcircuit': row[subcircuit_pos],
+                    'parameters': params,
+                })
+            return instances
+    except OSError as e:
+        raise WaveformError(f"Failed to load {filepath}: {e}")
+
+
+def instance_arrays(instances: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Instance parameters as one array per name (NaN where undefined)."""
+    names = set().union(*(inst['parameters'] for inst in instances))
+    return {
+        name: np.array([inst['parameters'].get(name, np.nan) for inst in instances])
+        for name in names
+    }
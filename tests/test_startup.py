@@ -0,0 +1,40 @@
+"""
+SOA DSL Startup Tests
+Checks the import-time budget of the CLI in fresh interpreters.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = ROOT / 'soa_dsl_cli.py'
+
+sys.path.insert(0, str(ROOT))
+from soa_dsl_cli import STARTUP_FORBIDDEN  # noqa: E402
+
+# Timing is noisy on a loaded machine: the budget must hold in one of these runs
+ATTEMPTS = 3
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter; the test process's imports cannot leak into it."""
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, cwd=ROOT)
+
+
+def test_help_imports_no_library_modules():
+    result = run_python('-X', 'importtime', str(CLI), '--help')
+    assert result.returncode == 0, result.stderr
+    
+    modules = {line.split('|')[-1].strip() for line in result.stderr.splitlines()
+               if line.startswith('import time:')}
+    forbidden = sorted(m for m in modules if m.split('.')[0] in STARTUP_FORBIDDEN)
+    assert not forbidden, f"--help imports {', '.join(forbidden)}"
+
+
+def test_startup_within_budget():
+    for _ in range(ATTEMPTS):
+        result = run_python(str(CLI), 'startup-check')
+        if result.returncode == 0:
+            return
+    assert result.returncode == 0, result.stdout
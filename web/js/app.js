@@ -4,6 +4,7 @@
 // State
 let deviceLibrary = null;
 let monitorLibrary = null;
+let libraryIndex = null;  // Precomputed index (soa_dsl_cli.py export-index), if available
 let rules = [];
 
 // DOM Elements
@@ -42,6 +43,18 @@ window.addEventListener('DOMContentLoaded', async () => {
 // Load device and monitor libraries
 async function loadLibraries() {
     try {
+        // Prefer the precomputed index: one small file, no YAML parsing
+        libraryIndex = await loadLibraryIndex();
+        if (libraryIndex) {
+            deviceLibrary = libraryFromIndex(libraryIndex);
+            monitorLibrary = {
+                monitors: libraryIndex.monitors,
+                time_limit_mapping: libraryIndex.time_limit_mapping
+            };
+            console.log(`Library index loaded (${libraryIndex.hash.slice(0, 12)})`);
+            return;
+        }
+        
         // Load device library
         const deviceResponse = await fetch('../config/device_library.yaml');
         const deviceYaml = await deviceResponse.text();
@@ -58,6 +71,37 @@ async function loadLibraries() {
     }
 }
 
+// Load the precomputed library index; returns null if it has not been exported
+async function loadLibraryIndex() {
+    try {
+        const response = await fetch('library_index.json');
+        if (!response.ok) return null;
+        return await response.json();
+    } catch (error) {
+        return null;
+    }
+}
+
+// Rebuild the device library shape used by the form from the index
+function libraryFromIndex(index) {
+    const level1 = {};
+    for (const [name, info] of Object.entries(index.groups.level1_group)) {
+        level1[name] = { description: info.description, subcircuits: info.subcircuits };
+    }
+    
+    const level2 = {};
+    for (const [name, info] of Object.entries(index.groups.level2_group)) {
+        level2[name] = { description: info.description, level1_groups: info.level1_groups };
+    }
+    
+    return {
+        process: index.process,
+        subcircuits: index.subcircuits,
+        level1_groups: level1,
+        level2_groups: level2
+    };
+}
+
 // Initialize form with library data
 function initializeForm() {
     populateCheckTypes();
@@ -489,19 +533,26 @@ function onDeviceMethodChange() {
 function updateSelectedDevices() {
     const method = document.querySelector('input[name="deviceMethod"]:checked').value;
     let selected = [];
+    let groupSummary = null;
     
     if (method === 'direct') {
         const checkboxes = subcircuitList.querySelectorAll('input[type="checkbox"]:checked');
         selected = Array.from(checkboxes).map(cb => cb.value);
     } else if (method === 'level1') {
         const groupName = level1GroupSelect.value;
-        if (groupName) {
+        if (groupName && libraryIndex) {
+            groupSummary = libraryIndex.groups.level1_group[groupName];
+            selected = groupSummary.subcircuits;
+        } else if (groupName) {
             const option = level1GroupSelect.selectedOptions[0];
             selected = JSON.parse(option.dataset.subcircuits);
         }
     } else if (method === 'level2') {
         const groupName = level2GroupSelect.value;
-        if (groupName) {
+        if (groupName && libraryIndex) {
+            groupSummary = libraryIndex.groups.level2_group[groupName];
+            selected = groupSummary.subcircuits;
+        } else if (groupName) {
             const option = level2GroupSelect.selectedOptions[0];
             const level1Groups = JSON.parse(option.dataset.level1Groups);
             // Expand level1 groups to subcircuits
@@ -515,11 +566,12 @@ function updateSelectedDevices() {
     selectedDevicesDisplay.textContent = selected.length > 0 ? selected.join(', ') : 'None';
     
     // Update available nodes and parameters display
-    updateAvailableNodesAndParams(selected);
+    updateAvailableNodesAndParams(selected, groupSummary);
 }
 
 // Update available nodes and parameters based on selected devices
-function updateAvailableNodesAndParams(selectedDevices) {
+// (groupSummary carries the precomputed intersections for a whole group)
+function updateAvailableNodesAndParams(selectedDevices, groupSummary = null) {
     const deviceInfoPanel = document.getElementById('deviceInfo');
     const deviceInfoContent = document.getElementById('deviceInfoContent');
     
@@ -539,20 +591,28 @@ function updateAvailableNodesAndParams(selectedDevices) {
         return;
     }
     
-    // Find common nodes (intersection)
-    const allNodes = deviceInfos.map(d => d.info.nodes);
-    const commonNodes = allNodes.reduce((acc, nodes) => 
-        acc.filter(node => nodes.includes(node))
-    );
-    
-    // Find common parameters (intersection)
-    const allParams = deviceInfos.map(d => d.info.parameters || []);
-    const commonParams = allParams.reduce((acc, params) => 
-        acc.filter(param => params.includes(param))
-    );
-    
-    // Get device types
-    const deviceTypes = [...new Set(deviceInfos.map(d => d.info.type))];
+    let commonNodes, commonParams, deviceTypes;
+    if (groupSummary) {
+        // Precomputed by export-index
+        commonNodes = groupSummary.nodes;
+        commonParams = groupSummary.parameters;
+        deviceTypes = groupSummary.types;
+    } else {
+        // Find common nodes (intersection)
+        const allNodes = deviceInfos.map(d => d.info.nodes);
+        commonNodes = allNodes.reduce((acc, nodes) => 
+            acc.filter(node => nodes.includes(node))
+        );
+        
+        // Find common parameters (intersection)
+        const allParams = deviceInfos.map(d => d.info.parameters || []);
+        commonParams = allParams.reduce((acc, params) => 
+            acc.filter(param => params.includes(param))
+        );
+        
+        // Get device types
+        deviceTypes = [...new Set(deviceInfos.map(d => d.info.type))];
+    }
     
     // Display device info
     deviceInfoPanel.style.display = 'block';